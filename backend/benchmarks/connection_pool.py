@@ -0,0 +1,214 @@
+"""
+Per-request latency with a new database connection per request (Django's
+default) against connections from the per-worker pool (``DB_POOL_ENABLED``).
+
+Requests go through the WSGI handler in-process, so each one opens (or
+checks out) a connection, runs its queries and closes (or checks in) the
+connection when it finishes. Against the SQLite fallback, connecting costs
+microseconds; ``--connect-latency`` adds a sleep to every new connection
+to stand in for the TCP, TLS and authentication setup against a database
+server. With ``DATABASE_URL`` pointing at PostgreSQL the setup is real and
+``--connect-latency`` can be 0:
+
+    python benchmarks/connection_pool.py --requests 1000 --connect-latency 5
+
+Each mode runs in its own subprocess because the engine is fixed at import.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from pathlib import Path
+
+ROUTES = [
+    "/api/blog/posts/featured/",
+    "/api/blog/projects/featured/",
+    "/api/users/members/",
+]
+
+
+def setup(mode):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+    os.environ["DB_POOL_ENABLED"] = "True" if mode == "pooled" else "False"
+    os.environ.setdefault("METRICS_ENABLED", "False")
+
+    import django
+
+    django.setup()
+
+    import sentry_sdk
+
+    # Settings start Sentry with LAZY_STARTUP off; keep it out of the numbers
+    sentry_sdk.init()
+
+
+def populate(rows):
+    from blog.models import Post, Project
+    from users.models import User
+
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="!",
+                skills="Python, Django",
+            )
+            for i in range(rows)
+        ]
+    )
+    Project.objects.bulk_create(
+        [Project(owner=user, title=f"Project {user.pk}") for user in users]
+    )
+    Post.objects.bulk_create(
+        [
+            Post(author=user, title=f"Post {user.pk}", is_published=True)
+            for user in users
+        ]
+    )
+
+
+def add_connect_latency(connection, seconds):
+    """Slow down opening a connection, whether or not it goes to a pool"""
+    vendor = {"sqlite": "sqlite3"}.get(connection.vendor, connection.vendor)
+    wrapper = import_module(f"django.db.backends.{vendor}.base").DatabaseWrapper
+    connect = wrapper.get_new_connection
+
+    def slow(self, conn_params):
+        time.sleep(seconds)
+        return connect(self, conn_params)
+
+    wrapper.get_new_connection = slow
+
+
+def run(requests, threads):
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def call(route):
+        status = []
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": route,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "443",
+            "HTTP_HOST": "localhost",
+            "HTTP_X_FORWARDED_PROTO": "https",
+            "wsgi.url_scheme": "https",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+        }
+        start = time.perf_counter()
+        body = application(environ, lambda s, h, e=None: status.append(s))
+        b"".join(body)
+        # Closing the response sends request_finished, which closes the
+        # connection, so this is inside the timed section as in a server
+        body.close()
+        return time.perf_counter() - start, int(status[0].split()[0])
+
+    def worker(indices):
+        return [call(ROUTES[i % len(ROUTES)]) for i in indices]
+
+    chunks = [range(n, requests, threads) for n in range(threads)]
+    with ThreadPoolExecutor(threads) as pool:
+        return [result for chunk in pool.map(worker, chunks) for result in chunk]
+
+
+def child(args):
+    setup(args.child)
+    from django.db import connection
+
+    from project.db.pool import close_pools
+
+    if connection.vendor == "sqlite":
+        # The in-memory test database is never pooled; use a file instead
+        tmp = tempfile.TemporaryDirectory()
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp.name, "bench.db")
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.rows)
+        connection.close()
+        add_connect_latency(connection, args.connect_latency / 1000)
+        run(min(args.requests, 100), args.threads)  # warm up
+        results = run(args.requests, args.threads)
+    finally:
+        close_pools()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    latencies = sorted(duration for duration, _ in results)
+    print(
+        json.dumps(
+            {
+                "mean": statistics.fmean(latencies),
+                "p50": latencies[len(latencies) // 2],
+                "p95": latencies[int(len(latencies) * 0.95)],
+                "errors": sum(status >= 400 for _, status in results),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument(
+        "--connect-latency",
+        type=float,
+        default=5.0,
+        help="Milliseconds added to opening each connection",
+    )
+    parser.add_argument("--child", choices=["direct", "pooled"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args)
+
+    results = {}
+    for mode in ("direct", "pooled"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                mode,
+                "--requests",
+                str(args.requests),
+                "--threads",
+                str(args.threads),
+                "--rows",
+                str(args.rows),
+                "--connect-latency",
+                str(args.connect_latency),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'mode':<8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<8}{result['mean'] * 1000:>10.2f}{result['p50'] * 1000:>10.2f}"
+            f"{result['p95'] * 1000:>10.2f}{result['errors']:>8}"
+        )
+    saved = results["direct"]["mean"] - results["pooled"]["mean"]
+    print(f"saved per request: {saved * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Rows/second of the list serializers against their values() fast paths.
+
+Runs against a throwaway test database:
+
+    python benchmarks/list_serializers.py --rows 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from django.db import connection  # noqa: E402
+
+from blog.models import Post, Project  # noqa: E402
+from blog.serializers import (  # noqa: E402
+    PostListSerializer,
+    PostListValuesSerializer,
+    ProjectListSerializer,
+    ProjectListValuesSerializer,
+)
+from users.models import User  # noqa: E402
+from users.serializers import (  # noqa: E402
+    UserProfileSerializer,
+    UserProfileValuesSerializer,
+)
+
+
+def populate(rows):
+    """Replace all users, posts and projects with ``rows`` of each"""
+    Post.objects.all().delete()
+    Project.objects.all().delete()
+    User.objects.all().delete()
+
+    User.objects.bulk_create(
+        [
+            User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                first_name="Bench",
+                last_name=f"User{i}",
+                password="!",
+                skills="Python, Django, React",
+                profile_photo=f"profile_photos/{i}.jpg",
+            )
+            for i in range(rows)
+        ],
+        batch_size=5000,
+    )
+    user_ids = list(User.objects.values_list("id", flat=True))
+    Post.objects.bulk_create(
+        [
+            Post(
+                author_id=user_ids[i],
+                title=f"Post {i}",
+                content="word " * 400,
+                excerpt="word " * 40,
+                word_count=400,
+                tags="python, django, performance",
+                cover_image=f"posts/{i}.png",
+            )
+            for i in range(rows)
+        ],
+        batch_size=5000,
+    )
+    Project.objects.bulk_create(
+        [
+            Project(
+                owner_id=user_ids[i],
+                title=f"Project {i}",
+                description="A benchmark project",
+                tech_stack="Python, Django, PostgreSQL",
+                image=f"projects/{i}.png",
+            )
+            for i in range(rows)
+        ],
+        batch_size=5000,
+    )
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    context = {"request": APIRequestFactory().get("/", HTTP_HOST="localhost")}
+    cases = [
+        (
+            "PostListSerializer",
+            PostListSerializer,
+            PostListValuesSerializer,
+            lambda: Post.objects.select_related("author").defer("content"),
+        ),
+        (
+            "ProjectListSerializer",
+            ProjectListSerializer,
+            ProjectListValuesSerializer,
+            lambda: Project.objects.select_related("owner"),
+        ),
+        (
+            "UserProfileSerializer",
+            UserProfileSerializer,
+            UserProfileValuesSerializer,
+            lambda: User.objects.all(),
+        ),
+    ]
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"{'serializer':<24}{'rows':>9}{'drf rows/s':>14}{'values rows/s':>16}")
+        for rows in args.rows:
+            populate(rows)
+            for name, serializer, fast_serializer, queryset in cases:
+                drf = timed(
+                    lambda: serializer(queryset(), many=True, context=context).data,
+                    args.repeat,
+                )
+                fast = timed(
+                    lambda: fast_serializer(
+                        fast_serializer.values(queryset()), many=True, context=context
+                    ).data,
+                    args.repeat,
+                )
+                print(f"{name:<24}{rows:>9}{rows / drf:>14,.0f}{rows / fast:>16,.0f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
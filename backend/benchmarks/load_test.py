@@ -0,0 +1,606 @@
+"""
+Latency and throughput of the REST API under scripted traffic mixes.
+
+Virtual users (``--concurrency``) each loop for ``--duration`` seconds,
+picking a scenario by the weights in ``--mix`` and running its steps
+back to back against the real routes of ``blog.urls`` and ``users.urls``:
+
+- ``home``: an anonymous visitor loads the featured posts and projects,
+  the statistics and the first page of posts, then maybe reads a post or
+  the next page;
+- ``search``: a visitor types a term into the search box, one request per
+  keystroke;
+- ``dashboard``: a member (logged in once per virtual user) loads their
+  profile and content, then writes, edits and deletes a draft post;
+- ``login``: logins with the password check, each followed by a token
+  refresh.
+
+The data comes from ``project.seed`` in a throwaway test database, so the
+same ``--seed`` and sizes give the same rows. Requests go to the WSGI or
+ASGI handler in-process, or over HTTP to a gunicorn started on that
+database (``--target gunicorn``, tuned with ``--workers`` and
+``--threads``). The report is JSON with sorted keys, for diffing between
+builds: requests per second, error rate and p50/p95/p99 latency overall,
+per scenario and per endpoint:
+
+    python benchmarks/load_test.py --target wsgi --concurrency 8 --duration 30
+    python benchmarks/load_test.py --target gunicorn --workers 4 --output run.json
+
+Runs against SQLite use a database file so gunicorn's workers can share
+it; point ``DATABASE_URL`` at PostgreSQL for numbers closer to production.
+"""
+
+import argparse
+import asyncio
+import http.client
+import io
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlencode, urlsplit
+
+BACKEND = Path(__file__).resolve().parent.parent
+PASSWORD = "seedpass123"
+SEARCH_TERMS = ["django", "performance", "react", "database", "testing", "cache"]
+
+Response = namedtuple("Response", "status data")
+
+
+class Request:
+    """One API call, addressed by URL name as in ``reverse()``"""
+
+    def __init__(self, method, name, args=(), query="", data=None, token=None):
+        self.method = method
+        self.name = name
+        self.args = args
+        self.query = query
+        self.data = data
+        self.token = token
+
+    @property
+    def key(self):
+        return f"{self.method} {self.name}"
+
+    def path(self):
+        from django.urls import reverse
+
+        return reverse(self.name, args=self.args)
+
+    def body(self):
+        return b"" if self.data is None else json.dumps(self.data).encode()
+
+    def headers(self):
+        headers = {"Host": "localhost", "X-Forwarded-Proto": "https"}
+        if self.data is not None:
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+
+# Scenarios are generators that yield Requests and are sent each Response
+
+
+def home(rng, session, members):
+    yield Request("GET", "blog:post-featured")
+    yield Request("GET", "blog:project-featured")
+    yield Request("GET", "blog:dashboard-stats")
+    page = yield Request("GET", "blog:post-list")
+    results = (page.data or {}).get("results") or []
+    if results and rng.random() < 0.5:
+        yield Request("GET", "blog:post-detail", args=[rng.choice(results)["id"]])
+    elif page.data and page.data.get("next") and rng.random() < 0.3:
+        query = urlsplit(page.data["next"]).query
+        yield Request("GET", "blog:post-list", query=query)
+
+
+def search(rng, session, members):
+    term = rng.choice(SEARCH_TERMS)
+    for end in range(2, len(term) + 1):
+        yield Request("GET", "blog:search-content", query=urlencode({"q": term[:end]}))
+
+
+def dashboard(rng, session, members):
+    if "access" not in session:
+        response = yield Request(
+            "POST",
+            "users:login",
+            data={"email": rng.choice(members), "password": PASSWORD},
+        )
+        if response.status != 200:
+            return
+        session.update(response.data["tokens"])
+    token = session["access"]
+
+    profile = yield Request("GET", "users:user-profile", token=token)
+    if profile.status != 200:
+        return
+    user_id = profile.data["id"]
+    yield Request("GET", "blog:post-list", query=f"author={user_id}", token=token)
+    yield Request("GET", "blog:project-list", query=f"owner={user_id}", token=token)
+    created = yield Request(
+        "POST",
+        "blog:post-list",
+        data={
+            "title": "Load test draft",
+            "content": "Draft " * rng.randint(50, 500),
+            "tags": "django, performance",
+            "is_published": False,
+        },
+        token=token,
+    )
+    if created.status == 201:
+        pk = created.data["id"]
+        yield Request(
+            "PATCH",
+            "blog:post-detail",
+            args=[pk],
+            data={"title": "Load test draft, edited"},
+            token=token,
+        )
+        yield Request("DELETE", "blog:post-detail", args=[pk], token=token)
+
+
+def login(rng, session, members):
+    response = yield Request(
+        "POST", "users:login", data={"email": rng.choice(members), "password": PASSWORD}
+    )
+    if response.status == 200:
+        yield Request(
+            "POST",
+            "users:token-refresh",
+            data={"refresh": response.data["tokens"]["refresh"]},
+        )
+
+
+SCENARIOS = {"home": home, "search": search, "dashboard": dashboard, "login": login}
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def decode(body):
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+# Clients: each sends a Request and returns (status, body)
+
+
+def wsgi_client():
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def send(request):
+        body = request.body()
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "PATH_INFO": request.path(),
+            "QUERY_STRING": request.query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "443",
+            "wsgi.url_scheme": "https",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "CONTENT_LENGTH": str(len(body)),
+        }
+        for name, value in request.headers().items():
+            key = name.upper().replace("-", "_")
+            if key != "CONTENT_TYPE":
+                key = f"HTTP_{key}"
+            environ[key] = value
+        status = []
+        response = application(environ, lambda s, h, e=None: status.append(s))
+        content = b"".join(response)
+        # Sends request_finished, which returns the connection, as in a server
+        response.close()
+        return int(status[0].split()[0]), content
+
+    return send
+
+
+def asgi_client():
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def send(request):
+        body = request.body()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "https",
+            "path": request.path(),
+            "raw_path": request.path().encode(),
+            "query_string": request.query.encode(),
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in request.headers().items()
+            ]
+            + [(b"content-length", str(len(body)).encode())],
+            "server": ("localhost", 443),
+        }
+        received = False
+        done = asyncio.Event()
+        status = []
+        content = []
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def reply(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif message["type"] == "http.response.body":
+                content.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    done.set()
+
+        await application(scope, receive, reply)
+        return status[0], b"".join(content)
+
+    return send
+
+
+def http_client(port):
+    local = threading.local()
+
+    def send(request):
+        path = request.path() + (f"?{request.query}" if request.query else "")
+        for attempt in (1, 2):
+            if getattr(local, "connection", None) is None:
+                local.connection = http.client.HTTPConnection(
+                    "127.0.0.1", port, timeout=60
+                )
+            try:
+                local.connection.request(
+                    request.method, path, request.body() or None, request.headers()
+                )
+                response = local.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                # The server closed a kept-alive connection; retry once
+                local.connection.close()
+                local.connection = None
+                if attempt == 2:
+                    return 0, b""
+
+    return send
+
+
+# Drivers: run virtual users until the deadline, recording every request as
+# (scenario, endpoint, seconds, status)
+
+
+def pick_scenarios(rng, mix):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while True:
+        yield rng.choices(names, weights)[0]
+
+
+def run_sync(send, mix, concurrency, duration, seed, members):
+    from django.db import close_old_connections
+
+    deadline = time.perf_counter() + duration
+
+    def user(number):
+        rng = random.Random(f"{seed}:{number}")
+        session, records = {}, []
+        try:
+            for name in pick_scenarios(rng, mix):
+                if time.perf_counter() >= deadline:
+                    return records
+                steps = SCENARIOS[name](rng, session, members)
+                response = None
+                while True:
+                    try:
+                        request = steps.send(response)
+                    except StopIteration:
+                        break
+                    start = time.perf_counter()
+                    try:
+                        status, body = send(request)
+                    except Exception:
+                        status, body = 0, b""
+                    records.append(
+                        (name, request.key, time.perf_counter() - start, status)
+                    )
+                    response = Response(status, decode(body))
+        finally:
+            close_old_connections()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        records = [r for chunk in pool.map(user, range(concurrency)) for r in chunk]
+    return time.perf_counter() - start, records
+
+
+def run_async(send, mix, concurrency, duration, seed, members):
+    async def user(number, deadline):
+        rng = random.Random(f"{seed}:{number}")
+        session, records = {}, []
+        for name in pick_scenarios(rng, mix):
+            if time.perf_counter() >= deadline:
+                return records
+            steps = SCENARIOS[name](rng, session, members)
+            response = None
+            while True:
+                try:
+                    request = steps.send(response)
+                except StopIteration:
+                    break
+                start = time.perf_counter()
+                try:
+                    status, body = await send(request)
+                except Exception:
+                    status, body = 0, b""
+                records.append((name, request.key, time.perf_counter() - start, status))
+                response = Response(status, decode(body))
+
+    async def main():
+        deadline = time.perf_counter() + duration
+        chunks = await asyncio.gather(
+            *(user(number, deadline) for number in range(concurrency))
+        )
+        return [record for chunk in chunks for record in chunk]
+
+    start = time.perf_counter()
+    records = asyncio.run(main())
+    return time.perf_counter() - start, records
+
+
+# Report
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(records, elapsed):
+    latencies = sorted(seconds for _, _, seconds, _ in records)
+    errors = sum(not 200 <= status < 400 for _, _, _, status in records)
+    if not latencies:
+        return {"requests": 0}
+    return {
+        "requests": len(records),
+        "rps": round(len(records) / elapsed, 1),
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def report(records, elapsed):
+    groups = {"scenarios": defaultdict(list), "endpoints": defaultdict(list)}
+    statuses = defaultdict(int)
+    for record in records:
+        scenario, endpoint, _, status = record
+        groups["scenarios"][scenario].append(record)
+        groups["endpoints"][endpoint].append(record)
+        statuses[str(status)] += 1
+    return {
+        "total": summarize(records, elapsed),
+        "statuses": dict(statuses),
+        **{
+            kind: {key: summarize(group, elapsed) for key, group in grouped.items()}
+            for kind, grouped in groups.items()
+        },
+    }
+
+
+# Setup
+
+
+def setup():
+    sys.path.insert(0, str(BACKEND))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+    os.environ.setdefault("METRICS_ENABLED", "False")
+
+    import django
+
+    django.setup()
+
+    import sentry_sdk
+
+    # Settings start Sentry with LAZY_STARTUP off; keep it out of the numbers
+    sentry_sdk.init()
+
+
+def post_worker_init(worker):
+    """gunicorn hook, as this file is also its config: turn Sentry off"""
+    import sentry_sdk
+
+    sentry_sdk.init()
+
+
+def database_url(settings_dict):
+    if "sqlite" in settings_dict["ENGINE"]:
+        return f"sqlite:///{settings_dict['NAME']}"
+    user = quote(settings_dict["USER"] or "", safe="")
+    password = quote(settings_dict["PASSWORD"] or "", safe="")
+    return (
+        f"postgres://{user}:{password}@{settings_dict['HOST'] or 'localhost'}:"
+        f"{settings_dict['PORT'] or 5432}/{settings_dict['NAME']}"
+    )
+
+
+def start_gunicorn(args, url):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = dict(
+        os.environ,
+        DATABASE_URL=url,
+        DJANGO_SETTINGS_MODULE="project.settings",
+        METRICS_ENABLED=os.environ.get("METRICS_ENABLED", "False"),
+        SENTRY_DSN="",
+    )
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "project.wsgi:application",
+            "--config",
+            __file__,
+            "--chdir",
+            str(BACKEND),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(args.workers),
+            "--threads",
+            str(args.threads),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("gunicorn exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request(
+                "GET", "/health/", headers={"X-Forwarded-Proto": "https"}
+            )
+            if connection.getresponse().status == 200:
+                return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("gunicorn did not start within 60s")
+
+
+def run(args, members):
+    if args.target == "asgi":
+        send = asgi_client()
+        runner = run_async
+    else:
+        send = wsgi_client() if args.target == "wsgi" else http_client(args.port)
+        runner = run_sync
+    if args.warmup:
+        runner(send, args.mix, args.concurrency, args.warmup, args.seed, members)
+    return runner(send, args.mix, args.concurrency, args.duration, args.seed, members)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target", choices=["wsgi", "asgi", "gunicorn"], default="wsgi"
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="home=60,search=25,dashboard=10,login=5",
+        help="Comma-separated scenario=weight pairs",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per worker")
+    parser.add_argument("--output", help="File to write the JSON report to")
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+
+    from project import seed
+    from project.db.pool import close_pools
+
+    tmp = tempfile.TemporaryDirectory()
+    if connection.vendor == "sqlite":
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp.name, "load.db")
+    old_name = connection.creation.create_test_db(verbosity=0)
+    server = None
+    try:
+        seed.generate(
+            args.users, args.posts, args.projects, seed=args.seed, password=PASSWORD
+        )
+        members = list(
+            get_user_model()
+            .objects.filter(role="member", is_active=True)
+            .order_by("pk")
+            .values_list("email", flat=True)[:1000]
+        )
+        if args.target == "gunicorn":
+            connection.close()
+            server, args.port = start_gunicorn(
+                args, database_url(connection.settings_dict)
+            )
+        elapsed, records = run(args, members)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        close_pools()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        tmp.cleanup()
+
+    result = {
+        "config": {
+            "target": args.target,
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "seed": args.seed,
+            "rows": {
+                "users": args.users,
+                "posts": args.posts,
+                "projects": args.projects,
+            },
+            **(
+                {"workers": args.workers, "threads": args.threads}
+                if args.target == "gunicorn"
+                else {}
+            ),
+        },
+        **report(records, elapsed),
+    }
+    output = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
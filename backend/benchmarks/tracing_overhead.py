@@ -0,0 +1,154 @@
+"""
+Per-request cost of Sentry tracing at each sampling setting.
+
+Requests go through the real WSGI handler (where the Sentry Django
+integration hooks in) against a throwaway test database. Envelopes are
+counted by an in-memory transport instead of being uploaded:
+
+    python benchmarks/tracing_overhead.py --requests 2000
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import sentry_sdk  # noqa: E402
+from sentry_sdk.integrations.django import DjangoIntegration  # noqa: E402
+from sentry_sdk.transport import Transport  # noqa: E402
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from blog.models import Post  # noqa: E402
+from project.tracing import TraceSampler  # noqa: E402
+from users.models import User  # noqa: E402
+
+ROUTES = ["/health/", "/api/blog/posts/", "/api/blog/posts/featured/"]
+
+
+class CountingTransport(Transport):
+    """Counts envelopes instead of sending them"""
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.envelopes = 0
+
+    def capture_envelope(self, envelope):
+        self.envelopes += 1
+
+
+def settings_under_test():
+    return [
+        ("tracing off", {}),
+        ("traces_sample_rate=1.0", {"traces_sample_rate": 1.0}),
+        ("sampler 0.1, tail 1.0", sampler_options(TraceSampler(0.1, tail_rate=1.0))),
+        ("sampler 0.1, no tail", sampler_options(TraceSampler(0.1, tail_rate=0.0))),
+        ("sampler 0.0 (errors)", sampler_options(TraceSampler(0.0, tail_rate=0.0))),
+    ]
+
+
+def sampler_options(sampler):
+    return {
+        "traces_sampler": sampler,
+        "before_send_transaction": sampler.before_send_transaction,
+    }
+
+
+def populate(rows):
+    author = User.objects.create(username="bench", email="bench@example.com")
+    Post.objects.bulk_create(
+        [
+            Post(
+                author=author,
+                title=f"Post {i}",
+                content="word " * 200,
+                excerpt="word " * 40,
+                word_count=200,
+                is_published=True,
+            )
+            for i in range(rows)
+        ]
+    )
+
+
+def environ(path):
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "localhost",
+        "HTTP_X_FORWARDED_PROTO": "https",
+        "wsgi.url_scheme": "https",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+def run(application, path, requests):
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        body = application(environ(path), start_response)
+        b"".join(body)
+        if hasattr(body, "close"):
+            body.close()
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=20)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.rows)
+        application = get_wsgi_application()
+        baseline = {}
+
+        print(f"{'setting':<24}{'route':<28}{'us/req':>9}{'overhead':>10}{'sent':>7}")
+        for name, options in settings_under_test():
+            transport = CountingTransport()
+            sentry_sdk.init(
+                dsn="https://public@sentry.invalid/1",
+                integrations=[DjangoIntegration()],
+                transport=transport,
+                **options,
+            )
+            for path in ROUTES:
+                run(application, path, min(args.requests, 50))  # warm up
+                transport.envelopes = 0
+                per_request = run(application, path, args.requests)
+                sentry_sdk.flush()
+                baseline.setdefault(path, per_request)
+                overhead = per_request - baseline[path]
+                print(
+                    f"{name:<24}{path:<28}{per_request * 1e6:>9.0f}"
+                    f"{overhead * 1e6:>+10.0f}{transport.envelopes:>7}"
+                )
+    finally:
+        sentry_sdk.init()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
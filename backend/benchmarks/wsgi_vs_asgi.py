@@ -0,0 +1,277 @@
+"""
+Throughput of the public read endpoints: sync views under WSGI against the
+async views (``ASYNC_READ_VIEWS``) under ASGI, at the same concurrency.
+
+Both handlers are driven in-process against a throwaway test database, so
+no server is needed: ``--concurrency`` clients send requests, which WSGI
+serves on a pool of ``--wsgi-threads`` threads (like one gunicorn gthread
+worker) and ASGI as tasks on one event loop. ``--db-latency`` adds a sleep
+to every query to stand in for the round trip to a database server:
+
+    python benchmarks/wsgi_vs_asgi.py --requests 2000 --concurrency 32
+
+Each mode runs in its own subprocess because the URLconf is fixed at import.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROUTES = [
+    "/api/blog/search/?q=bench",
+    "/api/blog/stats/",
+    "/api/blog/posts/featured/",
+    "/api/blog/posts/tags/",
+    "/api/blog/projects/technologies/",
+    "/api/users/members/?skill=python",
+]
+
+
+def setup(mode):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+    os.environ["ASYNC_READ_VIEWS"] = "True" if mode == "asgi" else "False"
+    os.environ.setdefault("METRICS_ENABLED", "False")
+
+    import django
+
+    django.setup()
+
+    import sentry_sdk
+
+    # Settings start Sentry with LAZY_STARTUP off; keep it out of the numbers
+    sentry_sdk.init()
+
+
+def populate(rows):
+    from blog.models import Post, Project
+    from users.models import User
+
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                first_name="Bench",
+                last_name=f"User{i}",
+                password="!",
+                skills="Python, Django",
+            )
+            for i in range(rows)
+        ]
+    )
+    # save() keeps the tag and technology indexes current
+    for i, user in enumerate(users):
+        Project.objects.create(
+            owner=user,
+            title=f"Bench project {i}",
+            description="bench " * 50,
+            tech_stack="Python, Django",
+        )
+        Post.objects.create(
+            author=user,
+            title=f"Bench post {i}",
+            content="bench " * 200,
+            tags="bench, python",
+            is_published=True,
+        )
+
+
+def add_db_latency(seconds):
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if slow not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow)
+
+    connection_created.connect(install, weak=False)
+    for alias in connections:
+        install(None, connections[alias])
+
+
+def split(route):
+    path, _, query = route.partition("?")
+    return path, query
+
+
+def run_wsgi(requests, concurrency, threads):
+    from django.core.wsgi import get_wsgi_application
+    from django.db import close_old_connections
+
+    application = get_wsgi_application()
+
+    def call(route):
+        path, query = split(route)
+        status = []
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "443",
+            "HTTP_HOST": "localhost",
+            "HTTP_X_FORWARDED_PROTO": "https",
+            "wsgi.url_scheme": "https",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+        }
+        body = application(environ, lambda s, h, e=None: status.append(s))
+        b"".join(body)
+        body.close()
+        return int(status[0].split()[0])
+
+    def worker(indices):
+        try:
+            return [call(ROUTES[i % len(ROUTES)]) for i in indices]
+        finally:
+            close_old_connections()
+
+    # Clients beyond the thread count just queue, as they would in a server
+    threads = min(concurrency, threads)
+    chunks = [range(n, requests, threads) for n in range(threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        statuses = [s for chunk in pool.map(worker, chunks) for s in chunk]
+    return time.perf_counter() - start, statuses
+
+
+def run_asgi(requests, concurrency, threads):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def call(route):
+        path, query = split(route)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "https",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": [(b"host", b"localhost"), (b"x-forwarded-proto", b"https")],
+            "server": ("localhost", 443),
+        }
+        received = False
+        done = asyncio.Event()
+        status = []
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif not message.get("more_body"):
+                done.set()
+
+        await application(scope, receive, send)
+        return status[0]
+
+    async def worker(indices):
+        return [await call(ROUTES[i % len(ROUTES)]) for i in indices]
+
+    async def main():
+        chunks = [range(n, requests, concurrency) for n in range(concurrency)]
+        results = await asyncio.gather(*(worker(chunk) for chunk in chunks))
+        return [s for chunk in results for s in chunk]
+
+    start = time.perf_counter()
+    statuses = asyncio.run(main())
+    return time.perf_counter() - start, statuses
+
+
+def child(args):
+    setup(args.child)
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.rows)
+        add_db_latency(args.db_latency / 1000)
+        run = run_asgi if args.child == "asgi" else run_wsgi
+        run(min(args.requests, 200), args.concurrency, args.wsgi_threads)  # warm up
+        elapsed, statuses = run(args.requests, args.concurrency, args.wsgi_threads)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(
+        json.dumps(
+            {
+                "rps": args.requests / elapsed,
+                "errors": sum(status >= 400 for status in statuses),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--wsgi-threads", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument(
+        "--db-latency", type=float, default=1.0, help="Milliseconds added per query"
+    )
+    parser.add_argument("--child", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.concurrency = args.concurrency[0]
+        return child(args)
+
+    print(f"{'concurrency':>11}{'wsgi req/s':>12}{'asgi req/s':>12}{'errors':>8}")
+    for concurrency in args.concurrency:
+        results = {}
+        for mode in ("wsgi", "asgi"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--child",
+                    mode,
+                    "--requests",
+                    str(args.requests),
+                    "--concurrency",
+                    str(concurrency),
+                    "--wsgi-threads",
+                    str(args.wsgi_threads),
+                    "--rows",
+                    str(args.rows),
+                    "--db-latency",
+                    str(args.db_latency),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+        errors = results["wsgi"]["errors"] + results["asgi"]["errors"]
+        print(
+            f"{concurrency:>11}{results['wsgi']['rps']:>12.0f}"
+            f"{results['asgi']['rps']:>12.0f}{errors:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
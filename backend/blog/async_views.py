@@ -0,0 +1,119 @@
+"""
+Async variants of the public read-only blog endpoints, served instead of
+the DRF views when ``ASYNC_READ_VIEWS`` is set (see ``project.async_views``).
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.views.decorators.http import require_GET
+
+from project.async_views import alist, json_response
+
+from . import stats
+from .models import Post, Project, Tag, Technology
+from .serializers import (
+    PostListSerializer,
+    PostListValuesSerializer,
+    ProjectListSerializer,
+    ProjectListValuesSerializer,
+)
+from .views import search_posts, search_projects
+
+
+@require_GET
+async def search_content(request):
+    """Global search across projects and posts, best matches first"""
+    query = request.GET.get("q", "")
+
+    if not query:
+        return json_response(
+            {"projects": [], "posts": [], "message": "No search query provided"}
+        )
+
+    # The full-text lookups are raw SQL, which the async ORM cannot run
+    def find(search, serializer_class):
+        return serializer_class(
+            search(query), many=True, context={"request": request}
+        ).data
+
+    projects, posts = await asyncio.gather(
+        sync_to_async(find)(search_projects, ProjectListSerializer),
+        sync_to_async(find)(search_posts, PostListSerializer),
+    )
+    return json_response({"projects": projects, "posts": posts, "query": query})
+
+
+@require_GET
+async def dashboard_stats(request):
+    """Get public dashboard statistics"""
+    User = get_user_model()
+
+    async def build():
+        users, projects, posts = await asyncio.gather(
+            User.objects.filter(is_active=True).acount(),
+            Project.objects.acount(),
+            Post.objects.filter(is_published=True).acount(),
+        )
+        return {
+            "total_users": users,
+            "total_projects": projects,
+            "total_posts": posts,
+        }
+
+    return json_response(await stats.aget_cached("dashboard", build))
+
+
+@require_GET
+async def featured_projects(request):
+    """Get featured projects (latest 6 projects)"""
+    queryset = Project.objects.all()
+    tech = request.GET.get("tech")
+    if tech:
+        queryset = queryset.filter(technologies__slug=tech.strip().lower())
+
+    rows = await alist(ProjectListValuesSerializer.values(queryset)[:6])
+    return json_response(
+        ProjectListValuesSerializer(rows, many=True, context={"request": request}).data
+    )
+
+
+@require_GET
+async def project_technologies(request):
+    """
+    Get all unique technologies used in projects.
+    Pass ?counts=true to get project counts for faceting.
+    """
+    technologies = Technology.objects.filter(project_count__gt=0)
+
+    if request.GET.get("counts", "").lower() in ("1", "true", "yes"):
+        return json_response(await alist(technologies.values("name", "project_count")))
+
+    return json_response(await alist(technologies.values_list("name", flat=True)))
+
+
+@require_GET
+async def featured_posts(request):
+    """Get featured posts (latest 6 published posts)"""
+    queryset = Post.objects.filter(is_published=True)
+    tag = request.GET.get("tag")
+    if tag:
+        queryset = queryset.filter(tag_set__slug=tag.strip().lower())
+
+    rows = await alist(PostListValuesSerializer.values(queryset)[:6])
+    return json_response(
+        PostListValuesSerializer(rows, many=True, context={"request": request}).data
+    )
+
+
+@require_GET
+async def post_tags(request):
+    """Get all unique tags used in published posts"""
+    tags = (
+        Tag.objects.filter(posts__is_published=True)
+        .distinct()
+        .values_list("name", flat=True)
+    )
+    return json_response(await alist(tags))
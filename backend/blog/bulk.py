@@ -0,0 +1,237 @@
+"""
+Batch writes for ``ProjectViewSet`` and ``PostViewSet``.
+
+``POST <list url>bulk/`` takes lists of operations, e.g. for posts::
+
+    {
+        "create": [{"title": "...", "content": "..."}],
+        "update": [{"id": 3, "title": "..."}],
+        "delete": [4, 5],
+        "publish": [6],
+        "unpublish": [7]
+    }
+
+Every object named by id is loaded, and its ownership checked, in one
+query. Items that fail validation or permission checks are reported and
+skipped; the rest are written with ``bulk_create``, ``bulk_update`` and a
+single ``delete`` inside one transaction. Results come back per operation,
+in request order, each with its own HTTP status::
+
+    {"update": [{"id": 3, "status": 200, "data": {...}}],
+     "delete": [{"id": 4, "status": 204},
+                {"id": 5, "status": 404, "errors": {"detail": "Not found."}}]}
+
+Bulk writes skip ``save()`` and ``post_save``, so the tag and technology
+indexes, search index and statistics are updated here set-wise instead.
+Images cannot be uploaded or changed in bulk.
+"""
+
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import search, stats
+
+
+class BulkRequestSerializer(serializers.Serializer):
+    create = serializers.ListField(child=serializers.DictField(), default=list)
+    update = serializers.ListField(child=serializers.DictField(), default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), default=list)
+
+    def validate(self, attrs):
+        total = sum(len(items) for items in attrs.values())
+        if not total:
+            raise serializers.ValidationError("No operations given.")
+        if total > settings.BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"At most {settings.BULK_MAX_ITEMS} operations per request."
+            )
+        return attrs
+
+
+class PostBulkRequestSerializer(BulkRequestSerializer):
+    publish = serializers.ListField(child=serializers.IntegerField(), default=list)
+    unpublish = serializers.ListField(child=serializers.IntegerField(), default=list)
+
+
+def _error(code, errors):
+    if not isinstance(errors, dict):
+        errors = {"detail": errors}
+    return {"status": code, "errors": errors}
+
+
+class BulkWriteMixin:
+    """
+    Adds the ``bulk`` action. Subclasses set ``owner_field`` and
+    ``image_fields`` and may extend ``bulk_changes``, ``prepare_bulk`` and
+    ``sync_bulk``.
+    """
+
+    bulk_request_serializer_class = BulkRequestSerializer
+    owner_field = None
+    image_fields = ()
+
+    def bulk_changes(self, operations):
+        """
+        Yield (operation, index, pk, changes) for every operation on an
+        existing object; ``changes`` is None for a delete.
+        """
+        for index, item in enumerate(operations["update"]):
+            changes = dict(item)
+            yield "update", index, changes.pop("id", None), changes
+        for index, pk in enumerate(operations["delete"]):
+            yield "delete", index, pk, None
+
+    def prepare_bulk(self, instance, fields):
+        """Update derived fields before writing; return any extra field names"""
+        return set()
+
+    def sync_bulk(self, instances, fields):
+        """Bring the indexes of created or updated ``instances`` up to date"""
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create, update and delete several objects in one transaction"""
+        envelope = self.bulk_request_serializer_class(data=request.data)
+        envelope.is_valid(raise_exception=True)
+        operations = envelope.validated_data
+        results = {name: [None] * len(items) for name, items in operations.items()}
+
+        updated, deleted = self._check_changes(operations, results)
+        created = self._check_creates(operations["create"], results)
+        self._write(created, updated, deleted)
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        for index, instance in created:
+            results["create"][index] = {
+                "status": 201,
+                "data": serializer_class(instance, context=context).data,
+            }
+        for pk, (operation, index, instance, _) in updated.items():
+            results[operation][index] = {
+                "id": pk,
+                "status": 200,
+                "data": serializer_class(instance, context=context).data,
+            }
+        return Response(results, status=status.HTTP_200_OK)
+
+    def _check_changes(self, operations, results):
+        """
+        Load, permission-check and validate every change to an existing
+        object, recording failures in ``results``. Returns the updates, by
+        pk, and the pks to delete.
+        """
+        model = self.queryset.model
+        user = self.request.user
+        changes = list(self.bulk_changes(operations))
+        pks = [pk for _, _, pk, _ in changes if isinstance(pk, int)]
+        # One query for existence and ownership of everything named by id
+        instances = (
+            model.objects.select_related(self.owner_field).in_bulk(pks) if pks else {}
+        )
+
+        updated, deleted, seen = {}, [], set()
+        for operation, index, pk, data in changes:
+            if not isinstance(pk, int) or isinstance(pk, bool):
+                result = _error(400, {"id": ["A valid integer is required."]})
+            elif pk in seen:
+                result = _error(400, "Object appears more than once in this request.")
+            elif pk not in instances:
+                result = _error(404, "Not found.")
+            elif (
+                getattr(instances[pk], f"{self.owner_field}_id") != user.pk
+                and not user.is_admin
+            ):
+                result = _error(
+                    403,
+                    f"You can only change your own {model._meta.verbose_name_plural}.",
+                )
+            elif data is None:
+                deleted.append(pk)
+                result = {"status": 204}
+            else:
+                result, fields = self._apply_update(instances[pk], data)
+                if result is None:
+                    updated[pk] = (operation, index, instances[pk], fields)
+            if isinstance(pk, int):
+                seen.add(pk)
+            if result is not None:
+                results[operation][index] = dict({"id": pk}, **result)
+        return updated, deleted
+
+    def _check_creates(self, items, results):
+        """Validate new objects, recording failures in ``results``"""
+        model = self.queryset.model
+        user = self.request.user
+        created = []
+        for index, data in enumerate(items):
+            if not user.can_create_content:
+                results["create"][index] = _error(
+                    403,
+                    "You don't have permission to create "
+                    f"{model._meta.verbose_name_plural}.",
+                )
+                continue
+            errors = self._image_errors(data)
+            serializer = self.get_serializer(data=data)
+            if errors or not serializer.is_valid():
+                results["create"][index] = _error(400, errors or serializer.errors)
+                continue
+            instance = model(**serializer.validated_data)
+            setattr(instance, self.owner_field, user)
+            self.prepare_bulk(instance, set(serializer.validated_data))
+            created.append((index, instance))
+        return created
+
+    def _write(self, created, updated, deleted):
+        model = self.queryset.model
+        changed = [instance for _, _, instance, _ in updated.values()]
+        fields = set().union(*(fields for _, _, _, fields in updated.values()))
+
+        with transaction.atomic():
+            new = model.objects.bulk_create([instance for _, instance in created])
+            if changed:
+                now = timezone.now()
+                written = set(fields)
+                for instance in changed:
+                    written |= self.prepare_bulk(instance, fields)
+                    instance.updated_at = now
+                model.objects.bulk_update(changed, sorted(written | {"updated_at"}))
+            if deleted:
+                # Deletes still send post_delete, which keeps every index current
+                model.objects.filter(pk__in=deleted).delete()
+
+            if new:
+                self.sync_bulk(new, None)
+            if changed:
+                self.sync_bulk(changed, fields)
+            search.index_instances(new + changed)
+            if new or changed:
+                stats.invalidate()
+
+    def _image_errors(self, data):
+        return {
+            field: ["Images cannot be changed in bulk."]
+            for field in self.image_fields
+            if field in data
+        }
+
+    def _apply_update(self, instance, data):
+        """
+        Validate ``data`` onto ``instance``; return an error result, or None
+        and the names of the fields changed
+        """
+        errors = self._image_errors(data)
+        if errors:
+            return _error(400, errors), set()
+        serializer = self.get_serializer(instance, data=data, partial=True)
+        if not serializer.is_valid():
+            return _error(400, serializer.errors), set()
+        for name, value in serializer.validated_data.items():
+            setattr(instance, name, value)
+        return None, set(serializer.validated_data)
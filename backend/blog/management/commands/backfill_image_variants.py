@@ -0,0 +1,54 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from project import images
+
+
+class Command(BaseCommand):
+    help = "Generate resized image variants for existing uploads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=sorted(images.IMAGE_FIELDS),
+            action="append",
+            help="Only process this model (repeatable); default is all",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants that are already up to date",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Rows fetched per database round trip",
+        )
+
+    def handle(self, *args, **options):
+        for label in options["model"] or images.IMAGE_FIELDS:
+            field_name = images.IMAGE_FIELDS[label]
+            model = apps.get_model(label)
+            queryset = (
+                model._default_manager.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .only("pk", field_name, images.variants_field(field_name))
+            )
+
+            done = failed = 0
+            for instance in queryset.iterator(chunk_size=options["chunk_size"]):
+                if not options["force"] and not images.needs_variants(
+                    instance, field_name
+                ):
+                    continue
+                try:
+                    images.generate(instance, field_name)
+                    done += 1
+                except Exception as exc:  # missing or unreadable file
+                    failed += 1
+                    self.stderr.write(f"{label} {instance.pk}: {exc}")
+
+            self.stdout.write(
+                self.style.SUCCESS(f"{label}: generated {done}, failed {failed}")
+            )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored excerpt and word count of every post"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows fetched and updated per database round trip",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only fill posts whose excerpt is still empty",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        queryset = Post.objects.only("id", "content")
+        if options["missing_only"]:
+            queryset = queryset.filter(excerpt="").exclude(content="")
+
+        batch = []
+        count = 0
+        for post in queryset.iterator(chunk_size=chunk_size):
+            post.refresh_summary()
+            batch.append(post)
+            if len(batch) >= chunk_size:
+                count += self.flush(batch)
+                batch = []
+        count += self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} post(s)"))
+
+    def flush(self, batch):
+        if batch:
+            Post.objects.bulk_update(batch, ["excerpt", "word_count"])
+        return len(batch)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post, Project
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for posts and projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=["post", "project"],
+            help="Only rebuild one kind of document",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows fetched per database round trip",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            self.stderr.write("No full-text search backend for this database.")
+            return
+
+        models = {"post": Post, "project": Project}
+        kinds = [options["kind"]] if options["kind"] else list(models)
+
+        for kind in kinds:
+            with transaction.atomic():
+                backend.clear(kind)
+                count = 0
+                for instance in models[kind].objects.iterator(
+                    chunk_size=options["chunk_size"]
+                ):
+                    backend.index(instance)
+                    count += 1
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {kind}(s)"))
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+def populate_post_tags(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Tag = apps.get_model("blog", "Tag")
+    PostTag = apps.get_model("blog", "PostTag")
+
+    names = {}
+    post_slugs = []
+    for post_id, tags in Post.objects.exclude(tags="").values_list("id", "tags"):
+        slugs = []
+        for name in tags.split(","):
+            name = name.strip()
+            if name and name.lower() not in slugs:
+                names.setdefault(name.lower(), name)
+                slugs.append(name.lower())
+        post_slugs.append((post_id, slugs))
+
+    Tag.objects.bulk_create(
+        [Tag(name=name, slug=slug) for slug, name in names.items()],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+    tag_ids = dict(Tag.objects.values_list("slug", "id"))
+    PostTag.objects.bulk_create(
+        [
+            PostTag(post_id=post_id, tag_id=tag_ids[slug])
+            for post_id, slugs in post_slugs
+            for slug in slugs
+        ],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+
+
+def clear_post_tags(apps, schema_editor):
+    apps.get_model("blog", "PostTag").objects.all().delete()
+    apps.get_model("blog", "Tag").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0002_tag_posttag"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_post_tags, clear_post_tags),
+    ]
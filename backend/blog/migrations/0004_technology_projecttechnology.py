@@ -0,0 +1,81 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0003_populate_post_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Technology",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("slug", models.CharField(max_length=255, unique=True)),
+                ("project_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Technologies",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProjectTechnology",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="technology_links",
+                        to="blog.project",
+                    ),
+                ),
+                (
+                    "technology",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="project_links",
+                        to="blog.technology",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="technologies",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="projects",
+                through="blog.ProjectTechnology",
+                to="blog.technology",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="projecttechnology",
+            constraint=models.UniqueConstraint(
+                fields=("technology", "project"),
+                name="blog_projecttechnology_unique_technology_project",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+
+def populate_project_technologies(apps, schema_editor):
+    Project = apps.get_model("blog", "Project")
+    Technology = apps.get_model("blog", "Technology")
+    ProjectTechnology = apps.get_model("blog", "ProjectTechnology")
+
+    names = {}
+    counts = {}
+    project_slugs = []
+    for project_id, tech_stack in Project.objects.exclude(tech_stack="").values_list(
+        "id", "tech_stack"
+    ):
+        slugs = []
+        for name in tech_stack.split(","):
+            name = name.strip()
+            if name and name.lower() not in slugs:
+                names.setdefault(name.lower(), name)
+                counts[name.lower()] = counts.get(name.lower(), 0) + 1
+                slugs.append(name.lower())
+        project_slugs.append((project_id, slugs))
+
+    Technology.objects.bulk_create(
+        [
+            Technology(name=name, slug=slug, project_count=counts[slug])
+            for slug, name in names.items()
+        ],
+        batch_size=500,
+    )
+    technology_ids = dict(Technology.objects.values_list("slug", "id"))
+    ProjectTechnology.objects.bulk_create(
+        [
+            ProjectTechnology(project_id=project_id, technology_id=technology_ids[slug])
+            for project_id, slugs in project_slugs
+            for slug in slugs
+        ],
+        batch_size=500,
+    )
+
+
+def clear_project_technologies(apps, schema_editor):
+    apps.get_model("blog", "ProjectTechnology").objects.all().delete()
+    apps.get_model("blog", "Technology").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0004_technology_projecttechnology"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_project_technologies, clear_project_technologies),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS blog_search_index USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    is_published UNINDEXED,
+    title,
+    body,
+    tags,
+    tokenize = 'porter unicode61'
+)
+"""
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE IF NOT EXISTS blog_search_index (
+        kind varchar(16) NOT NULL,
+        object_id bigint NOT NULL,
+        is_published boolean NOT NULL DEFAULT true,
+        document tsvector NOT NULL,
+        PRIMARY KEY (kind, object_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS blog_search_index_document_gin
+    ON blog_search_index USING gin (document)
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+    else:
+        return
+
+    # Backfill from existing rows using the same code path as live updates
+    from blog.search import get_search_backend
+
+    alias = schema_editor.connection.alias
+    backend = get_search_backend(alias)
+    Post = apps.get_model("blog", "Post")
+    Project = apps.get_model("blog", "Project")
+    for model in (Post, Project):
+        for instance in model.objects.using(alias).iterator(chunk_size=500):
+            backend.index(instance)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS blog_search_index")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0005_populate_project_technologies"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
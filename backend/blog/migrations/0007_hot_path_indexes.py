@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+from project.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("blog", "0006_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["created_at"],
+                name="blog_post_published_created",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "created_at"], name="blog_post_author_created"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(fields=["title"], name="blog_post_title"),
+        ),
+        AddIndexConcurrently(
+            model_name="project",
+            index=models.Index(
+                fields=["owner", "created_at"], name="blog_project_owner_created"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="project",
+            index=models.Index(fields=["created_at"], name="blog_project_created"),
+        ),
+        AddIndexConcurrently(
+            model_name="project",
+            index=models.Index(fields=["title"], name="blog_project_title"),
+        ),
+    ]
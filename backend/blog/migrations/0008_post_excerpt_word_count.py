@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    # Same rules as Post.refresh_summary; see also backfill_post_excerpts
+    Post = apps.get_model("blog", "Post")
+    batch = []
+    for post in Post.objects.only("id", "content").iterator(chunk_size=500):
+        content = post.content or ""
+        post.excerpt = content[:200] + ("..." if len(content) > 200 else "")
+        post.word_count = len(content.split())
+        batch.append(post)
+        if len(batch) >= 500:
+            Post.objects.bulk_update(batch, ["excerpt", "word_count"])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ["excerpt", "word_count"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0007_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=203),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
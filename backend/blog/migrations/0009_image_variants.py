@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0008_post_excerpt_word_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="cover_image_variants",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_variants",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,7 +1,49 @@
 # Create your models here.
+from collections import Counter, defaultdict
+
 from django.db import models
 
 
+def split_comma_separated(value):
+    """Split a comma-separated string into stripped, de-duplicated names"""
+    names = []
+    seen = set()
+    for name in (value or "").split(","):
+        name = name.strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(content):
+    """Return the first EXCERPT_LENGTH characters of content, marked if cut"""
+    if not content:
+        return ""
+    return content[:EXCERPT_LENGTH] + ("..." if len(content) > EXCERPT_LENGTH else "")
+
+
+# =======================
+# TECHNOLOGY MODEL
+# =======================
+class Technology(models.Model):
+    # Display name as first written; slug is the case-insensitive lookup key
+    name = models.CharField(max_length=255)
+    slug = models.CharField(max_length=255, unique=True)
+    # Number of projects using this technology, maintained on write
+    project_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name_plural = "Technologies"
+
+    def __str__(self):
+        return self.name
+
+
 # =======================
 # PROJECT MODEL
 # =======================
@@ -17,13 +59,137 @@ class Project(models.Model):
     )
     demo_link = models.URLField(blank=True, null=True)
     source_code = models.URLField(blank=True, null=True)
+    # Normalized copy of ``tech_stack`` kept in sync on save, used for lookups
+    technologies = models.ManyToManyField(
+        Technology, through="ProjectTechnology", related_name="projects", blank=True
+    )
     image = models.ImageField(upload_to="projects/", blank=True, null=True)
+    # Resized copies of ``image``, written by project.images after upload
+    image_variants = models.JSONField(blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["owner", "created_at"], name="blog_project_owner_created"
+            ),
+            models.Index(fields=["created_at"], name="blog_project_created"),
+            models.Index(fields=["title"], name="blog_project_title"),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "tech_stack" in update_fields:
+            self.sync_technologies()
+
+    def sync_technologies(self):
+        """
+        Mirror the comma-separated ``tech_stack`` string into ``technologies``
+        and keep ``Technology.project_count`` up to date
+        """
+        self.sync_technologies_for([self])
+
+    @staticmethod
+    def sync_technologies_for(projects):
+        """``sync_technologies`` for several saved projects at once"""
+        wanted = {
+            project.pk: {
+                name.lower(): name for name in split_comma_separated(project.tech_stack)
+            }
+            for project in projects
+        }
+
+        existing = defaultdict(set)
+        for project_id, slug in ProjectTechnology.objects.filter(
+            project__in=wanted
+        ).values_list("project_id", "technology__slug"):
+            existing[project_id].add(slug)
+        stale = models.Q()
+        for project_id, slugs in existing.items():
+            if slugs - wanted[project_id].keys():
+                stale |= models.Q(
+                    project_id=project_id,
+                    technology__slug__in=slugs - wanted[project_id].keys(),
+                )
+        if stale:
+            # Counts are decremented by the post_delete handler in blog.signals
+            ProjectTechnology.objects.filter(stale).delete()
+
+        missing = {
+            project_id: [slug for slug in names if slug not in existing[project_id]]
+            for project_id, names in wanted.items()
+        }
+        names = {
+            slug: wanted[project_id][slug]
+            for project_id, slugs in missing.items()
+            for slug in slugs
+        }
+        if names:
+            Technology.objects.bulk_create(
+                [Technology(name=name, slug=slug) for slug, name in names.items()],
+                ignore_conflicts=True,
+            )
+            technologies = dict(
+                Technology.objects.filter(slug__in=names).values_list("slug", "pk")
+            )
+            added = Counter()
+            links = []
+            for project_id, slugs in missing.items():
+                for slug in slugs:
+                    links.append(
+                        ProjectTechnology(
+                            project_id=project_id, technology_id=technologies[slug]
+                        )
+                    )
+                    added[technologies[slug]] += 1
+            ProjectTechnology.objects.bulk_create(links)
+
+            by_amount = defaultdict(list)
+            for pk, amount in added.items():
+                by_amount[amount].append(pk)
+            for amount, pks in by_amount.items():
+                Technology.objects.filter(pk__in=pks).update(
+                    project_count=models.F("project_count") + amount
+                )
+
+
+class ProjectTechnology(models.Model):
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="technology_links"
+    )
+    technology = models.ForeignKey(
+        Technology, on_delete=models.CASCADE, related_name="project_links"
+    )
+
+    class Meta:
+        # Also serves as the (technology, project) index for tech filtering
+        constraints = [
+            models.UniqueConstraint(
+                fields=["technology", "project"],
+                name="blog_projecttechnology_unique_technology_project",
+            )
+        ]
+
+
+# =======================
+# TAG MODEL
+# =======================
+class Tag(models.Model):
+    # Display name as first written; slug is the case-insensitive lookup key
+    name = models.CharField(max_length=255)
+    slug = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
 
 # =======================
 # BLOG POST MODEL
@@ -35,13 +201,119 @@ class Post(models.Model):
     )
     title = models.CharField(max_length=255)
     content = models.TextField()
+    # Derived from content on save so list views can skip loading it
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH + 3, blank=True, editable=False
+    )
+    word_count = models.PositiveIntegerField(default=0, editable=False)
     cover_image = models.ImageField(upload_to="posts/", blank=True, null=True)
+    # Resized copies of ``cover_image``, written by project.images after upload
+    cover_image_variants = models.JSONField(blank=True, null=True, editable=False)
     tags = models.CharField(
         max_length=255, blank=True, help_text="Comma-separated tags"
     )
+    # Normalized copy of ``tags`` kept in sync on save, used for lookups
+    tag_set = models.ManyToManyField(
+        Tag, through="PostTag", related_name="posts", blank=True
+    )
     is_published = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Partial rather than (is_published, created_at): Django renders
+            # is_published=True as a bare column test, which SQLite can only
+            # match against an index condition, not a leading index column
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_post_published_created",
+            ),
+            models.Index(
+                fields=["author", "created_at"], name="blog_post_author_created"
+            ),
+            models.Index(fields=["title"], name="blog_post_title"),
+        ]
+
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if "content" not in self.get_deferred_fields():
+            self.refresh_summary()
+            if update_fields is not None and "content" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "excerpt", "word_count"}
+
+        super().save(*args, **kwargs)
+        if update_fields is None or "tags" in update_fields:
+            self.sync_tags()
+
+    def refresh_summary(self):
+        """Recompute ``excerpt`` and ``word_count`` from ``content``"""
+        self.excerpt = make_excerpt(self.content)
+        self.word_count = len(self.content.split())
+
+    def sync_tags(self):
+        """Mirror the comma-separated ``tags`` string into ``tag_set``"""
+        self.sync_tags_for([self])
+
+    @staticmethod
+    def sync_tags_for(posts):
+        """``sync_tags`` for several saved posts at once"""
+        wanted = {
+            post.pk: {name.lower(): name for name in split_comma_separated(post.tags)}
+            for post in posts
+        }
+
+        existing = defaultdict(set)
+        for post_id, slug in PostTag.objects.filter(post__in=wanted).values_list(
+            "post_id", "tag__slug"
+        ):
+            existing[post_id].add(slug)
+        stale = models.Q()
+        for post_id, slugs in existing.items():
+            if slugs - wanted[post_id].keys():
+                stale |= models.Q(
+                    post_id=post_id, tag__slug__in=slugs - wanted[post_id].keys()
+                )
+        if stale:
+            PostTag.objects.filter(stale).delete()
+
+        missing = {
+            post_id: [slug for slug in names if slug not in existing[post_id]]
+            for post_id, names in wanted.items()
+        }
+        names = {
+            slug: wanted[post_id][slug]
+            for post_id, slugs in missing.items()
+            for slug in slugs
+        }
+        if names:
+            Tag.objects.bulk_create(
+                [Tag(name=name, slug=slug) for slug, name in names.items()],
+                ignore_conflicts=True,
+            )
+            tags = dict(Tag.objects.filter(slug__in=names).values_list("slug", "pk"))
+            PostTag.objects.bulk_create(
+                [
+                    PostTag(post_id=post_id, tag_id=tags[slug])
+                    for post_id, slugs in missing.items()
+                    for slug in slugs
+                ],
+                ignore_conflicts=True,
+            )
+
+
+class PostTag(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="tag_links")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="post_links")
+
+    class Meta:
+        # Also serves as the (tag, post) index for tag filtering
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tag", "post"], name="blog_posttag_unique_tag_post"
+            )
+        ]
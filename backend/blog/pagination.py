@@ -0,0 +1,36 @@
+from rest_framework.pagination import CursorPagination  # type: ignore
+
+from django.conf import settings
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Cursor pagination for project and post listings.
+
+    DRF's cursor holds the first ordering field's value (``created_at``
+    unless ``?ordering=`` picks another) plus an offset past the rows that
+    share it. A page is read with ``WHERE created_at < <value>`` and that
+    offset, so a deep page costs about the same as the first as long as few
+    rows share a value, and no ``COUNT(*)`` is issued. ``id`` always ends
+    the ordering so rows that tie keep the same order between requests.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 20)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+        return super().get_page_size(request)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Honour ``OrderingFilter`` but always end on ``id`` so rows sharing a
+        timestamp or title keep a stable position between pages.
+        """
+        ordering = super().get_ordering(request, queryset, view)
+        if any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            return ordering
+
+        tie_breaker = "-id" if ordering[0].startswith("-") else "id"
+        return ordering + (tie_breaker,)
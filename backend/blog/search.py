@@ -0,0 +1,216 @@
+"""
+Full-text search index for projects and posts.
+
+Documents live in a single ``blog_search_index`` table created by migration
+0006: an FTS5 virtual table on SQLite and a ``tsvector`` table with a GIN
+index on PostgreSQL. Rows are kept current by the signal handlers in
+``blog.signals`` and can be rebuilt with ``manage.py rebuild_search_index``.
+"""
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+TABLE = "blog_search_index"
+
+# Each kind gets its own residue so (kind, pk) maps to a unique integer key
+KINDS = {"post": 0, "project": 1}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _document_for(instance):
+    """Return (kind, title, body, tags, is_published) for a Post or Project"""
+    # Dispatch on the model name so historical models in migrations work too
+    kind = instance._meta.model_name
+    if kind == "post":
+        return (
+            kind,
+            instance.title,
+            instance.content,
+            instance.tags,
+            instance.is_published,
+        )
+    if kind == "project":
+        return (kind, instance.title, instance.description, instance.tech_stack, True)
+    raise TypeError(f"{type(instance).__name__} is not searchable")
+
+
+def _doc_key(kind, pk):
+    return pk * len(KINDS) + KINDS[kind]
+
+
+def search_terms(query):
+    """Split free text into word tokens, dropping any query syntax"""
+    return _WORD_RE.findall(query.lower())
+
+
+class SQLiteSearchBackend:
+    """FTS5 index ranked with bm25 (title > tags > body)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, instance):
+        self.index_many([instance])
+
+    def index_many(self, instances):
+        rows = []
+        for instance in instances:
+            kind, title, body, tags, published = _document_for(instance)
+            key = _doc_key(kind, instance.pk)
+            rows.append([key, kind, instance.pk, int(published), title, body, tags])
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN "
+                f"({', '.join(['%s'] * len(rows))})",
+                [row[0] for row in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} "
+                "(rowid, kind, object_id, is_published, title, body, tags) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, kind, pk):
+        self.remove_many(kind, [pk])
+
+    def remove_many(self, kind, pks):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN "
+                f"({', '.join(['%s'] * len(pks))})",
+                [_doc_key(kind, pk) for pk in pks],
+            )
+
+    def clear(self, kind):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid %% %s = %s",
+                [len(KINDS), KINDS[kind]],
+            )
+
+    def search(self, kind, terms, limit, published_only=False):
+        match = " ".join(f'"{term}"*' for term in terms)
+        sql = f"SELECT object_id FROM {TABLE} WHERE {TABLE} MATCH %s AND kind = %s"
+        if published_only:
+            sql += " AND is_published = 1"
+        sql += f" ORDER BY bm25({TABLE}, 0, 0, 0, 10.0, 1.0, 5.0) LIMIT %s"
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [match, kind, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """Weighted tsvector documents behind a GIN index, ranked with ts_rank"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, instance):
+        self.index_many([instance])
+
+    def index_many(self, instances):
+        rows = []
+        for instance in instances:
+            kind, title, body, tags, published = _document_for(instance)
+            rows.append([kind, instance.pk, published, title, tags, body])
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (kind, object_id, is_published, document) "
+                "VALUES (%s, %s, %s, "
+                "setweight(to_tsvector('english', %s), 'A') || "
+                "setweight(to_tsvector('english', %s), 'B') || "
+                "setweight(to_tsvector('english', %s), 'C')) "
+                "ON CONFLICT (kind, object_id) DO UPDATE SET "
+                "is_published = EXCLUDED.is_published, "
+                "document = EXCLUDED.document",
+                rows,
+            )
+
+    def remove(self, kind, pk):
+        self.remove_many(kind, [pk])
+
+    def remove_many(self, kind, pks):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE kind = %s AND object_id = ANY(%s)",
+                [kind, list(pks)],
+            )
+
+    def clear(self, kind):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE kind = %s", [kind])
+
+    def search(self, kind, terms, limit, published_only=False):
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        sql = (
+            f"SELECT object_id FROM {TABLE}, "
+            "to_tsquery('english', %s) AS query "
+            "WHERE kind = %s AND document @@ query"
+        )
+        if published_only:
+            sql += " AND is_published"
+        sql += " ORDER BY ts_rank(document, query) DESC LIMIT %s"
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [tsquery, kind, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """Return the backend for the ``using`` database, or None if unsupported"""
+    connection = connections[using]
+    backend_class = _BACKENDS.get(connection.vendor)
+    return backend_class(connection) if backend_class else None
+
+
+def index_instance(instance):
+    backend = get_search_backend()
+    if backend:
+        backend.index(instance)
+
+
+def index_instances(instances):
+    """Index several posts or projects, e.g. after ``bulk_create``"""
+    backend = get_search_backend()
+    if backend and instances:
+        backend.index_many(instances)
+
+
+def remove_instance(instance):
+    backend = get_search_backend()
+    if backend:
+        backend.remove(_document_for(instance)[0], instance.pk)
+
+
+def remove_ids(kind, pks):
+    """Drop several posts or projects by id, e.g. before a bulk delete"""
+    backend = get_search_backend()
+    if backend and pks:
+        backend.remove_many(kind, pks)
+
+
+def search(queryset, kind, query, limit=5, published_only=False):
+    """
+    Return up to ``limit`` objects from ``queryset`` matching ``query``,
+    best match first. Returns None when no search backend is available so
+    callers can fall back to plain filtering.
+    """
+    backend = get_search_backend()
+    if backend is None:
+        return None
+
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    ids = backend.search(kind, terms, limit, published_only=published_only)
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
@@ -1,5 +1,14 @@
 from rest_framework import serializers
 
+from project.images import ImageVariantsField
+from project.values_serializers import (
+    CommaListColumn,
+    DateTimeColumn,
+    FileColumn,
+    FullNameColumn,
+    ImageVariantsColumn,
+    ValuesSerializer,
+)
 from users.serializers import UserProfileSerializer
 
 from .models import Post, Project
@@ -12,6 +21,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     owner = UserProfileSerializer(read_only=True)
     tech_stack_list = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Project
@@ -24,6 +34,7 @@ class ProjectSerializer(serializers.ModelSerializer):
             "demo_link",
             "source_code",
             "image",
+            "image_variants",
             "owner",
             "created_at",
             "updated_at",
@@ -53,6 +64,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
 
     owner_name = serializers.CharField(source="owner.get_full_name", read_only=True)
     tech_stack_list = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Project
@@ -63,6 +75,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "tech_stack_list",
             "demo_link",
             "image",
+            "image_variants",
             "owner_name",
             "created_at",
         ]
@@ -76,6 +89,25 @@ class ProjectListSerializer(serializers.ModelSerializer):
         return []
 
 
+class ProjectListValuesSerializer(ValuesSerializer):
+    """
+    Read-only fast path for project listings, same output as
+    ProjectListSerializer
+    """
+
+    columns = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "tech_stack_list": CommaListColumn("tech_stack"),
+        "demo_link": "demo_link",
+        "image": FileColumn("image"),
+        "image_variants": ImageVariantsColumn("image_variants"),
+        "owner_name": FullNameColumn("owner__first_name", "owner__last_name"),
+        "created_at": DateTimeColumn("created_at"),
+    }
+
+
 class PostSerializer(serializers.ModelSerializer):
     """
     Serializer for Blog Post model with author details
@@ -83,6 +115,7 @@ class PostSerializer(serializers.ModelSerializer):
 
     author = UserProfileSerializer(read_only=True)
     tags_list = serializers.SerializerMethodField()
+    cover_image_variants = ImageVariantsField()
 
     class Meta:
         model = Post
@@ -91,6 +124,7 @@ class PostSerializer(serializers.ModelSerializer):
             "title",
             "content",
             "cover_image",
+            "cover_image_variants",
             "tags",
             "tags_list",
             "is_published",
@@ -123,7 +157,7 @@ class PostListSerializer(serializers.ModelSerializer):
 
     author_name = serializers.CharField(source="author.get_full_name", read_only=True)
     tags_list = serializers.SerializerMethodField()
-    excerpt = serializers.SerializerMethodField()
+    cover_image_variants = ImageVariantsField()
 
     class Meta:
         model = Post
@@ -131,7 +165,9 @@ class PostListSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "excerpt",
+            "word_count",
             "cover_image",
+            "cover_image_variants",
             "tags_list",
             "is_published",
             "author_name",
@@ -146,11 +182,22 @@ class PostListSerializer(serializers.ModelSerializer):
             return [tag.strip() for tag in obj.tags.split(",") if tag.strip()]
         return []
 
-    def get_excerpt(self, obj):
-        """
-        Return first 200 characters of content as excerpt
-        """
-        if obj.content:
-            return obj.content[:200] + ("..." if len(obj.content) > 200 else "")
 
-        return ""
+class PostListValuesSerializer(ValuesSerializer):
+    """
+    Read-only fast path for blog post listings, same output as
+    PostListSerializer
+    """
+
+    columns = {
+        "id": "id",
+        "title": "title",
+        "excerpt": "excerpt",
+        "word_count": "word_count",
+        "cover_image": FileColumn("cover_image"),
+        "cover_image_variants": ImageVariantsColumn("cover_image_variants"),
+        "tags_list": CommaListColumn("tags"),
+        "is_published": "is_published",
+        "author_name": FullNameColumn("author__first_name", "author__last_name"),
+        "created_at": DateTimeColumn("created_at"),
+    }
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from project import images
+
+from . import search, stats
+from .models import Post, Project, ProjectTechnology, Technology
+
+
+@receiver(post_delete, sender=ProjectTechnology)
+def decrement_technology_count(sender, instance, **kwargs):
+    """Keep project_count correct when a link or its project is deleted"""
+    Technology.objects.filter(pk=instance.technology_id, project_count__gt=0).update(
+        project_count=F("project_count") - 1
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Project)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """Re-index a post or project whenever it is saved"""
+    if not raw:
+        search.index_instance(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Project)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop a deleted post or project from the search index"""
+    search.remove_instance(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_stats(sender, update_fields=None, **kwargs):
+    """Drop cached statistics after any write that could change them"""
+    # Logins only touch last_login, which no statistic depends on
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    stats.invalidate()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def generate_image_variants(sender, **kwargs):
+    """Resize a new or replaced image once the save has committed"""
+    images.schedule_if_changed(sender, **kwargs)
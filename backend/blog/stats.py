@@ -0,0 +1,119 @@
+"""
+Aggregate statistics for the dashboard and admin endpoints.
+
+Each table is counted in a single query using conditional aggregation, and
+results are cached for ``STATS_CACHE_TTL`` seconds. Once that expires, the
+stale value keeps being served for up to ``STATS_CACHE_STALE_TTL`` seconds
+while a single request recomputes it. Any write to a user, project or post
+invalidates every cached entry (see ``blog.signals``).
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Post, Project
+
+VERSION_KEY = "stats:version"
+
+
+def user_counts():
+    User = get_user_model()
+    return User.objects.aggregate(
+        total=Count("id"),
+        admins=Count("id", filter=Q(role=User.Role.ADMIN)),
+        members=Count("id", filter=Q(role=User.Role.MEMBER)),
+        viewers=Count("id", filter=Q(role=User.Role.VIEWER)),
+        active=Count("id", filter=Q(is_active=True)),
+        inactive=Count("id", filter=Q(is_active=False)),
+    )
+
+
+def project_counts(since=None):
+    aggregates = {"total": Count("id")}
+    if since is not None:
+        aggregates["recent"] = Count("id", filter=Q(created_at__gte=since))
+    return Project.objects.aggregate(**aggregates)
+
+
+def post_counts():
+    return Post.objects.aggregate(
+        total=Count("id"),
+        published=Count("id", filter=Q(is_published=True)),
+        unpublished=Count("id", filter=Q(is_published=False)),
+    )
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate():
+    """Drop every cached statistic by moving to a new key version"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 1, timeout=None)
+
+
+def get_cached(name, builder):
+    """
+    Return ``builder()`` through the stats cache with stale-while-revalidate:
+    a fresh value is returned as-is, a stale one is returned to everyone but
+    the request that wins the refresh lock, which recomputes it.
+    """
+    ttl = getattr(settings, "STATS_CACHE_TTL", 30)
+    stale_ttl = getattr(settings, "STATS_CACHE_STALE_TTL", 300)
+    if ttl <= 0:
+        return builder()
+
+    key = f"stats:{_version()}:{name}"
+
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        value, fresh_until = entry
+        if now < fresh_until or not cache.add(f"{key}:lock", 1, timeout=ttl):
+            return value
+
+    value = builder()
+    cache.set(key, (value, now + ttl), timeout=ttl + stale_ttl)
+    cache.delete(f"{key}:lock")
+    return value
+
+
+async def _aversion():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, 1, timeout=None)
+        version = await cache.aget(VERSION_KEY, 1)
+    return version
+
+
+async def aget_cached(name, builder):
+    """``get_cached`` for async views; ``builder`` is a coroutine function"""
+    ttl = getattr(settings, "STATS_CACHE_TTL", 30)
+    stale_ttl = getattr(settings, "STATS_CACHE_STALE_TTL", 300)
+    if ttl <= 0:
+        return await builder()
+
+    key = f"stats:{await _aversion()}:{name}"
+
+    entry = await cache.aget(key)
+    now = time.time()
+    if entry is not None:
+        value, fresh_until = entry
+        if now < fresh_until or not await cache.aadd(f"{key}:lock", 1, timeout=ttl):
+            return value
+
+    value = await builder()
+    await cache.aset(key, (value, now + ttl), timeout=ttl + stale_ttl)
+    await cache.adelete(f"{key}:lock")
+    return value
@@ -1,13 +1,30 @@
+import importlib
+import json
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase, override_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from .models import Post, Project
+from . import async_views, search
+from .models import Post, Project, Tag, Technology
 
 User = get_user_model()
 
@@ -52,6 +69,26 @@ class ProjectModelTest(TestCase):
         project = Project.objects.create(**self.project_data)
         self.assertEqual(project.owner.projects.first(), project)
 
+    def test_project_technology_counts(self):
+        """Test technology usage counts follow project writes"""
+        project = Project.objects.create(**self.project_data)
+        Project.objects.create(
+            owner=self.user,
+            title="Second Project",
+            description="Another project",
+            tech_stack="python, Flask",
+        )
+
+        self.assertEqual(Technology.objects.get(slug="python").project_count, 2)
+
+        project.tech_stack = "Django"
+        project.save()
+        self.assertEqual(Technology.objects.get(slug="python").project_count, 1)
+        self.assertEqual(Technology.objects.get(slug="react").project_count, 0)
+
+        project.delete()
+        self.assertEqual(Technology.objects.get(slug="django").project_count, 0)
+
 
 class PostModelTest(TestCase):
     """Test Post model functionality"""
@@ -93,6 +130,51 @@ class PostModelTest(TestCase):
         post = Post.objects.create(**self.post_data)
         self.assertEqual(post.author.posts.first(), post)
 
+    def test_post_tags_are_normalized(self):
+        """Test saving a post mirrors its tags into the Tag table"""
+        post = Post.objects.create(**self.post_data)
+
+        self.assertEqual(
+            sorted(post.tag_set.values_list("slug", flat=True)),
+            ["django", "python", "testing"],
+        )
+
+    def test_post_tags_resync_on_update(self):
+        """Test editing the tags string adds and removes tag links"""
+        post = Post.objects.create(**self.post_data)
+        post.tags = "Python, rest"
+        post.save()
+
+        self.assertEqual(
+            sorted(post.tag_set.values_list("slug", flat=True)), ["python", "rest"]
+        )
+        # Tags are shared case-insensitively between posts
+        self.assertEqual(Tag.objects.filter(slug="python").count(), 1)
+
+    def test_post_summary_stored_on_save(self):
+        """Test excerpt and word count are persisted and kept current"""
+        post = Post.objects.create(**self.post_data)
+        self.assertEqual(post.excerpt, "This is a test blog post content")
+        self.assertEqual(post.word_count, 7)
+
+        post.content = "word " * 300
+        post.save(update_fields=["content"])
+        post.refresh_from_db()
+
+        self.assertEqual(len(post.excerpt), 203)
+        self.assertEqual(post.word_count, 300)
+
+    def test_backfill_post_excerpts_command(self):
+        """Test the backfill command fills summaries written around save()"""
+        post = Post.objects.create(**self.post_data)
+        Post.objects.filter(pk=post.pk).update(excerpt="", word_count=0)
+
+        call_command("backfill_post_excerpts", "--missing-only", stdout=StringIO())
+        post.refresh_from_db()
+
+        self.assertEqual(post.excerpt, "This is a test blog post content")
+        self.assertEqual(post.word_count, 7)
+
 
 @override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
 class ProjectAPITest(APITestCase):
@@ -166,7 +248,7 @@ class ProjectAPITest(APITestCase):
         response = self.client.get(reverse("blog:project-list"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 2)
+        self.assertGreaterEqual(len(response.data["results"]), 2)
 
     def test_list_projects_authenticated(self):
         """Test listing projects with authentication"""
@@ -174,7 +256,7 @@ class ProjectAPITest(APITestCase):
         response = self.client.get(reverse("blog:project-list"))
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 2)
+        self.assertGreaterEqual(len(response.data["results"]), 2)
 
     def test_retrieve_project(self):
         """Test retrieving a single project"""
@@ -301,20 +383,29 @@ class ProjectAPITest(APITestCase):
         self.assertIn("Django", response.data)
         self.assertIn("React", response.data)
 
+    def test_technologies_endpoint_with_counts(self):
+        """Test technologies endpoint returns per-technology counts"""
+        response = self.client.get(
+            reverse("blog:project-technologies") + "?counts=true"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn({"name": "Python", "project_count": 1}, response.data)
+
     def test_filter_projects_by_tech(self):
         """Test filtering projects by technology"""
         response = self.client.get(reverse("blog:project-list") + "?tech=Django")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Django Project")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "Django Project")
 
     def test_search_projects(self):
         """Test searching projects"""
         response = self.client.get(reverse("blog:project-list") + "?search=Django")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data["results"]), 1)
 
 
 @override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
@@ -395,7 +486,7 @@ class PostAPITest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should only see published posts
-        titles = [post["title"] for post in response.data]
+        titles = [post["title"] for post in response.data["results"]]
         self.assertIn("Published Django Post", titles)
         self.assertIn("Admin Post", titles)
         self.assertNotIn("Draft Post", titles)
@@ -407,7 +498,7 @@ class PostAPITest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should still only see published posts in list view
-        titles = [post["title"] for post in response.data]
+        titles = [post["title"] for post in response.data["results"]]
         self.assertIn("Published Django Post", titles)
         self.assertNotIn("Draft Post", titles)
 
@@ -574,15 +665,134 @@ class PostAPITest(APITestCase):
         response = self.client.get(reverse("blog:post-list") + "?tag=django")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Published Django Post")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "Published Django Post")
+
+    def test_list_posts_skips_content_column(self):
+        """Test list queries do not load the full post body"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("blog:post-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("excerpt", response.data["results"][0])
+        self.assertNotIn("content", response.data["results"][0])
+        for query in queries:
+            self.assertNotIn('"blog_post"."content"', query["sql"])
+
+    def test_filter_posts_by_tag_is_exact(self):
+        """Test tag filtering does not match on substrings"""
+        response = self.client.get(reverse("blog:post-list") + "?tag=py")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    def test_tags_endpoint_excludes_unpublished(self):
+        """Test tags only used by drafts are not listed"""
+        response = self.client.get(reverse("blog:post-tags"))
+
+        self.assertNotIn("draft", response.data)
+        self.assertNotIn("wip", response.data)
 
     def test_search_posts(self):
         """Test searching posts"""
         response = self.client.get(reverse("blog:post-list") + "?search=Django")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data["results"]), 1)
+
+
+@override_settings(
+    APPEND_SLASH=False,
+    SECURE_SSL_REDIRECT=False,
+    API_PAGE_SIZE=2,
+    API_MAX_PAGE_SIZE=3,
+)
+class CursorPaginationTest(APITestCase):
+    """Test cursor pagination on project and post listings"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="memberpass123",
+            role=User.Role.MEMBER,
+        )
+        for i in range(5):
+            Post.objects.create(
+                author=self.member,
+                title=f"Post {i}",
+                content="Paginated content",
+                is_published=True,
+            )
+
+    def collect_titles(self, url):
+        """Follow next links and return every title in order"""
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles.extend(post["title"] for post in response.data["results"])
+            url = response.data["next"]
+        return titles
+
+    def test_first_page_has_no_count(self):
+        """Test list responses are cursor pages without a total count"""
+        response = self.client.get(reverse("blog:post-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertNotIn("count", response.data)
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_walk_all_pages_newest_first(self):
+        """Test following cursors visits every post exactly once"""
+        titles = self.collect_titles(reverse("blog:post-list"))
+
+        self.assertEqual(titles, [f"Post {i}" for i in reversed(range(5))])
+
+    def test_walk_pages_with_ordering_filter(self):
+        """Test cursors respect the ordering query parameter"""
+        titles = self.collect_titles(reverse("blog:post-list") + "?ordering=title")
+
+        self.assertEqual(titles, [f"Post {i}" for i in range(5)])
+
+    def test_walk_pages_ordered_by_unlisted_field(self):
+        """Test ordering by a field the list serializer leaves out still pages"""
+        for i in range(3):
+            Project.objects.create(
+                owner=self.member, title=f"Project {i}", description="Desc"
+            )
+        # Touch the oldest last so updated_at differs from created_at order
+        Post.objects.get(title="Post 0").save()
+
+        titles = self.collect_titles(
+            reverse("blog:post-list") + "?ordering=-updated_at"
+        )
+        self.assertEqual(titles, ["Post 0"] + [f"Post {i}" for i in (4, 3, 2, 1)])
+
+        titles = self.collect_titles(
+            reverse("blog:project-list") + "?ordering=updated_at"
+        )
+        self.assertEqual(titles, [f"Project {i}" for i in range(3)])
+
+    def test_page_size_is_capped(self):
+        """Test the page_size parameter cannot exceed the configured cap"""
+        response = self.client.get(reverse("blog:post-list") + "?page_size=50")
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_project_list_is_paginated(self):
+        """Test project listings use the same cursor pagination"""
+        for i in range(3):
+            Project.objects.create(
+                owner=self.member, title=f"Project {i}", description="Desc"
+            )
+
+        titles = self.collect_titles(reverse("blog:project-list"))
+
+        self.assertEqual(titles, [f"Project {i}" for i in reversed(range(3))])
 
 
 @override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
@@ -639,6 +849,69 @@ class BlogAPIViewsTest(APITestCase):
         self.assertEqual(len(response.data["projects"]), 1)
         self.assertEqual(len(response.data["posts"]), 1)
 
+    def test_search_content_ranks_title_matches_first(self):
+        """Test title matches outrank body-only matches"""
+        Post.objects.create(
+            author=self.member,
+            title="Caching notes",
+            content="Nothing relevant in here",
+            is_published=True,
+        )
+        Post.objects.create(
+            author=self.member,
+            title="Unrelated",
+            content="A long post that mentions caching once",
+            is_published=True,
+        )
+
+        response = self.client.get(reverse("blog:search-content") + "?q=cach")
+
+        titles = [post["title"] for post in response.data["posts"]]
+        self.assertEqual(titles, ["Caching notes", "Unrelated"])
+
+    def test_search_index_follows_writes(self):
+        """Test the index is updated on save and delete"""
+        url = reverse("blog:search-content") + "?q=searching"
+
+        self.post.is_published = False
+        self.post.save()
+        self.project.delete()
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["posts"], [])
+        self.assertEqual(response.data["projects"], [])
+
+        self.post.is_published = True
+        self.post.save()
+        response = self.client.get(url)
+
+        self.assertEqual(len(response.data["posts"]), 1)
+
+    def test_search_index_backfill_uses_migration_connection(self):
+        """Test the migration backfills through the database it migrates"""
+        migration = importlib.import_module("blog.migrations.0006_search_index")
+        search.get_search_backend().clear("post")
+        editor = SimpleNamespace(
+            connection=connection,
+            execute=lambda sql: connection.cursor().execute(sql),
+        )
+
+        with mock.patch(
+            "blog.search.get_search_backend", wraps=search.get_search_backend
+        ) as get_backend:
+            migration.create_search_index(apps, editor)
+
+        get_backend.assert_called_once_with(connection.alias)
+        response = self.client.get(reverse("blog:search-content") + "?q=searching")
+        self.assertEqual(len(response.data["posts"]), 1)
+
+    def test_search_content_ignores_query_syntax(self):
+        """Test full-text operators in the query are treated as text"""
+        response = self.client.get(reverse("blog:search-content") + '?q="test*(')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["posts"]), 1)
+
     def test_search_content_without_query(self):
         """Test searching content without a query"""
         response = self.client.get(reverse("blog:search-content"))
@@ -675,6 +948,45 @@ class BlogAPIViewsTest(APITestCase):
         self.assertIn("members", response.data["users"])
         self.assertIn("viewers", response.data["users"])
 
+    def test_admin_stats_single_query_per_table(self):
+        """Test admin stats use one aggregate query per table, then the cache"""
+        self.authenticate_user(self.admin)
+        cache.clear()
+
+        # 1 query to load the authenticated user + 3 aggregates
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("blog:admin-stats"))
+        self.assertEqual(response.data["users"]["admins"], 1)
+        self.assertEqual(response.data["posts"]["published"], 1)
+
+        # Both the stats and the authenticated user now come from the cache
+        with self.assertNumQueries(0):
+            self.client.get(reverse("blog:admin-stats"))
+
+    def test_stats_cache_invalidated_on_write(self):
+        """Test writes to posts are reflected in cached stats immediately"""
+        url = reverse("blog:dashboard-stats")
+        self.client.get(url)
+
+        Post.objects.create(
+            author=self.member, title="Another", content="Body", is_published=True
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["total_posts"], 2)
+
+    def test_stale_stats_served_while_refreshing(self):
+        """Test a stale entry is served while another request refreshes it"""
+        from . import stats
+
+        key = f"stats:{stats._version()}:dashboard"
+        cache.set(key, ({"total_posts": 99}, 0), timeout=60)
+        cache.add(f"{key}:lock", 1, timeout=60)
+
+        response = self.client.get(reverse("blog:dashboard-stats"))
+
+        self.assertEqual(response.data["total_posts"], 99)
+
     def test_admin_stats_as_member(self):
         """Test admin stats as member (should fail)"""
         self.authenticate_user(self.member)
@@ -689,6 +1001,121 @@ class BlogAPIViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(SECURE_SSL_REDIRECT=False)
+class AsyncReadViewsTest(APITestCase):
+    """Test the async read-only views answer exactly like the DRF ones"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.factory = AsyncRequestFactory()
+        member = User.objects.create_user(
+            username="member", email="member@example.com", password="pass12345"
+        )
+        for i in range(3):
+            Project.objects.create(
+                owner=member,
+                title=f"Search Project {i}",
+                description="A searchable project",
+                tech_stack="Python, Django",
+            )
+            Post.objects.create(
+                author=member,
+                title=f"Search Post {i}",
+                content="A searchable post",
+                tags="testing, api",
+                is_published=i != 0,
+            )
+
+    def assertSameResponse(self, view, name, query=""):
+        url = reverse(name) + query
+        expected = self.client.get(url)
+        self.assertEqual(expected.status_code, status.HTTP_200_OK)
+
+        response = async_to_sync(view)(self.factory.get(url))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), expected.json())
+        return response
+
+    def test_search_content(self):
+        self.assertSameResponse(
+            async_views.search_content, "blog:search-content", "?q=searchable"
+        )
+        self.assertSameResponse(async_views.search_content, "blog:search-content")
+
+    def test_dashboard_stats(self):
+        """Test the three counts are gathered into one cached result"""
+        cache.clear()
+        with self.assertNumQueries(3):
+            self.assertSameResponse(async_views.dashboard_stats, "blog:dashboard-stats")
+        with self.assertNumQueries(0):
+            self.assertSameResponse(async_views.dashboard_stats, "blog:dashboard-stats")
+
+    def test_featured(self):
+        self.assertSameResponse(async_views.featured_projects, "blog:project-featured")
+        self.assertSameResponse(async_views.featured_posts, "blog:post-featured")
+        self.assertSameResponse(
+            async_views.featured_posts, "blog:post-featured", "?tag=api"
+        )
+
+    def test_tags_and_technologies(self):
+        self.assertSameResponse(async_views.post_tags, "blog:post-tags")
+        self.assertSameResponse(
+            async_views.project_technologies, "blog:project-technologies"
+        )
+        self.assertSameResponse(
+            async_views.project_technologies,
+            "blog:project-technologies",
+            "?counts=true",
+        )
+
+    def test_read_only(self):
+        """Test async views reject writes"""
+        request = self.factory.post(reverse("blog:post-tags"))
+
+        response = async_to_sync(async_views.post_tags)(request)
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class QueryPlanTest(TestCase):
+    """Test hot list queries are planned on their indexes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        """Assert the database plans ``queryset`` using ``index_name``"""
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Tiny test tables would otherwise always be seq-scanned
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_published_posts_by_date(self):
+        queryset = Post.objects.filter(is_published=True).order_by("-created_at")
+        self.assertUsesIndex(queryset, "blog_post_published_created")
+
+    def test_posts_by_author_and_date(self):
+        queryset = Post.objects.filter(author=self.user).order_by("-created_at")
+        self.assertUsesIndex(queryset, "blog_post_author_created")
+
+    def test_projects_by_owner_and_date(self):
+        queryset = Project.objects.filter(owner=self.user).order_by("-created_at")
+        self.assertUsesIndex(queryset, "blog_project_owner_created")
+
+    def test_projects_by_date(self):
+        queryset = Project.objects.order_by("-created_at")
+        self.assertUsesIndex(queryset, "blog_project_created")
+
+    def test_title_ordering(self):
+        self.assertUsesIndex(Project.objects.order_by("title"), "blog_project_title")
+        self.assertUsesIndex(Post.objects.order_by("title"), "blog_post_title")
+
+
 class BlogSerializerTest(TestCase):
     """Test blog serializers"""
 
@@ -771,6 +1198,46 @@ class BlogSerializerTest(TestCase):
         self.assertEqual(len(excerpt), 203)  # 200 chars + "..."
         self.assertTrue(excerpt.endswith("..."))
 
+    def test_values_serializers_match_model_serializers(self):
+        """Test the values() fast path returns the same data as DRF"""
+        from rest_framework.test import APIRequestFactory
+
+        from .serializers import (
+            PostListSerializer,
+            PostListValuesSerializer,
+            ProjectListSerializer,
+            ProjectListValuesSerializer,
+        )
+
+        request = APIRequestFactory().get("/")
+        context = {"request": request}
+        Post.objects.create(
+            author=self.user, title="Post", content="Body", tags="a, b,"
+        )
+        Post.objects.update(
+            cover_image="posts/cover image.png",
+            cover_image_variants={
+                "source": "posts/cover image.png",
+                "width": 800,
+                "height": 600,
+                "webp": {"640": "posts/variants/cover image-640w.webp"},
+                "jpeg": {"640": "posts/variants/cover image-640w.jpg"},
+            },
+        )
+        Project.objects.create(
+            owner=self.user, title="Project", description="Desc", tech_stack=""
+        )
+
+        for serializer, fast_serializer, queryset in [
+            (PostListSerializer, PostListValuesSerializer, Post.objects.all()),
+            (ProjectListSerializer, ProjectListValuesSerializer, Project.objects.all()),
+        ]:
+            expected = serializer(queryset, many=True, context=context).data
+            actual = fast_serializer(
+                fast_serializer.values(queryset), many=True, context=context
+            ).data
+            self.assertEqual(actual, [dict(row) for row in expected])
+
     def test_post_list_serializer_short_excerpt(self):
         """Test PostListSerializer excerpt with short content"""
         from .serializers import PostListSerializer
@@ -788,3 +1255,351 @@ class BlogSerializerTest(TestCase):
 
         self.assertEqual(excerpt, short_content)
         self.assertFalse(excerpt.endswith("..."))
+
+
+class ImageVariantsTest(APITestCase):
+    """Test responsive image variants for uploaded images"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(
+            MEDIA_ROOT=media_root,
+            IMAGE_VARIANT_WIDTHS=[320, 640],
+            IMAGE_VARIANTS_ASYNC=False,
+            SECURE_SSL_REDIRECT=False,
+        )
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+
+    def make_image(self, width=1000, height=500, mode="RGBA", name="cover.png"):
+        buffer = BytesIO()
+        Image.new(mode, (width, height), (200, 100, 50, 128)[: len(mode)]).save(
+            buffer, format="PNG"
+        )
+        return SimpleUploadedFile(name, buffer.getvalue(), "image/png")
+
+    def create_post(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(
+                author=self.user, title="Post", content="Body", cover_image=image
+            )
+        post.refresh_from_db()
+        return post
+
+    def test_variants_generated_after_commit(self):
+        """Test WebP and JPEG copies are written with the original's size"""
+        post = self.create_post(self.make_image())
+
+        variants = post.cover_image_variants
+        self.assertEqual(variants["source"], post.cover_image.name)
+        self.assertEqual((variants["width"], variants["height"]), (1000, 500))
+        self.assertEqual(set(variants["webp"]), {"320", "640"})
+        with default_storage.open(variants["jpeg"]["320"]) as fh:
+            with Image.open(fh) as image:
+                self.assertEqual(image.size, (320, 160))
+                self.assertEqual(image.format, "JPEG")
+        with default_storage.open(variants["webp"]["640"]) as fh:
+            with Image.open(fh) as image:
+                self.assertEqual(image.format, "WEBP")
+
+    def test_small_images_are_not_upscaled(self):
+        """Test an image narrower than every width keeps its own width"""
+        post = self.create_post(self.make_image(200, 100, mode="RGB"))
+
+        self.assertEqual(list(post.cover_image_variants["webp"]), ["200"])
+
+    def test_replacing_image_replaces_variants(self):
+        """Test old variant files are deleted when the image changes"""
+        post = self.create_post(self.make_image())
+        old = post.cover_image_variants
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.cover_image = self.make_image(400, 400)
+            post.save()
+        post.refresh_from_db()
+
+        self.assertEqual(post.cover_image_variants["width"], 400)
+        self.assertFalse(default_storage.exists(old["webp"]["320"]))
+        self.assertTrue(
+            default_storage.exists(post.cover_image_variants["webp"]["320"])
+        )
+
+    def test_sources_sharing_a_stem_keep_their_own_variants(self):
+        """Test a.png and a.jpg, on one post or two, never share variant files"""
+        post = self.create_post(self.make_image())
+        with self.captureOnCommitCallbacks(execute=True):
+            post.cover_image = self.make_image(400, 400, name="cover.jpg")
+            post.save()
+        post.refresh_from_db()
+        other = self.create_post(self.make_image(600, 300, name="cover.gif"))
+
+        names = [
+            variants[key]["320"]
+            for variants in (post.cover_image_variants, other.cover_image_variants)
+            for key in ("webp", "jpeg")
+        ]
+        self.assertEqual(len(set(names)), 4)
+        with default_storage.open(post.cover_image_variants["webp"]["320"]) as fh:
+            with Image.open(fh) as image:
+                self.assertEqual(image.size, (320, 320))
+
+    def test_generation_waits_for_commit(self):
+        """Test nothing is resized inside the saving transaction"""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            post = Post.objects.create(
+                author=self.user,
+                title="Post",
+                content="Body",
+                cover_image=self.make_image(),
+            )
+        post.refresh_from_db()
+
+        self.assertIsNone(post.cover_image_variants)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_serializers_expose_srcset(self):
+        """Test list and detail responses include srcset strings"""
+        post = self.create_post(self.make_image())
+        post.is_published = True
+        post.save()
+
+        response = self.client.get(reverse("blog:post-detail", args=[post.pk]))
+        variants = response.data["cover_image_variants"]
+        self.assertEqual((variants["width"], variants["height"]), (1000, 500))
+        webp = variants["srcset"]["webp"].split(", ")
+        self.assertEqual(len(webp), 2)
+        self.assertTrue(webp[0].startswith("http://testserver/media/posts/variants/"))
+        self.assertTrue(webp[0].endswith(".webp 320w"))
+
+        response = self.client.get(reverse("blog:post-list"))
+        listed = response.data["results"][0]["cover_image_variants"]
+        self.assertEqual(listed, variants)
+
+    def test_backfill_command(self):
+        """Test backfill_image_variants fills existing uploads"""
+        post = self.create_post(self.make_image())
+        Post.objects.filter(pk=post.pk).update(cover_image_variants=None)
+        Project.objects.create(owner=self.user, title="No image", description="x")
+
+        out = StringIO()
+        call_command("backfill_image_variants", "--model", "blog.Post", stdout=out)
+
+        post.refresh_from_db()
+        self.assertEqual(post.cover_image_variants["width"], 1000)
+        self.assertIn("blog.Post: generated 1, failed 0", out.getvalue())
+
+
+@override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
+class BulkWriteTest(APITestCase):
+    """Test the bulk create/update/delete endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="memberpass123",
+            role=User.Role.MEMBER,
+        )
+        self.other = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="otherpass123",
+            role=User.Role.MEMBER,
+        )
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            role=User.Role.ADMIN,
+        )
+        self.viewer = User.objects.create_user(
+            username="viewer",
+            email="viewer@example.com",
+            password="viewerpass123",
+            role=User.Role.VIEWER,
+        )
+        self.posts = [
+            Post.objects.create(
+                author=self.member,
+                title=f"Post {i}",
+                content="Draft content",
+                tags="django",
+                is_published=False,
+            )
+            for i in range(3)
+        ]
+        self.foreign = Post.objects.create(
+            author=self.other, title="Not mine", content="x", is_published=True
+        )
+
+    def authenticate(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def bulk(self, name, payload):
+        return self.client.post(reverse(f"blog:{name}-bulk"), payload, format="json")
+
+    def test_mixed_post_operations(self):
+        """Test creates, updates, publishes and deletes are applied together"""
+        self.authenticate(self.member)
+        first, second, third = self.posts
+
+        response = self.bulk(
+            "post",
+            {
+                "create": [
+                    {"title": "New", "content": "word " * 100, "tags": "api, bulk"}
+                ],
+                "update": [
+                    {"id": first.pk, "content": "Rewritten body", "tags": "python"}
+                ],
+                "publish": [second.pk],
+                "delete": [third.pk],
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        created = response.data["create"][0]
+        self.assertEqual(created["status"], 201)
+        self.assertEqual(created["data"]["author"]["username"], "member")
+        self.assertEqual(response.data["update"][0]["status"], 200)
+        self.assertEqual(response.data["publish"][0]["data"]["is_published"], True)
+        self.assertEqual(response.data["delete"], [{"id": third.pk, "status": 204}])
+
+        new = Post.objects.get(pk=created["data"]["id"])
+        self.assertEqual(new.word_count, 100)
+        self.assertEqual(
+            set(new.tag_set.values_list("slug", flat=True)), {"api", "bulk"}
+        )
+        first.refresh_from_db()
+        self.assertEqual(first.excerpt, "Rewritten body")
+        self.assertEqual(list(first.tag_set.values_list("slug", flat=True)), ["python"])
+        self.assertGreater(first.updated_at, first.created_at)
+        self.assertTrue(Post.objects.get(pk=second.pk).is_published)
+        self.assertFalse(Post.objects.filter(pk=third.pk).exists())
+
+        # The search index follows the bulk writes
+        response = self.client.get(reverse("blog:search-content"), {"q": "rewritten"})
+        self.assertEqual(response.data["posts"], [])
+        response = self.client.get(reverse("blog:search-content"), {"q": "Post"})
+        self.assertEqual([post["id"] for post in response.data["posts"]], [second.pk])
+
+    def test_reports_failures_per_item(self):
+        """Test invalid, missing, foreign and repeated items fail on their own"""
+        self.authenticate(self.member)
+        first = self.posts[0]
+
+        response = self.bulk(
+            "post",
+            {
+                "create": [{"content": "No title"}],
+                "update": [
+                    {"id": first.pk, "title": "Renamed"},
+                    {"id": self.foreign.pk, "title": "Hijacked"},
+                    {"id": 999999, "title": "Missing"},
+                    {"title": "No id"},
+                    {"id": first.pk, "cover_image": None},
+                ],
+                "delete": [first.pk],
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["create"][0]["status"], 400)
+        self.assertIn("title", response.data["create"][0]["errors"])
+        self.assertEqual(
+            [item["status"] for item in response.data["update"]],
+            [200, 403, 404, 400, 400],
+        )
+        self.assertEqual(response.data["delete"][0]["status"], 400)
+        first.refresh_from_db()
+        self.assertEqual(first.title, "Renamed")
+        self.assertEqual(Post.objects.get(pk=self.foreign.pk).title, "Not mine")
+
+    def test_admin_can_change_any_object(self):
+        """Test admins pass the ownership check"""
+        self.authenticate(self.admin)
+        response = self.bulk("post", {"unpublish": [self.foreign.pk]})
+
+        self.assertEqual(response.data["unpublish"][0]["status"], 200)
+        self.assertFalse(Post.objects.get(pk=self.foreign.pk).is_published)
+
+    def test_viewer_cannot_create(self):
+        """Test creates are refused for users who cannot create content"""
+        self.authenticate(self.viewer)
+        response = self.bulk("post", {"create": [{"title": "T", "content": "C"}]})
+
+        self.assertEqual(response.data["create"][0]["status"], 403)
+        self.assertFalse(Post.objects.filter(title="T").exists())
+
+    def test_rejects_anonymous_and_malformed_requests(self):
+        """Test the request must be authenticated, non-empty and bounded"""
+        self.assertEqual(
+            self.bulk("post", {"delete": [1]}).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.authenticate(self.member)
+        self.assertEqual(self.bulk("post", {}).status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(BULK_MAX_ITEMS=2):
+            response = self.bulk("post", {"delete": [1, 2, 3]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_queries_do_not_grow_with_batch_size(self):
+        """Test updates are checked and written set-wise"""
+        self.client.force_authenticate(self.member)
+        more = [
+            Post.objects.create(author=self.member, title=f"Extra {i}", content="x")
+            for i in range(7)
+        ]
+
+        def count(posts):
+            payload = {
+                "update": [{"id": post.pk, "title": "Bulk"} for post in posts],
+                "publish": [],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk("post", payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        self.assertEqual(count(self.posts), count(self.posts + more))
+
+    def test_project_bulk_keeps_technology_counts(self):
+        """Test project bulk writes maintain the technology index and counts"""
+        self.authenticate(self.member)
+        response = self.bulk(
+            "project",
+            {
+                "create": [
+                    {"title": "A", "description": "x", "tech_stack": "Python, Go"},
+                    {"title": "B", "description": "x", "tech_stack": "python"},
+                ]
+            },
+        )
+        self.assertEqual(
+            [item["status"] for item in response.data["create"]], [201, 201]
+        )
+        counts = dict(Technology.objects.values_list("slug", "project_count"))
+        self.assertEqual(counts, {"python": 2, "go": 1})
+
+        project = Project.objects.get(title="B")
+        response = self.bulk(
+            "project",
+            {
+                "update": [{"id": project.pk, "tech_stack": "Go"}],
+                "delete": [Project.objects.get(title="A").pk],
+            },
+        )
+        self.assertEqual(response.data["delete"][0]["status"], 204)
+        counts = dict(Technology.objects.values_list("slug", "project_count"))
+        self.assertEqual(counts, {"python": 0, "go": 1})
@@ -1,8 +1,9 @@
 from rest_framework.routers import DefaultRouter  # type: ignore
 
+from django.conf import settings
 from django.urls import include, path
 
-from . import views
+from . import async_views, views
 
 # Create router and register viewsets
 router = DefaultRouter()
@@ -11,7 +12,21 @@ router.register(r"posts", views.PostViewSet, basename="post")
 
 app_name = "blog"
 
-urlpatterns = [
+# Async read-only endpoints take precedence over the router when enabled
+async_urlpatterns = [
+    path("projects/featured/", async_views.featured_projects, name="project-featured"),
+    path(
+        "projects/technologies/",
+        async_views.project_technologies,
+        name="project-technologies",
+    ),
+    path("posts/featured/", async_views.featured_posts, name="post-featured"),
+    path("posts/tags/", async_views.post_tags, name="post-tags"),
+    path("search/", async_views.search_content, name="search-content"),
+    path("stats/", async_views.dashboard_stats, name="dashboard-stats"),
+]
+
+urlpatterns = (async_urlpatterns if settings.ASYNC_READ_VIEWS else []) + [
     # ViewSet routes (automatically generates CRUD endpoints)
     path("", include(router.urls)),
     # Public API endpoints
@@ -19,4 +34,9 @@ urlpatterns = [
     path("stats/", views.dashboard_stats, name="dashboard-stats"),
     # Admin-only API endpoints
     path("admin/stats/", views.admin_stats, name="admin-stats"),
+    path(
+        "admin/export/<slug:dataset>.<slug:fmt>",
+        views.admin_export,
+        name="admin-export",
+    ),
 ]
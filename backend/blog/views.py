@@ -2,28 +2,36 @@ from django_filters.rest_framework import DjangoFilterBackend  # type: ignore
 from rest_framework import filters, status, viewsets  # type: ignore
 from rest_framework.decorators import api_view  # type: ignore
 from rest_framework.decorators import action, permission_classes
-from rest_framework.exceptions import PermissionDenied  # type: ignore
+from rest_framework.exceptions import NotFound, PermissionDenied  # type: ignore
 from rest_framework.parsers import JSONParser  # type: ignore
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated  # type: ignore
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response  # type: ignore
 
+from django.conf import settings
 from django.db.models import Q
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 
+from project import transfer
+from project.values_serializers import ValuesListMixin
 from users.permissions import CanCreateContent, IsAdminUser, IsOwnerOrAdmin
 
-from .models import Post, Project
+from . import search, stats
+from .bulk import BulkWriteMixin, PostBulkRequestSerializer
+from .models import Post, Project, Tag, Technology
+from .pagination import CreatedAtCursorPagination
 from .serializers import (
     PostListSerializer,
+    PostListValuesSerializer,
     PostSerializer,
     ProjectListSerializer,
+    ProjectListValuesSerializer,
     ProjectSerializer,
 )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(BulkWriteMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing projects with role-based access control
     """
@@ -39,6 +47,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "description", "tech_stack"]
     ordering_fields = ["created_at", "updated_at", "title"]
     ordering = ["-created_at"]
+    pagination_class = CreatedAtCursorPagination
+    owner_field = "owner"
+    image_fields = ("image",)
 
     def get_permissions(self):
         """
@@ -48,7 +59,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             permission_classes = [CanCreateContent]
         elif self.action in ["update", "partial_update", "destroy"]:
             permission_classes = [IsOwnerOrAdmin]
-        elif self.action == "my_projects":
+        elif self.action in ["my_projects", "bulk"]:
             permission_classes = [IsAuthenticated]
         else:
             permission_classes = [IsAuthenticatedOrReadOnly]
@@ -58,6 +69,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         """Use different serializers for list vs detail views"""
         if self.action == "list":
+            if settings.FAST_LIST_SERIALIZERS:
+                return ProjectListValuesSerializer
             return ProjectListSerializer
         return ProjectSerializer
 
@@ -65,10 +78,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """Filter projects based on query parameters and permissions"""
         queryset = Project.objects.select_related("owner").all()
 
-        # Filter by technology
+        # Filter by technology (exact, case-insensitive match on the index)
         tech = self.request.query_params.get("tech", None)
         if tech:
-            queryset = queryset.filter(tech_stack__icontains=tech)
+            queryset = queryset.filter(technologies__slug=tech.strip().lower())
 
         # Filter by owner for my_projects action
         if self.action == "my_projects":
@@ -95,6 +108,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You can only delete your own projects.")
         instance.delete()
 
+    def sync_bulk(self, instances, fields):
+        """Keep the technology index current for bulk writes"""
+        if fields is None or "tech_stack" in fields:
+            Project.sync_technologies_for(instances)
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def my_projects(self, request):
         """Get current user's projects"""
@@ -115,21 +133,19 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def technologies(self, request):
-        """Get all unique technologies used in projects"""
-        projects = Project.objects.exclude(tech_stack="").values_list(
-            "tech_stack", flat=True
-        )
-        technologies = set()
+        """
+        Get all unique technologies used in projects.
+        Pass ?counts=true to get project counts for faceting.
+        """
+        technologies = Technology.objects.filter(project_count__gt=0)
 
-        for tech_stack in projects:
-            if tech_stack:
-                techs = [tech.strip() for tech in tech_stack.split(",")]
-                technologies.update(techs)
+        if request.query_params.get("counts", "").lower() in ("1", "true", "yes"):
+            return Response(list(technologies.values("name", "project_count")))
 
-        return Response(sorted(list(technologies)))
+        return Response(list(technologies.values_list("name", flat=True)))
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(BulkWriteMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing blog posts with role-based access control
     """
@@ -145,6 +161,10 @@ class PostViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "content", "tags"]
     ordering_fields = ["created_at", "updated_at", "title"]
     ordering = ["-created_at"]
+    pagination_class = CreatedAtCursorPagination
+    bulk_request_serializer_class = PostBulkRequestSerializer
+    owner_field = "author"
+    image_fields = ("cover_image",)
 
     def get_permissions(self):
         """
@@ -154,7 +174,7 @@ class PostViewSet(viewsets.ModelViewSet):
             permission_classes = [CanCreateContent]
         elif self.action in ["update", "partial_update", "destroy", "toggle_publish"]:
             permission_classes = [IsOwnerOrAdmin]
-        elif self.action == "my_posts":
+        elif self.action in ["my_posts", "bulk"]:
             permission_classes = [IsAuthenticated]
         else:
             permission_classes = [IsAuthenticatedOrReadOnly]
@@ -164,6 +184,8 @@ class PostViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         """Use different serializers for list vs detail views"""
         if self.action == "list":
+            if settings.FAST_LIST_SERIALIZERS:
+                return PostListValuesSerializer
             return PostListSerializer
         return PostSerializer
 
@@ -179,10 +201,14 @@ class PostViewSet(viewsets.ModelViewSet):
             # Only show published posts for public viewing
             queryset = queryset.filter(is_published=True)
 
-        # Filter by tag
+        # List serializers use the stored excerpt, so skip the full body
+        if self.action in ["list", "featured"]:
+            queryset = queryset.defer("content")
+
+        # Filter by tag (exact, case-insensitive match on the tag index)
         tag = self.request.query_params.get("tag", None)
         if tag:
-            queryset = queryset.filter(tags__icontains=tag)
+            queryset = queryset.filter(tag_set__slug=tag.strip().lower())
 
         return queryset
 
@@ -205,10 +231,34 @@ class PostViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You can only delete your own posts.")
         instance.delete()
 
+    def bulk_changes(self, operations):
+        """Publish and unpublish are updates of is_published"""
+        yield from super().bulk_changes(operations)
+        for operation, published in (("publish", True), ("unpublish", False)):
+            for index, pk in enumerate(operations[operation]):
+                yield operation, index, pk, {"is_published": published}
+
+    def prepare_bulk(self, instance, fields):
+        """Keep the excerpt and word count in step with bulk content changes"""
+        if "content" in fields:
+            instance.refresh_summary()
+            return {"excerpt", "word_count"}
+        return set()
+
+    def sync_bulk(self, instances, fields):
+        """Keep the tag index current for bulk writes"""
+        if fields is None or "tags" in fields:
+            Post.sync_tags_for(instances)
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def my_posts(self, request):
         """Get current user's posts (including unpublished)"""
-        queryset = Post.objects.filter(author=request.user).order_by("-created_at")
+        queryset = (
+            Post.objects.filter(author=request.user)
+            .select_related("author")
+            .defer("content")
+            .order_by("-created_at")
+        )
         serializer = PostListSerializer(
             queryset, many=True, context={"request": request}
         )
@@ -226,19 +276,13 @@ class PostViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def tags(self, request):
         """Get all unique tags used in published posts"""
-        posts = (
-            Post.objects.filter(is_published=True)
-            .exclude(tags="")
-            .values_list("tags", flat=True)
+        tags = (
+            Tag.objects.filter(posts__is_published=True)
+            .distinct()
+            .values_list("name", flat=True)
         )
-        tags = set()
 
-        for tag_string in posts:
-            if tag_string:
-                post_tags = [tag.strip() for tag in tag_string.split(",")]
-                tags.update(post_tags)
-
-        return Response(sorted(list(tags)))
+        return Response(list(tags))
 
     @action(detail=True, methods=["post"], permission_classes=[IsOwnerOrAdmin])
     def toggle_publish(self, request, pk=None):
@@ -257,40 +301,73 @@ class PostViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAdminUser])
 def admin_stats(request):
     """Get detailed admin statistics"""
-    from django.contrib.auth import get_user_model
+    since = request.user.date_joined
+
+    def build():
+        return {
+            "users": stats.user_counts(),
+            "projects": stats.project_counts(since=since),
+            "posts": stats.post_counts(),
+        }
+
+    return Response(stats.get_cached(f"admin:{since.isoformat()}", build))
 
-    User = get_user_model()
 
-    stats = {
-        "users": {
-            "total": User.objects.count(),
-            "admins": User.objects.filter(role=User.Role.ADMIN).count(),
-            "members": User.objects.filter(role=User.Role.MEMBER).count(),
-            "viewers": User.objects.filter(role=User.Role.VIEWER).count(),
-            "active": User.objects.filter(is_active=True).count(),
-            "inactive": User.objects.filter(is_active=False).count(),
-        },
-        "projects": {
-            "total": Project.objects.count(),
-            "recent": Project.objects.filter(
-                created_at__gte=request.user.date_joined
-            ).count(),
-        },
-        "posts": {
-            "total": Post.objects.count(),
-            "published": Post.objects.filter(is_published=True).count(),
-            "unpublished": Post.objects.filter(is_published=False).count(),
-        },
-    }
-
-    return Response(stats)
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def admin_export(request, dataset, fmt):
+    """Stream every user, project or post as NDJSON or CSV"""
+    if dataset not in transfer.DATASETS or fmt not in transfer.FORMATS:
+        raise NotFound()
+    # Password hashes are only exported by the export_data command
+    response = StreamingHttpResponse(
+        transfer.export(dataset, fmt), content_type=EXPORT_CONTENT_TYPES[fmt]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{fmt}"'
+    return response
+
+
+def search_projects(query, limit=5):
+    """Projects matching ``query``, best matches first"""
+    queryset = Project.objects.select_related("owner")
+    projects = search.search(queryset, "project", query, limit=limit)
+
+    # No full-text backend for this database: fall back to substring matching
+    if projects is None:
+        projects = queryset.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(tech_stack__icontains=query)
+        )[:limit]
+    return projects
+
+
+def search_posts(query, limit=5):
+    """Published posts matching ``query``, best matches first"""
+    queryset = Post.objects.select_related("author").defer("content")
+    posts = search.search(queryset, "post", query, limit=limit, published_only=True)
+
+    if posts is None:
+        posts = queryset.filter(
+            Q(title__icontains=query)
+            | Q(content__icontains=query)
+            | Q(tags__icontains=query),
+            is_published=True,
+        )[:limit]
+    return posts
 
 
 # Public API views (no authentication required)
 @api_view(["GET"])
 @permission_classes([])
 def search_content(request):
-    """Global search across projects and posts"""
+    """Global search across projects and posts, best matches first"""
     query = request.GET.get("q", "")
 
     if not query:
@@ -298,20 +375,8 @@ def search_content(request):
             {"projects": [], "posts": [], "message": "No search query provided"}
         )
 
-    # Search projects
-    projects = Project.objects.filter(
-        Q(title__icontains=query)
-        | Q(description__icontains=query)
-        | Q(tech_stack__icontains=query)
-    ).select_related("owner")[:5]
-
-    # Search published posts
-    posts = Post.objects.filter(
-        Q(title__icontains=query)
-        | Q(content__icontains=query)
-        | Q(tags__icontains=query),
-        is_published=True,
-    ).select_related("author")[:5]
+    projects = search_projects(query)
+    posts = search_posts(query)
 
     return Response(
         {
@@ -334,13 +399,14 @@ def dashboard_stats(request):
 
     User = get_user_model()
 
-    stats = {
-        "total_users": User.objects.filter(is_active=True).count(),
-        "total_projects": Project.objects.count(),
-        "total_posts": Post.objects.filter(is_published=True).count(),
-    }
+    def build():
+        return {
+            "total_users": User.objects.filter(is_active=True).count(),
+            "total_projects": Project.objects.count(),
+            "total_posts": Post.objects.filter(is_published=True).count(),
+        }
 
-    return Response(stats)
+    return Response(stats.get_cached("dashboard", build))
 
 
 def health_check(request):
@@ -0,0 +1,52 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+from project.tracing import init_sentry
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Jobs run at the same time, each on its own thread",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when no job is due",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            help="Exit after running this many jobs",
+        )
+
+    def handle(self, *args, **options):
+        # Report failed jobs; manage.py commands otherwise run without Sentry
+        init_sentry()
+        worker = Worker(
+            concurrency=options["concurrency"],
+            poll_interval=options["poll_interval"],
+        )
+        if not options["burst"]:
+            signal.signal(signal.SIGTERM, worker.stop)
+            signal.signal(signal.SIGINT, worker.stop)
+            self.stdout.write(
+                f"Worker {worker.worker_id} started "
+                f"(concurrency {worker.concurrency})"
+            )
+
+        processed = worker.run(burst=options["burst"], max_jobs=options["max_jobs"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)"))
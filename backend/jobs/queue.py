@@ -0,0 +1,244 @@
+"""
+Database-backed job queue.
+
+Job functions are registered with ``@task`` in an app's ``tasks.py`` and
+queued with ``fn.enqueue(**payload)``; ``manage.py run_worker`` claims and
+runs them. A claim takes a lease (``JOBS_LEASE_SECONDS``) so jobs of a
+crashed worker are picked up again once it expires.
+
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database
+supports it (PostgreSQL), so concurrent workers never wait on each other.
+SQLite has no row locks; there each candidate is claimed with a conditional
+``UPDATE`` that only matches while the job is still claimable, and SQLite's
+single writer guarantees only one worker's update wins. A connection that
+finds the table locked by another is refused rather than made to wait when
+the database uses a shared cache (as the test runner's in-memory one
+does), so writes are retried briefly, and a claim still locked out claims
+nothing this time.
+
+Failed jobs are retried with exponential backoff until ``max_attempts``; a
+job whose lease expires after its last attempt (its worker crashed while
+running it) fails instead of being claimed again.
+
+Without ``JOBS_EXTERNAL_WORKER`` no ``run_worker`` service is expected:
+each web process runs jobs on a background thread instead
+(``worker.EmbeddedWorker``), woken once the transaction that queued a job
+commits.
+"""
+
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from project import metrics
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = {}
+
+# Tries of a write SQLite refuses with "database table is locked" (~0.6 s)
+LOCK_RETRIES = 8
+
+
+def task(name, max_attempts=None):
+    """Register a job function under ``name`` and give it ``.enqueue()``"""
+
+    def decorator(func):
+        if name in REGISTRY:
+            raise ValueError(f"Job {name!r} is already registered")
+        REGISTRY[name] = func
+
+        def enqueue_job(run_at=None, **payload):
+            return enqueue(name, payload, run_at=run_at, max_attempts=max_attempts)
+
+        func.job_name = name
+        func.enqueue = enqueue_job
+        return func
+
+    return decorator
+
+
+def enqueue(name, payload=None, run_at=None, max_attempts=None):
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown job {name!r}")
+    job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or getattr(settings, "JOBS_MAX_ATTEMPTS", 5),
+    )
+    if not getattr(settings, "JOBS_EXTERNAL_WORKER", False) and run_at is None:
+        transaction.on_commit(_wake_embedded)
+    return job
+
+
+def _wake_embedded():
+    from .worker import embedded_worker
+
+    embedded_worker().wake()
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number ``attempts``"""
+    base = getattr(settings, "JOBS_RETRY_BACKOFF", 5)
+    cap = getattr(settings, "JOBS_RETRY_BACKOFF_MAX", 3600)
+    return min(base * 2 ** max(attempts - 1, 0), cap)
+
+
+def _claimable(now):
+    return Q(status=Job.Status.QUEUED, run_at__lte=now) | Q(
+        status=Job.Status.RUNNING,
+        locked_until__lt=now,
+        attempts__lt=F("max_attempts"),
+    )
+
+
+def _retry_locked(query, attempts=LOCK_RETRIES):
+    """Run ``query``, retrying while SQLite reports the table locked"""
+    for attempt in range(attempts):
+        try:
+            return query()
+        except OperationalError as error:
+            locked = connection.vendor == "sqlite" and "locked" in str(error)
+            if not locked or attempt == attempts - 1:
+                raise
+            time.sleep(0.005 * 2**attempt)
+
+
+def _lease(worker_id, now):
+    lease = timedelta(seconds=getattr(settings, "JOBS_LEASE_SECONDS", 300))
+    return {
+        "status": Job.Status.RUNNING,
+        "locked_by": worker_id,
+        "locked_until": now + lease,
+        "started_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+
+def fail_abandoned(now=None):
+    """Fail jobs whose last attempt's lease expired without an outcome"""
+    now = now or timezone.now()
+    abandoned = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_until__lt=now,
+        attempts__gte=F("max_attempts"),
+    )
+    failed = _retry_locked(
+        lambda: abandoned.update(
+            status=Job.Status.FAILED,
+            finished_at=now,
+            locked_by="",
+            locked_until=None,
+            last_error="Lease expired on the last attempt; the worker stopped mid-run",
+        )
+    )
+    if failed:
+        logger.error("%s job(s) failed permanently after their worker stopped", failed)
+    return failed
+
+
+def claim(worker_id, limit=1):
+    """Lease up to ``limit`` due jobs to ``worker_id`` and return them"""
+    now = timezone.now()
+    fail_abandoned(now)
+    leased = _lease(worker_id, now)
+    due = Job.objects.filter(_claimable(now)).order_by("run_at", "id")
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                due.select_for_update(skip_locked=True).values_list("id", flat=True)[
+                    :limit
+                ]
+            )
+            Job.objects.filter(pk__in=ids).update(**leased)
+    else:
+        ids = _claim_each(due, now, leased, limit)
+
+    return _retry_locked(
+        lambda: list(Job.objects.filter(pk__in=ids, locked_by=worker_id))
+    )
+
+
+def _claim_each(due, now, leased, limit):
+    """Claim candidates one conditional ``UPDATE`` at a time (SQLite)"""
+    ids = []
+    try:
+        for pk in _retry_locked(lambda: list(due.values_list("id", flat=True)[:limit])):
+            claimable = Job.objects.filter(_claimable(now), pk=pk)
+            if _retry_locked(lambda: claimable.update(**leased)):
+                ids.append(pk)
+    except OperationalError:
+        # Still locked out; whatever is left is claimed on the next poll
+        logger.warning("Job table locked, claimed %s job(s) this time", len(ids))
+    return ids
+
+
+def run(job):
+    """Run a claimed job and record its outcome; returns the new status"""
+    func = REGISTRY.get(job.name)
+    waited = (job.started_at - job.run_at).total_seconds()
+    start = time.perf_counter()
+    try:
+        if func is None:
+            raise LookupError(f"Unknown job {job.name!r}")
+        func(**job.payload)
+    except Exception:
+        outcome = _fail(job, traceback.format_exc())
+    else:
+        outcome = _finish(job)
+    duration = time.perf_counter() - start
+
+    metrics.record_job(job.name, outcome, max(waited, 0.0), duration)
+    return outcome
+
+
+def _finish(job):
+    _retry_locked(
+        lambda: Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            status=Job.Status.DONE,
+            finished_at=timezone.now(),
+            locked_until=None,
+            last_error="",
+        )
+    )
+    return Job.Status.DONE
+
+
+def _fail(job, error):
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        status, changes = Job.Status.FAILED, {"finished_at": now}
+        logger.error("Job %s #%s failed permanently:\n%s", job.name, job.pk, error)
+    else:
+        status = Job.Status.QUEUED
+        changes = {"run_at": now + timedelta(seconds=backoff(job.attempts))}
+        logger.warning("Job %s #%s failed, will retry:\n%s", job.name, job.pk, error)
+
+    _retry_locked(
+        lambda: Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            status=status,
+            locked_by="",
+            locked_until=None,
+            last_error=error,
+            **changes,
+        )
+    )
+    return status
+
+
+def prune(older_than):
+    """Delete finished jobs older than ``older_than`` (a timedelta)"""
+    deleted, _ = Job.objects.filter(
+        status=Job.Status.DONE, finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
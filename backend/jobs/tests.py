@@ -0,0 +1,279 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+from .worker import Worker, stop_embedded
+
+calls = []
+
+
+@queue.task("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@queue.task("tests.explode", max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+@override_settings(
+    JOBS_EXTERNAL_WORKER=True, JOBS_RETRY_BACKOFF=10, JOBS_LEASE_SECONDS=60
+)
+class JobQueueTest(TestCase):
+    """Test enqueueing, claiming and running jobs"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Test a queued job runs once and is marked done"""
+        job = record.enqueue(value=1)
+
+        claimed = queue.claim("worker-1")
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual(queue.run(claimed[0]), Job.Status.DONE)
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [1])
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_unknown_job_is_rejected(self):
+        """Test enqueueing an unregistered name fails immediately"""
+        with self.assertRaises(ValueError):
+            queue.enqueue("tests.missing")
+
+    def test_claim_is_exclusive(self):
+        """Test a job leased to one worker is not handed to another"""
+        record.enqueue(value=1)
+
+        self.assertEqual(len(queue.claim("worker-1")), 1)
+        self.assertEqual(queue.claim("worker-2"), [])
+
+    def test_future_jobs_wait(self):
+        """Test jobs are not claimed before run_at"""
+        record.enqueue(run_at=timezone.now() + timedelta(minutes=5), value=1)
+
+        self.assertEqual(queue.claim("worker-1"), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test jobs of a crashed worker are picked up after the lease"""
+        job = record.enqueue(value=1)
+        queue.claim("crashed")
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        claimed = queue.claim("worker-2")
+
+        self.assertEqual([j.locked_by for j in claimed], ["worker-2"])
+        self.assertEqual(claimed[0].attempts, 2)
+
+    def test_abandoned_last_attempt_fails(self):
+        """Test a job whose worker died on its last attempt is not rerun"""
+        job = explode.enqueue()
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING,
+            attempts=2,
+            locked_by="crashed",
+            locked_until=timezone.now() - timedelta(seconds=1),
+        )
+
+        with self.assertLogs("jobs.queue", level="ERROR"):
+            self.assertEqual(queue.claim("worker-2"), [])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.locked_by, "")
+        self.assertIsNotNone(job.finished_at)
+
+    def locked_claims(self, times):
+        """Make the next ``times`` claim updates fail as a locked SQLite table"""
+        update = QuerySet.update
+        failures = iter(range(times))
+
+        def locked_update(queryset, **kwargs):
+            if (
+                kwargs.get("status") == Job.Status.RUNNING
+                and next(failures, None) is not None
+            ):
+                raise OperationalError("database table is locked: jobs_job")
+            return update(queryset, **kwargs)
+
+        return mock.patch.object(QuerySet, "update", locked_update)
+
+    @mock.patch("jobs.queue.time.sleep")
+    def test_locked_claim_is_retried(self, sleep):
+        """Test a claim SQLite refuses as locked is retried"""
+        job = record.enqueue(value=1)
+
+        with self.locked_claims(2):
+            claimed = queue.claim("worker-1")
+
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch("jobs.queue.time.sleep")
+    def test_claim_locked_out_claims_nothing(self, sleep):
+        """Test a claim still locked after the retries leaves the job queued"""
+        job = record.enqueue(value=1)
+
+        with self.locked_claims(queue.LOCK_RETRIES):
+            with self.assertLogs("jobs.queue", level="WARNING"):
+                self.assertEqual(queue.claim("worker-1"), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.attempts, 0)
+
+        self.assertEqual([j.pk for j in queue.claim("worker-2")], [job.pk])
+
+    def test_failure_retries_with_backoff(self):
+        """Test a failing job is requeued later, then given up on"""
+        job = explode.enqueue()
+
+        before = timezone.now()
+        with self.assertLogs("jobs.queue", level="WARNING"):
+            self.assertEqual(queue.run(queue.claim("w")[0]), Job.Status.QUEUED)
+        job.refresh_from_db()
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=10))
+        self.assertEqual(job.locked_by, "")
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs("jobs.queue", level="ERROR"):
+            self.assertEqual(queue.run(queue.claim("w")[0]), Job.Status.FAILED)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_backoff_is_exponential_and_capped(self):
+        """Test retry delays double up to JOBS_RETRY_BACKOFF_MAX"""
+        with override_settings(JOBS_RETRY_BACKOFF=5, JOBS_RETRY_BACKOFF_MAX=30):
+            self.assertEqual(
+                [queue.backoff(n) for n in range(1, 6)], [5, 10, 20, 30, 30]
+            )
+
+    def test_records_metrics(self):
+        """Test queue latency, duration and outcome are recorded"""
+        record.enqueue(value=1)
+
+        with mock.patch("project.metrics.record_job") as record_job:
+            queue.run(queue.claim("w")[0])
+
+        name, status, waited, duration = record_job.call_args.args
+        self.assertEqual((name, status), ("tests.record", Job.Status.DONE))
+        self.assertGreaterEqual(waited, 0)
+        self.assertGreaterEqual(duration, 0)
+
+    def test_prune_removes_old_finished_jobs(self):
+        """Test prune only deletes done jobs past the retention window"""
+        old = record.enqueue(value=1)
+        Job.objects.filter(pk=old.pk).update(
+            status=Job.Status.DONE, finished_at=timezone.now() - timedelta(days=8)
+        )
+        pending = record.enqueue(value=2)
+
+        self.assertEqual(queue.prune(timedelta(days=7)), 1)
+        self.assertEqual(list(Job.objects.values_list("pk", flat=True)), [pending.pk])
+
+    def test_run_worker_burst(self):
+        """Test run_worker --burst drains due jobs and exits"""
+        for value in range(3):
+            record.enqueue(value=value)
+
+        out = StringIO()
+        call_command("run_worker", "--burst", stdout=out)
+
+        self.assertEqual(sorted(calls), [0, 1, 2])
+        self.assertIn("Processed 3 job(s)", out.getvalue())
+
+    def test_run_worker_max_jobs(self):
+        """Test --max-jobs stops the worker early"""
+        for value in range(3):
+            record.enqueue(value=value)
+
+        call_command("run_worker", "--burst", "--max-jobs", "2", stdout=StringIO())
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(Job.objects.filter(status=Job.Status.QUEUED).count(), 1)
+
+
+@override_settings(JOBS_EXTERNAL_WORKER=True)
+class ConcurrentWorkerTest(TransactionTestCase):
+    """Test a multi-threaded worker runs every job exactly once"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_concurrency(self):
+        for value in range(10):
+            record.enqueue(value=value)
+
+        # A burst ends early if every claim is locked out while nothing runs
+        worker = Worker(concurrency=3, poll_interval=0.01)
+        for _ in range(10):
+            if not Job.objects.exclude(status=Job.Status.DONE).exists():
+                break
+            worker.run(burst=True)
+
+        self.assertEqual(worker.processed, 10)
+        self.assertEqual(sorted(calls), list(range(10)))
+        self.assertEqual(Job.objects.filter(status=Job.Status.DONE).count(), 10)
+
+
+@override_settings(
+    JOBS_EXTERNAL_WORKER=False,
+    JOBS_EMBEDDED_POLL_INTERVAL=0.01,
+    JOBS_RETRY_BACKOFF=0.01,
+)
+class EmbeddedWorkerTest(TransactionTestCase):
+    """Test jobs run, retry and are pruned without a run_worker service"""
+
+    def setUp(self):
+        calls.clear()
+        self.addCleanup(stop_embedded)
+
+    def wait_for(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Timed out waiting for the embedded worker")
+            time.sleep(0.01)
+
+    def test_runs_retries_and_prunes(self):
+        """Test a web process's thread runs queued jobs and their retries"""
+        old = Job.objects.create(
+            name="tests.record",
+            status=Job.Status.DONE,
+            finished_at=timezone.now() - timedelta(days=8),
+        )
+
+        with self.assertLogs("jobs.queue", level="WARNING"):
+            job = record.enqueue(value=1)
+            failing = explode.enqueue()
+            self.wait_for(
+                lambda: Job.objects.filter(
+                    status__in=[Job.Status.DONE, Job.Status.FAILED]
+                ).count()
+                == 2
+            )
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [1])
+        self.assertTrue(job.locked_by.startswith("embedded:"))
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, Job.Status.FAILED)
+        self.assertEqual(failing.attempts, 2)
+        self.assertFalse(Job.objects.filter(pk=old.pk).exists())
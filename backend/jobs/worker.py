@@ -0,0 +1,168 @@
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from . import queue
+
+logger = logging.getLogger(__name__)
+
+_embedded = None
+_embedded_lock = threading.Lock()
+
+
+class Worker:
+    """
+    Poll for due jobs and run up to ``concurrency`` of them at a time, each
+    on its own thread (and so its own database connection).
+    """
+
+    def __init__(self, concurrency=1, poll_interval=1.0, worker_id=None):
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.pruned_at = 0.0
+
+    def stop(self, *args):
+        """Finish running jobs, then exit; usable as a signal handler"""
+        self.stopping.set()
+
+    def run(self, burst=False, max_jobs=None):
+        """
+        Process jobs until stopped. With ``burst`` return as soon as nothing
+        is due; ``max_jobs`` caps the number of jobs run.
+        """
+        if self.concurrency == 1:
+            return self._run_inline(burst, max_jobs)
+
+        with ThreadPoolExecutor(
+            self.concurrency, thread_name_prefix="job-worker"
+        ) as pool:
+            running = set()
+            while not self.stopping.is_set() and not self._at_limit(max_jobs):
+                self._maybe_prune()
+                running = {future for future in running if not future.done()}
+                free = self.concurrency - len(running)
+                if max_jobs is not None:
+                    free = min(free, max_jobs - self.processed)
+                jobs = queue.claim(self.worker_id, free) if free > 0 else []
+                for job in jobs:
+                    self.processed += 1
+                    running.add(pool.submit(self._execute, job))
+
+                if jobs:
+                    continue
+                if running:
+                    wait(running, self.poll_interval, return_when=FIRST_COMPLETED)
+                elif burst:
+                    break
+                else:
+                    self.stopping.wait(self.poll_interval)
+            wait(running)
+        return self.processed
+
+    def _run_inline(self, burst, max_jobs):
+        while not self.stopping.is_set() and not self._at_limit(max_jobs):
+            self._maybe_prune()
+            jobs = queue.claim(self.worker_id, 1)
+            if not jobs:
+                if burst:
+                    break
+                self.stopping.wait(self.poll_interval)
+                continue
+            self.processed += 1
+            queue.run(jobs[0])
+        return self.processed
+
+    def _at_limit(self, max_jobs):
+        return max_jobs is not None and self.processed >= max_jobs
+
+    def _execute(self, job):
+        close_old_connections()
+        try:
+            queue.run(job)
+        except Exception:
+            logger.exception("Worker failed to record job %s #%s", job.name, job.pk)
+        finally:
+            close_old_connections()
+
+    def _maybe_prune(self):
+        days = getattr(settings, "JOBS_RETENTION_DAYS", 7)
+        if days <= 0 or time.monotonic() - self.pruned_at < 3600:
+            return
+        self.pruned_at = time.monotonic()
+        queue.prune(timedelta(days=days))
+
+
+class EmbeddedWorker:
+    """
+    Run jobs on a daemon thread of a web process, for deployments without a
+    ``run_worker`` service (``JOBS_EXTERNAL_WORKER`` off). The thread drains
+    due jobs when one is queued and every ``JOBS_EMBEDDED_POLL_INTERVAL``
+    seconds, which also picks up retries and prunes finished jobs.
+    """
+
+    def __init__(self, poll_interval):
+        self.pid = os.getpid()
+        self.worker = Worker(
+            poll_interval=poll_interval,
+            worker_id=f"embedded:{socket.gethostname()}:{self.pid}",
+        )
+        self.wakeup = threading.Event()
+        self.thread = threading.Thread(
+            target=self._loop, name="job-worker-embedded", daemon=True
+        )
+        self.thread.start()
+
+    def wake(self):
+        self.wakeup.set()
+
+    def stop(self, timeout=None):
+        self.worker.stop()
+        self.wakeup.set()
+        self.thread.join(timeout)
+
+    def _loop(self):
+        while not self.worker.stopping.is_set():
+            self.wakeup.wait(self.worker.poll_interval)
+            self.wakeup.clear()
+            try:
+                self.worker.run(burst=True)
+            except Exception:
+                logger.exception("Embedded job worker failed")
+            finally:
+                # Nothing may be due for a while; don't hold a connection
+                connection.close()
+
+
+def embedded_worker():
+    """This process's embedded worker, started on first use"""
+    global _embedded
+    with _embedded_lock:
+        # A forked server worker inherits the object but not the thread
+        if _embedded is None or _embedded.pid != os.getpid():
+            poll_interval = getattr(settings, "JOBS_EMBEDDED_POLL_INTERVAL", 5.0)
+            _embedded = EmbeddedWorker(poll_interval)
+        return _embedded
+
+
+def start_embedded():
+    """Start the embedded worker unless a ``run_worker`` service runs jobs"""
+    if not getattr(settings, "JOBS_EXTERNAL_WORKER", False):
+        embedded_worker()
+
+
+def stop_embedded():
+    global _embedded
+    with _embedded_lock:
+        if _embedded is not None:
+            _embedded.stop()
+            _embedded = None
@@ -0,0 +1,32 @@
+"""
+Helpers for the async read-only views in ``blog.async_views`` and
+``users.async_views``.
+
+These views are routed in place of their DRF counterparts when
+``ASYNC_READ_VIEWS`` is set, which only pays off when serving through
+``project.asgi``; under WSGI Django runs each async view in its own event
+loop. They answer public ``GET`` requests only, so they skip DRF's
+request/response wrappers and return the same JSON through ``JsonResponse``.
+
+Django runs async ORM calls of one request on a single thread, so
+``asyncio.gather`` does not make a request's queries hit the database in
+parallel. It does let the event loop serve other requests while they run,
+which is where the ASGI throughput gain comes from (see
+``benchmarks/wsgi_vs_asgi.py``).
+"""
+
+from django.http import JsonResponse
+
+
+async def alist(queryset):
+    """Evaluate ``queryset`` with the async ORM"""
+    return [row async for row in queryset]
+
+
+def json_response(data):
+    # Same separators and encoding as DRF's JSONRenderer
+    return JsonResponse(
+        data,
+        safe=False,
+        json_dumps_params={"ensure_ascii": False, "separators": (",", ":")},
+    )
@@ -0,0 +1,284 @@
+"""
+Micro-benchmarks of the API's hot paths, run by ``manage.py bench``.
+
+Each benchmark is a function registered with ``@benchmark`` that takes a
+``Fixture`` for the current dataset size and returns the callable to time.
+``run`` seeds a fresh dataset of each size with ``project.seed`` (``size``
+posts, half as many projects and a tenth as many users) and times every
+benchmark against it, reporting the best per-call time over ``repeat``
+rounds; rounds are calibrated to take at least ``min_time`` seconds.
+
+``isolated`` sets up what the benchmarks run against: a throwaway test
+database, which any read replica aliases mirror as under the test runner,
+and a private in-memory cache, so neither real data nor a shared cache is
+read, flushed or cleared.
+
+``compare`` checks the results against a baseline saved from an earlier
+run on the same machine, and flags every benchmark that got slower by more
+than the threshold (``BENCH_REGRESSION_THRESHOLD`` percent by default).
+Baselines only compare like with like: keep one per machine and save a new
+one after intentional changes.
+"""
+
+import json
+import platform
+import statistics
+import time
+import timeit
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import override_settings
+
+from blog import search
+from blog.models import Post, Project
+from blog.serializers import PostListSerializer, ProjectListSerializer
+from blog.views import PostViewSet, ProjectViewSet, search_content
+from project.db.replicas import use_primary
+from users import permissions
+from users.serializers import UserProfileSerializer
+
+from . import seed
+
+BENCHMARKS = {}
+
+PRIVATE_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bench",
+    }
+}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+class Fixture:
+    """The dataset size, and requests to run benchmarks with"""
+
+    def __init__(self, size):
+        self.size = size
+        self.factory = APIRequestFactory()
+        self.context = {"request": self.factory.get("/", HTTP_HOST="localhost")}
+
+    def request(self, method, user):
+        request = Request(getattr(self.factory, method)("/", HTTP_HOST="localhost"))
+        request.user = user
+        return request
+
+
+@benchmark("serializers.post_list")
+def post_list(fixture):
+    posts = list(Post.objects.select_related("author").defer("content"))
+    return lambda: PostListSerializer(posts, many=True, context=fixture.context).data
+
+
+@benchmark("serializers.project_list")
+def project_list(fixture):
+    projects = list(Project.objects.select_related("owner"))
+    return lambda: ProjectListSerializer(
+        projects, many=True, context=fixture.context
+    ).data
+
+
+@benchmark("serializers.user_profile")
+def user_profile(fixture):
+    users = list(get_user_model().objects.all())
+    return lambda: UserProfileSerializer(users, many=True, context=fixture.context).data
+
+
+def _view(view, request):
+    def call():
+        response = view(request)
+        response.render()
+        return response
+
+    return call
+
+
+@benchmark("views.tags")
+def tags(fixture):
+    view = PostViewSet.as_view({"get": "tags"})
+    return _view(view, fixture.factory.get("/", HTTP_HOST="localhost"))
+
+
+@benchmark("views.technologies")
+def technologies(fixture):
+    view = ProjectViewSet.as_view({"get": "technologies"})
+    return _view(view, fixture.factory.get("/?counts=true", HTTP_HOST="localhost"))
+
+
+@benchmark("views.search_content")
+def search_view(fixture):
+    request = fixture.factory.get("/", {"q": "performance"}, HTTP_HOST="localhost")
+    return _view(search_content, request)
+
+
+@benchmark("permissions.has_permission")
+def has_permission(fixture):
+    """Every view-level permission, for every user, reading and writing"""
+    checks = [
+        permission()
+        for permission in (
+            permissions.IsAdminOrReadOnly,
+            permissions.IsOwnerOrAdmin,
+            permissions.IsOwnerOrReadOnly,
+            permissions.CanCreateContent,
+            permissions.CanModerateContent,
+            permissions.IsAdminUser,
+        )
+    ]
+    requests = [
+        fixture.request(method, user)
+        for user in get_user_model().objects.all()
+        for method in ("get", "post")
+    ]
+
+    def call():
+        for request in requests:
+            for check in checks:
+                check.has_permission(request, None)
+
+    return call
+
+
+@benchmark("permissions.has_object_permission")
+def has_object_permission(fixture):
+    """Owner checks of an editing member and an admin on every post"""
+    User = get_user_model()
+    users = [
+        User.objects.filter(role=role).first()
+        for role in (User.Role.MEMBER, User.Role.ADMIN)
+    ]
+    requests = [fixture.request("patch", user) for user in users if user]
+    posts = list(Post.objects.select_related("author").defer("content"))
+    checks = [permissions.IsOwnerOrAdmin(), permissions.IsOwnerOrReadOnly()]
+
+    def call():
+        for request in requests:
+            for post in posts:
+                for check in checks:
+                    check.has_object_permission(request, None, post)
+
+    return call
+
+
+@contextmanager
+def private_cache():
+    """Swap every use of the default cache for a private in-memory one"""
+    with override_settings(CACHES=PRIVATE_CACHES):
+        yield
+
+
+@contextmanager
+def isolated():
+    """Benchmark against a throwaway database and a private cache"""
+    primary = connections[DEFAULT_DB_ALIAS]
+    old_name = primary.creation.create_test_db(verbosity=0)
+    replicas = {
+        alias: connections[alias].settings_dict for alias in settings.DATABASE_REPLICAS
+    }
+    for alias in replicas:
+        connections[alias].close()
+        connections[alias].creation.set_as_test_mirror(primary.settings_dict)
+    try:
+        with private_cache(), use_primary():
+            yield
+    finally:
+        for alias, settings_dict in replicas.items():
+            connections[alias].close()
+            connections[alias].settings_dict = settings_dict
+        primary.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def reset():
+    """Empty the database, search index and cache, as set up by ``isolated``"""
+    call_command("flush", interactive=False, verbosity=0)
+    backend = search.get_search_backend()
+    if backend:
+        backend.clear("post")
+        backend.clear("project")
+    cache.clear()
+
+
+def measure(call, repeat=5, min_time=0.2):
+    """Best and median seconds per call over ``repeat`` calibrated rounds"""
+    call()  # warm up caches and lazy imports
+    number = 1
+    timer = timeit.Timer(call, timer=time.perf_counter)
+    if min_time:
+        while timer.timeit(number) < min_time:
+            number *= 2
+    rounds = [timer.timeit(number) / number for _ in range(repeat)]
+    return {"seconds": min(rounds), "median": statistics.median(rounds)}
+
+
+def run(sizes, names=None, repeat=5, min_time=0.2, progress=None):
+    """Time the ``names`` benchmarks (default all) at each dataset size"""
+    results = {}
+    for size in sizes:
+        reset()
+        seed.generate(
+            users=max(size // 10, 10),
+            posts=size,
+            projects=size // 2,
+            seed=0,
+            prefix="bench",
+        )
+        fixture = Fixture(size)
+        for name in names or BENCHMARKS:
+            call = BENCHMARKS[name](fixture)
+            results[key(name, size)] = measure(call, repeat, min_time)
+            if progress:
+                progress(name, size, results[key(name, size)])
+    return results
+
+
+def key(name, size):
+    return f"{name}@{size}"
+
+
+def compare(results, baseline, threshold):
+    """
+    Yield (key, baseline seconds or None, seconds, percent change or None,
+    regressed) for every result.
+    """
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            yield name, None, result["seconds"], None, False
+            continue
+        change = (result["seconds"] - before["seconds"]) / before["seconds"] * 100
+        yield name, before["seconds"], result["seconds"], change, change > threshold
+
+
+def load_baseline(path):
+    with open(path) as baseline:
+        return json.load(baseline)["results"]
+
+
+def save_baseline(path, results):
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as baseline:
+        json.dump(document, baseline, indent=2, sort_keys=True)
+        baseline.write("\n")
@@ -0,0 +1,50 @@
+"""
+Bulk inserts that keep the timestamps set on the instances.
+
+``bulk_create`` runs each field's ``pre_save``, which overwrites
+``auto_now`` and ``auto_now_add`` fields with the time of the insert.
+``create_keeping_timestamps`` lets it, then writes the values the instances
+had back with one ``bulk_update``, which does not call ``pre_save``. The
+fields themselves are left alone, so saves on other threads are unaffected.
+"""
+
+
+def timestamp_fields(fields):
+    """attnames of the ``auto_now`` and ``auto_now_add`` fields in ``fields``"""
+    return [
+        field.attname
+        for field in fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+
+
+def create_keeping_timestamps(model, instances, fields=None, key=None, **options):
+    """
+    ``bulk_create`` ``instances`` (with ``options``), keeping their values of
+    the timestamp fields among ``fields``, all of the model's by default.
+
+    Rows an upsert updates may come back without a primary key; ``key``
+    names a unique field to look those up by.
+    """
+    if fields is None:
+        fields = model._meta.concrete_fields
+    stamps = timestamp_fields(fields)
+    kept = [[getattr(instance, name) for name in stamps] for instance in instances]
+
+    created = model.objects.bulk_create(instances, **options)
+    if not stamps or not instances:
+        return created
+
+    if key and any(instance.pk is None for instance in instances):
+        pks = dict(
+            model.objects.filter(
+                **{f"{key}__in": [getattr(i, key) for i in instances]}
+            ).values_list(key, "pk")
+        )
+        for instance in instances:
+            instance.pk = pks[getattr(instance, key)]
+    for instance, values in zip(instances, kept):
+        for name, value in zip(stamps, values):
+            setattr(instance, name, value)
+    model.objects.bulk_update(instances, stamps)
+    return created
@@ -0,0 +1,351 @@
+"""
+Per-process database connection pool for the ``project.db`` backends.
+
+Django opens a connection per request and closes it when the request ends
+(``CONN_MAX_AGE = 0``). The pooled backends hand those closes to a
+``ConnectionPool`` instead, so the next request reuses an open connection
+and skips the TCP, TLS and authentication round trips. Each gunicorn worker
+builds its own pools after the fork, shared by all of its threads:
+
+- ``DB_POOL_MIN_SIZE`` connections are kept open even when idle;
+- at most ``DB_POOL_MAX_SIZE`` are open at once, and a checkout waits up to
+  ``DB_POOL_TIMEOUT`` seconds for one to come back before failing;
+- a connection idle for ``DB_POOL_CHECK_AFTER`` seconds or more is pinged
+  before it is handed out, and replaced if the ping fails;
+- idle connections above the minimum are closed after
+  ``DB_POOL_MAX_IDLE`` seconds, and every connection is replaced after
+  ``DB_POOL_MAX_LIFETIME`` so server-side memory and failovers catch up.
+
+Connections come back with any open transaction rolled back; session
+settings changed with ``SET`` survive, as they do with Django's persistent
+connections. Wait time, busy time and opened/closed connections are
+exported through ``project.metrics``; the rate of
+``db_pool_busy_seconds_total`` divided by the pool size is its utilization.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db.backends.base.base import NO_DB_ALIAS
+
+from project import metrics
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections for one database.
+
+    ``check(connection)`` pings an idle connection and raises if it is
+    broken; ``reset(connection)`` readies a returned connection for reuse
+    and returns False if it should be closed instead.
+    """
+
+    def __init__(
+        self,
+        alias,
+        check,
+        reset,
+        min_size=0,
+        max_size=10,
+        timeout=10.0,
+        check_after=1.0,
+        max_idle=300.0,
+        max_lifetime=3600.0,
+    ):
+        self.alias = alias
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.timeout = timeout
+        self.check_after = check_after
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.pid = os.getpid()
+        # (connection, returned at); the most recently used end is on the
+        # right so busy pools keep reusing warm connections and the idle
+        # surplus ages on the left until it is reaped
+        self.idle = deque()
+        self.opened_at = {}
+        self.checked_out_at = {}
+        self.size = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.stopped = threading.Event()
+        self.maintainer = None
+
+    def checkout(self, connect):
+        """Return an open connection, calling ``connect()`` to open a new one"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = 0.0
+        try:
+            while True:
+                connection, returned_at, blocked = self._acquire(deadline)
+                waited += blocked
+                if connection is None:
+                    return self._open(connect)
+
+                now = time.monotonic()
+                if now - self.opened_at[id(connection)] >= self.max_lifetime:
+                    self._discard(connection, "lifetime")
+                elif now - returned_at >= self.check_after and not self._healthy(
+                    connection
+                ):
+                    self._discard(connection, "unhealthy")
+                else:
+                    self.checked_out_at[id(connection)] = now
+                    return connection
+        finally:
+            metrics.record_pool_wait(self.alias, waited)
+
+    def _acquire(self, deadline):
+        """
+        Take an idle connection, or reserve a slot for a new one (None),
+        returning it with its idle-since time and the seconds spent blocked.
+        """
+        with self.condition:
+            start = time.monotonic()
+            while True:
+                if self.idle:
+                    connection, returned_at = self.idle.pop()
+                    return connection, returned_at, time.monotonic() - start
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None, None, time.monotonic() - start
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.record_pool_timeout(self.alias)
+                    raise PoolTimeout(
+                        f"No connection to {self.alias!r} became available "
+                        f"within {self.timeout}s ({self.max_size} in use)"
+                    )
+                self.condition.wait(remaining)
+
+    def _open(self, connect):
+        try:
+            connection = connect()
+        except BaseException:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        now = time.monotonic()
+        self.opened_at[id(connection)] = now
+        self.checked_out_at[id(connection)] = now
+        metrics.record_pool_connection(self.alias, "opened", "checkout")
+        return connection
+
+    def _healthy(self, connection):
+        try:
+            self.check(connection)
+        except Exception:
+            return False
+        return True
+
+    def checkin(self, connection):
+        """Take back a connection from ``checkout``, closing it if unusable"""
+        now = time.monotonic()
+        checked_out_at = self.checked_out_at.pop(id(connection), now)
+        metrics.record_pool_busy(self.alias, now - checked_out_at)
+
+        try:
+            reusable = self.reset(connection)
+        except Exception:
+            reusable = False
+
+        if not reusable:
+            self._discard(connection, "unusable")
+        elif self.closed or self.pid != os.getpid():
+            self._discard(connection, "closed")
+        elif now - self.opened_at.get(id(connection), now) >= self.max_lifetime:
+            self._discard(connection, "lifetime")
+        else:
+            with self.condition:
+                self.idle.append((connection, now))
+                self.condition.notify()
+
+    def _discard(self, connection, reason):
+        try:
+            connection.close()
+        except Exception:
+            # It is being thrown away because it is broken
+            pass
+        with self.condition:
+            self.size -= 1
+            self.opened_at.pop(id(connection), None)
+            self.checked_out_at.pop(id(connection), None)
+            self.condition.notify()
+        metrics.record_pool_connection(self.alias, "closed", reason)
+
+    def maintain(self, connect=None):
+        """
+        Close idle connections past ``max_idle`` (above ``min_size``) or
+        ``max_lifetime``, then open connections up to ``min_size`` when
+        ``connect`` is given.
+        """
+        now = time.monotonic()
+        expired = []
+        with self.condition:
+            keep = deque()
+            surplus = len(self.idle) + len(self.checked_out_at) - self.min_size
+            # Oldest returns first, so the longest idle go before warm ones
+            for connection, returned_at in self.idle:
+                if now - self.opened_at[id(connection)] >= self.max_lifetime:
+                    expired.append((connection, "lifetime"))
+                elif surplus > 0 and now - returned_at >= self.max_idle:
+                    expired.append((connection, "idle"))
+                    surplus -= 1
+                else:
+                    keep.append((connection, returned_at))
+            self.idle = keep
+        for connection, reason in expired:
+            self._discard(connection, reason)
+
+        while connect is not None and not self.closed:
+            with self.condition:
+                if self.size >= self.min_size:
+                    break
+                self.size += 1
+            try:
+                connection = connect()
+            except Exception:
+                with self.condition:
+                    self.size -= 1
+                # Try again on the next pass; checkouts report the error
+                break
+            self.opened_at[id(connection)] = time.monotonic()
+            metrics.record_pool_connection(self.alias, "opened", "min_size")
+            with self.condition:
+                self.idle.appendleft((connection, time.monotonic()))
+                self.condition.notify()
+
+    def start_maintainer(self, connect, interval):
+        """Recycle and top up connections in the background"""
+        if self.maintainer is None:
+            self.maintainer = threading.Thread(
+                target=self._maintain_loop,
+                args=(connect, interval),
+                name=f"db-pool-{self.alias}",
+                daemon=True,
+            )
+            self.maintainer.start()
+
+    def _maintain_loop(self, connect, interval):
+        while not self.stopped.wait(interval):
+            self.maintain(connect)
+
+    def close(self):
+        """Close idle connections now and in-use ones when they come back"""
+        self.closed = True
+        self.stopped.set()
+        with self.condition:
+            idle, self.idle = self.idle, deque()
+        for connection, _ in idle:
+            self._discard(connection, "closed")
+
+    def stats(self):
+        with self.condition:
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "in_use": self.size - len(self.idle),
+                "max_size": self.max_size,
+            }
+
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+# Pools inherited over a fork; their connections belong to the parent, so
+# they are kept referenced rather than closed or garbage collected
+_inherited = []
+
+
+def get_pool(alias, params, check, reset, connect=None):
+    """
+    Return this process's pool for ``alias`` and connection ``params``,
+    creating it (and its maintenance thread, given ``connect``) on first use.
+    """
+    global _pools_pid
+    key = (alias, repr(sorted(params.items())))
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _inherited.extend(_pools.values())
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                alias,
+                check,
+                reset,
+                min_size=settings.DB_POOL_MIN_SIZE,
+                max_size=settings.DB_POOL_MAX_SIZE,
+                timeout=settings.DB_POOL_TIMEOUT,
+                check_after=settings.DB_POOL_CHECK_AFTER,
+                max_idle=settings.DB_POOL_MAX_IDLE,
+                max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+            )
+            if connect is not None and pool.min_size:
+                pool.start_maintainer(connect, settings.DB_POOL_MAINTAIN_INTERVAL)
+    return pool
+
+
+def close_pools(alias=None):
+    """Close this process's pools, or only those for ``alias``"""
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            return
+        keys = [key for key in _pools if alias is None or key[0] == alias]
+        pools = [_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.close()
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Check connections out of a ``ConnectionPool`` instead of opening them,
+    and back in instead of closing them. Backends supply ``pool_check`` and
+    ``pool_reset`` static methods and may return None from ``get_pool`` for
+    databases that should not be pooled.
+    """
+
+    _pool = None
+
+    def get_pool(self, conn_params, connect):
+        if self.alias == NO_DB_ALIAS or not settings.DB_POOL_MAX_SIZE:
+            return None
+        return get_pool(
+            self.alias, conn_params, self.pool_check, self.pool_reset, connect
+        )
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        pool = self.get_pool(conn_params, lambda: connect(conn_params))
+        if pool is None:
+            return connect(conn_params)
+        try:
+            connection = pool.checkout(lambda: connect(conn_params))
+        except PoolTimeout as exc:
+            # Surfaces as django.db.OperationalError through wrap_database_errors
+            raise self.Database.OperationalError(str(exc)) from exc
+        # Remember the pool it came from in case settings change the params
+        self._pool = pool
+        return connection
+
+    def _close(self):
+        pool, self._pool = self._pool, None
+        if self.connection is None or pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.checkin(self.connection)
+            # Another thread may have it now, even if this one is mid-atomic
+            self.connection = None
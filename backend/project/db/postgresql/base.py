@@ -0,0 +1,59 @@
+"""
+PostgreSQL backend whose connections come from a per-process pool (see
+``project.db.pool``). Django's own pool needs psycopg 3 and psycopg_pool;
+this one also works with psycopg2. Setting ``OPTIONS["pool"]`` switches to
+Django's pool instead.
+"""
+
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from project.db.pool import PooledDatabaseWrapperMixin, close_pools
+
+# Values of connection.info.transaction_status in psycopg2 and psycopg 3
+TRANSACTION_IDLE = 0
+TRANSACTION_UNKNOWN = 4
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would block DROP DATABASE
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @staticmethod
+    def pool_check(connection):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if not connection.autocommit:
+            connection.rollback()
+
+    @staticmethod
+    def pool_reset(connection):
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == TRANSACTION_UNKNOWN:
+            return False
+        if status != TRANSACTION_IDLE:
+            connection.rollback()
+        return True
+
+    def get_pool(self, conn_params, connect):
+        if self.pool:
+            return None
+        return super().get_pool(conn_params, connect)
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        # The parent records this as it opens a connection; reused ones skip it
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        return connection
@@ -0,0 +1,194 @@
+"""
+Read replicas for safe-method requests.
+
+Each URL in ``DATABASE_REPLICA_URLS`` becomes a ``replica_<n>`` database.
+``ReplicaMiddleware`` lets the reads of ``GET``, ``HEAD`` and ``OPTIONS``
+requests go to one of them, picked per request, and ``ReplicaRouter``
+sends everything else to ``default``:
+
+- writes always go to ``default``, and once a request has written, the
+  rest of its reads do too, as do reads inside a transaction;
+- a user who writes is pinned to ``default`` for ``REPLICA_PIN_SECONDS`` so
+  they read their own changes despite replication lag. Pins live in the
+  cache, so workers only see each other's pins with a shared cache
+  backend. Requests are matched to users before authentication by the JWT
+  ``user_id`` claim, unverified, since it only chooses where to read;
+- a replica that cannot be connected to is skipped for
+  ``REPLICA_RETRY_AFTER`` seconds, and reads fall back to ``default`` when
+  none is left.
+
+Reads outside requests, such as in jobs and management commands, stay on
+``default``. Values cached from a replica (``blog.stats``) can lag by the
+replication delay; ``use_primary`` forces reads that must not.
+
+To try it locally, copy the SQLite database and point a replica at the
+copy, which then stays as stale as the moment it was taken::
+
+    cp db.sqlite3 replica.sqlite3
+    DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3 python manage.py runserver
+"""
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework_simplejwt.settings import api_settings
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger("project.replicas")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Routing:
+    """Where the reads of the current request go, and whether it wrote"""
+
+    __slots__ = ("primary", "replica", "wrote")
+
+    def __init__(self, primary):
+        self.primary = primary
+        self.replica = None
+        self.wrote = False
+
+
+_routing = ContextVar("replica_routing", default=None)
+# alias -> time.monotonic() before which the replica is not tried again
+_down_until = {}
+
+
+@contextmanager
+def use_primary():
+    """Read from ``default`` in this context, even during a safe request"""
+    token = _routing.set(Routing(primary=True))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def _pin_key(user_id):
+    return f"replica:pin:{user_id}"
+
+
+def pin(user_id):
+    cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return bool(cache.get(_pin_key(user_id)))
+
+
+def choose_replica():
+    """Return a replica that accepts connections, or None"""
+    now = time.monotonic()
+    candidates = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if _down_until.get(alias, 0) <= now
+    ]
+    random.shuffle(candidates)
+    for alias in candidates:
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            logger.warning("Replica %s is unavailable; reading from primary", alias)
+            _down_until[alias] = now + settings.REPLICA_RETRY_AFTER
+        else:
+            return alias
+    return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or routing.primary:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        if routing.replica is None:
+            routing.replica = choose_replica() or DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            # Read this request's own writes from where they were made
+            routing.primary = routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema by replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def _user_id(request, user):
+    if user is not None and user.is_authenticated:
+        return user.pk
+    header = request.headers.get("Authorization", "").split()
+    if len(header) != 2 or header[0] not in api_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        claims = jwt.decode(header[1], options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    return claims.get(api_settings.USER_ID_CLAIM)
+
+
+class ReplicaMiddleware:
+    """Route the reads of safe requests from unpinned users to a replica"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        user_id = _user_id(request, getattr(request, "user", None))
+        safe = request.method in SAFE_METHODS
+        routing = Routing(not safe or user_id is not None and is_pinned(user_id))
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if routing.wrote and user_id is not None:
+            pin(user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        user = await request.auser() if hasattr(request, "auser") else None
+        user_id = _user_id(request, user)
+        safe = request.method in SAFE_METHODS
+        pinned = user_id is not None and bool(await cache.aget(_pin_key(user_id)))
+        routing = Routing(not safe or pinned)
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if routing.wrote and user_id is not None:
+            await cache.aset(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+        return response
@@ -0,0 +1,26 @@
+"""
+SQLite backend whose connections come from a per-process pool (see
+``project.db.pool``). In-memory databases are not pooled, since Django
+keeps their single connection open anyway.
+"""
+
+from django.db.backends.sqlite3 import base
+
+from project.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    @staticmethod
+    def pool_check(connection):
+        connection.execute("SELECT 1")
+
+    @staticmethod
+    def pool_reset(connection):
+        if connection.in_transaction:
+            connection.rollback()
+        return True
+
+    def get_pool(self, conn_params, connect):
+        if self.is_in_memory_db():
+            return None
+        return super().get_pool(conn_params, connect)
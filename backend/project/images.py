@@ -0,0 +1,245 @@
+"""
+Responsive image variants for uploaded media.
+
+Every image field listed in ``IMAGE_FIELDS`` has a companion JSON column
+(``<field>_variants``) holding the original's width and height and the
+storage names of fixed-width WebP and JPEG copies::
+
+    {"source": "posts/a.png", "width": 2400, "height": 1600,
+     "webp": {"320": "posts/variants/a.png-320w.webp", ...},
+     "jpeg": {"320": "posts/variants/a.png-320w.jpg", ...}}
+
+Saving a model whose image changed schedules ``generate`` after the
+transaction commits, on a background thread so the request never waits
+for Pillow (``IMAGE_VARIANTS_ASYNC``). Serializers expose the result as
+``srcset`` strings through ``describe``. ``manage.py
+backfill_image_variants`` covers media uploaded before this existed.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from rest_framework import serializers  # type: ignore
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+# model label -> image field name
+IMAGE_FIELDS = {
+    "blog.Project": "image",
+    "blog.Post": "cover_image",
+    "users.User": "profile_photo",
+}
+
+FORMATS = {
+    # key in the variants map: (Pillow format, file extension)
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+_executor = None
+
+
+def variants_field(field_name):
+    return f"{field_name}_variants"
+
+
+def variant_widths():
+    return sorted(getattr(settings, "IMAGE_VARIANT_WIDTHS", (320, 640, 1280)))
+
+
+def _variant_name(source, width, extension):
+    # The whole file name, extension included, since storage only keeps
+    # names unique as a whole: a.png and a.jpg must not share variants
+    directory, filename = os.path.split(source)
+    return os.path.join(directory, "variants", f"{filename}-{width}w.{extension}")
+
+
+def _encode(image, image_format):
+    from PIL import Image
+
+    if image_format == "JPEG" and image.mode != "RGB":
+        # JPEG has no alpha channel; flatten transparent areas onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    buffer = BytesIO()
+    quality = getattr(settings, "IMAGE_VARIANT_QUALITY", 80)
+    image.save(buffer, format=image_format, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def render_variants(fieldfile):
+    """Write resized copies of ``fieldfile`` and return its variants map"""
+    # Pillow is only needed here, off the request path; importing it lazily
+    # keeps it out of every process's boot
+    from PIL import Image, ImageOps
+
+    with fieldfile.open("rb") as fh:
+        with Image.open(fh) as original:
+            original = ImageOps.exif_transpose(original)
+            width, height = original.size
+
+            # Never upscale: keep the widths narrower than the original, or
+            # the original width alone if it is narrower than all of them
+            widths = [w for w in variant_widths() if w < width] or [width]
+
+            result = {"source": fieldfile.name, "width": width, "height": height}
+            for key, (image_format, extension) in FORMATS.items():
+                result[key] = {}
+                for target in widths:
+                    resized = original.resize(
+                        (target, max(1, round(height * target / width))),
+                        Image.Resampling.LANCZOS,
+                    )
+                    name = _variant_name(fieldfile.name, target, extension)
+                    if default_storage.exists(name):
+                        default_storage.delete(name)
+                    result[key][str(target)] = default_storage.save(
+                        name, ContentFile(_encode(resized, image_format))
+                    )
+    return result
+
+
+def _variant_names(variants):
+    return {name for key in FORMATS for name in (variants or {}).get(key, {}).values()}
+
+
+def delete_variants(variants, keep=None):
+    """Delete the files of ``variants`` that ``keep`` does not also use"""
+    for name in _variant_names(variants) - _variant_names(keep):
+        default_storage.delete(name)
+
+
+def needs_variants(instance, field_name):
+    fieldfile = getattr(instance, field_name)
+    variants = getattr(instance, variants_field(field_name))
+    if not fieldfile:
+        return bool(variants)
+    return not variants or variants.get("source") != fieldfile.name
+
+
+def generate(instance, field_name):
+    """
+    (Re)build the variants of one image field and store them with an
+    ``UPDATE`` that only applies if the image was not replaced meanwhile.
+    """
+    model = type(instance)
+    fieldfile = getattr(instance, field_name)
+    previous = getattr(instance, variants_field(field_name))
+
+    if fieldfile:
+        variants = render_variants(fieldfile)
+        unchanged = Q(**{field_name: fieldfile.name})
+    else:
+        variants = None
+        unchanged = Q(**{field_name: ""}) | Q(**{f"{field_name}__isnull": True})
+    updated = model._default_manager.filter(unchanged, pk=instance.pk).update(
+        **{variants_field(field_name): variants}
+    )
+
+    if not updated:
+        # The image changed while we worked; its own job will redo this
+        delete_variants(variants)
+        return None
+
+    if previous and previous.get("source") != fieldfile.name:
+        delete_variants(previous, keep=variants)
+    setattr(instance, variants_field(field_name), variants)
+    if model._meta.label == settings.AUTH_USER_MODEL:
+        # The UPDATE sends no post_save; keep request.user current
+        from users.authentication import invalidate_user
+
+        invalidate_user(instance.pk)
+    return variants
+
+
+def _run(label, pk, field_name):
+    close_old_connections()
+    try:
+        instance = apps.get_model(label)._default_manager.filter(pk=pk).first()
+        if instance is not None and needs_variants(instance, field_name):
+            generate(instance, field_name)
+    except Exception:
+        logger.exception("Image variants failed for %s %s", label, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule(instance, field_name):
+    """Generate variants for ``instance`` once the current transaction commits"""
+    label = instance._meta.label
+    pk = instance.pk
+
+    def submit():
+        global _executor
+        if not getattr(settings, "IMAGE_VARIANTS_ASYNC", True):
+            _run(label, pk, field_name)
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_VARIANT_WORKERS", 2),
+                thread_name_prefix="image-variants",
+            )
+        _executor.submit(_run, label, pk, field_name)
+
+    transaction.on_commit(submit)
+
+
+def schedule_if_changed(sender, instance, raw=False, **kwargs):
+    """``post_save`` receiver for every model in ``IMAGE_FIELDS``"""
+    field_name = IMAGE_FIELDS[instance._meta.label]
+    if not raw and needs_variants(instance, field_name):
+        schedule(instance, field_name)
+
+
+def url_builder(request=None):
+    """Storage name -> URL, absolute when there is a request (like DRF)"""
+
+    def url(name):
+        location = default_storage.url(name)
+        return request.build_absolute_uri(location) if request else location
+
+    return url
+
+
+def describe(variants, url):
+    """
+    Public form of a variants map: dimensions plus one ``srcset`` string per
+    format, with ``url`` turning a storage name into an absolute URL.
+    """
+    if not variants or not variants.get("source"):
+        return None
+    srcset = {
+        key: ", ".join(
+            f"{url(name)} {width}w"
+            for width, name in sorted(
+                variants.get(key, {}).items(), key=lambda item: int(item[0])
+            )
+        )
+        for key in FORMATS
+    }
+    return {"width": variants["width"], "height": variants["height"], "srcset": srcset}
+
+
+class ImageVariantsField(serializers.Field):
+    """Read-only serializer field rendering a variants map with ``describe``"""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return describe(value, url_builder(self.context.get("request")))
@@ -0,0 +1,103 @@
+import fnmatch
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from project import bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Time serializers, aggregations, search and permission checks at "
+        "several dataset sizes and compare them with a saved baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "patterns",
+            nargs="*",
+            help="Only run benchmarks matching these patterns, e.g. 'views.*'",
+        )
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--min-time",
+            type=float,
+            default=0.2,
+            help="Seconds each timing round runs for at least",
+        )
+        parser.add_argument("--baseline", default=settings.BENCH_BASELINE)
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=settings.BENCH_REGRESSION_THRESHOLD,
+            help="Percent slowdown from the baseline that fails the run",
+        )
+        parser.add_argument(
+            "--save",
+            action="store_true",
+            help="Store the results in the baseline instead of comparing",
+        )
+        parser.add_argument("--list", action="store_true", help="List benchmarks")
+
+    def handle(self, *args, **options):
+        names = [
+            name
+            for name in bench.BENCHMARKS
+            if not options["patterns"]
+            or any(fnmatch.fnmatch(name, p) for p in options["patterns"])
+        ]
+        if options["list"]:
+            self.stdout.write("\n".join(names))
+            return
+        if not names:
+            raise CommandError("No benchmark matches.")
+
+        def progress(name, size, result):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{name}@{size}: {result['seconds'] * 1000:.3f} ms")
+
+        # Seeded into a throwaway database, as the test runner does
+        with bench.isolated():
+            results = bench.run(
+                options["sizes"],
+                names,
+                repeat=options["repeat"],
+                min_time=options["min_time"],
+                progress=progress,
+            )
+
+        path = options["baseline"]
+        baseline = bench.load_baseline(path) if os.path.exists(path) else {}
+        if options["save"]:
+            bench.save_baseline(path, {**baseline, **results})
+        self.report(results, baseline, options)
+
+    def report(self, results, baseline, options):
+        self.stdout.write(
+            f"{'benchmark':<40}{'baseline ms':>14}{'current ms':>14}{'change':>10}"
+        )
+        regressions = []
+        rows = bench.compare(results, baseline, options["threshold"])
+        for key, before, seconds, change, regressed in rows:
+            line = (
+                f"{key:<40}"
+                f"{'-' if before is None else f'{before * 1000:.3f}':>14}"
+                f"{seconds * 1000:>14.3f}"
+                f"{'new' if change is None else f'{change:+.1f}%':>10}"
+            )
+            if regressed:
+                regressions.append(key)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if options["save"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Saved baseline to {options['baseline']}")
+            )
+        elif regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) regressed by more than "
+                f"{options['threshold']}%: {', '.join(regressions)}"
+            )
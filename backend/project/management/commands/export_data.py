@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from project import transfer
+
+
+class Command(BaseCommand):
+    help = "Stream users, projects or posts out as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(transfer.DATASETS))
+        parser.add_argument("--format", choices=transfer.FORMATS, default="ndjson")
+        parser.add_argument(
+            "--output", help="File to write to instead of standard output"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched per database round trip",
+        )
+        parser.add_argument(
+            "--include-passwords",
+            action="store_true",
+            help="Export users' password hashes so they can log in after import",
+        )
+
+    def handle(self, *args, **options):
+        chunks = transfer.export(
+            options["dataset"],
+            options["format"],
+            chunk_size=options["chunk_size"],
+            private=options["include_passwords"],
+        )
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {options['dataset']} to {options['output']}")
+        )
@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from project import transfer
+
+
+class Command(BaseCommand):
+    help = "Import users, projects or posts from an NDJSON or CSV export"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(transfer.DATASETS))
+        parser.add_argument("path", help="File to read, or - for standard input")
+        parser.add_argument(
+            "--format",
+            choices=transfer.FORMATS,
+            help="Defaults to csv for .csv files and ndjson otherwise",
+        )
+        parser.add_argument(
+            "--on-conflict",
+            choices=transfer.CONFLICT_ACTIONS,
+            default="error",
+            help="What to do with rows that already exist",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows written per bulk insert and transaction",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "ndjson")
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+        try:
+            counts = transfer.import_rows(
+                options["dataset"],
+                transfer.read_rows(stream, fmt),
+                on_conflict=options["on_conflict"],
+                batch_size=options["batch_size"],
+            )
+        except (transfer.TransferError, IntegrityError) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {counts['created']}, updated {counts['updated']} and "
+                f"skipped {counts['skipped']} {options['dataset']}"
+            )
+        )
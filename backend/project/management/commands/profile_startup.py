@@ -0,0 +1,62 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from project import startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Time how long fresh processes take to boot the application, list "
+        "the slowest imports and fail when boot exceeds the budget, if one is set"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=sorted(startup.TARGETS),
+            default="wsgi",
+            help="What to boot: a server's application or django.setup()",
+        )
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument(
+            "--top", type=int, default=15, help="Slowest modules and packages shown"
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=settings.BOOT_TIME_BUDGET_MS,
+            help="Milliseconds the fastest boot may take; 0 only reports",
+        )
+
+    def handle(self, *args, **options):
+        target = options["target"]
+        try:
+            times = startup.boot_times(target, max(options["runs"], 1))
+            imports = startup.import_times(target)
+        except startup.StartupError as error:
+            raise CommandError(error)
+
+        top = options["top"]
+        self.stdout.write(f"{'module':<50}{'self ms':>10}{'cumulative ms':>16}")
+        for entry in sorted(imports, key=lambda e: e.self_ms, reverse=True)[:top]:
+            self.stdout.write(
+                f"{entry.module:<50}{entry.self_ms:>10.1f}{entry.cumulative_ms:>16.1f}"
+            )
+        self.stdout.write(f"\n{'package':<50}{'ms':>10}")
+        packages = startup.by_package(imports)
+        for package, ms in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+            self.stdout.write(f"{package:<50}{ms:>10.1f}")
+
+        fastest = min(times)
+        budget = options["budget"]
+        summary = (
+            f"\nBooted {target} in {fastest:.0f} ms "
+            f"(median {statistics.median(times):.0f} ms over {len(times)} runs, "
+            f"{len(imports)} modules imported, "
+            f"{f'budget {budget:.0f} ms' if budget > 0 else 'no budget'})"
+        )
+        if budget > 0 and fastest > budget:
+            raise CommandError(summary.strip() + ": over budget")
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from project import seed
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic synthetic users, posts and projects at scale"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--posts", type=int, default=5000)
+        parser.add_argument("--projects", type=int, default=2000)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="The same seed and sizes always generate the same rows",
+        )
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Username prefix of generated users, used by --clear",
+        )
+        parser.add_argument(
+            "--password",
+            default="seedpass123",
+            help="Password of every generated user",
+        )
+        parser.add_argument(
+            "--post-words",
+            type=int,
+            default=600,
+            help="Typical number of words in a post",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows written per bulk insert and transaction",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="First delete users with the prefix, and their content",
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        if options["clear"]:
+            deleted = seed.clear(options["prefix"])
+            self.stdout.write(f"Deleted {deleted} row(s)")
+
+        def progress(kind, done):
+            self.stdout.write(
+                f"{kind}: {done} ({time.monotonic() - start:.1f}s)", ending="\r"
+            )
+            self.stdout.flush()
+
+        seed.generate(
+            users=options["users"],
+            posts=options["posts"],
+            projects=options["projects"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+            password=options["password"],
+            post_words=options["post_words"],
+            batch_size=options["batch_size"],
+            progress=progress if options["verbosity"] > 1 else None,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {options['users']} users, {options['posts']} posts and "
+                f"{options['projects']} projects in {time.monotonic() - start:.1f}s"
+            )
+        )
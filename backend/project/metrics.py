@@ -0,0 +1,351 @@
+"""
+Prometheus text-format request metrics shared across worker processes.
+
+``MetricsMiddleware`` records, per route and view action, request latency,
+SQL query count and response size as histograms, plus a request counter by
+status. Job workers (``jobs.queue``) add queue latency and run time per job,
+and the database pools (``project.db.pool``) wait time, busy time and
+connection churn. Each process keeps its series in memory and writes them to its own
+JSON file under ``METRICS_DIR`` from a background thread every
+``METRICS_FLUSH_INTERVAL`` seconds; ``/metrics/`` merges every file into one exposition so quantiles
+such as p99 can be computed with ``histogram_quantile`` over all workers.
+Without ``METRICS_DIR`` only the serving process is reported.
+
+Files are named after the writing process's pid. Each scrape folds the
+files of processes that have exited into ``retired.json``, so counters from
+recycled workers keep counting without one file per dead worker piling up.
+That needs the workers sharing ``METRICS_DIR`` to share a pid namespace,
+i.e. one directory per host or container.
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+JOB_WAIT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Request latency by route and view action",
+        LATENCY_BUCKETS,
+    ),
+    "http_request_db_queries": ("SQL queries per request", QUERY_BUCKETS),
+    "http_response_size_bytes": ("Response body size", SIZE_BUCKETS),
+    "job_queue_latency_seconds": (
+        "Time from a job becoming due to a worker starting it",
+        JOB_WAIT_BUCKETS,
+    ),
+    "job_duration_seconds": ("Job run time", LATENCY_BUCKETS),
+    "db_pool_wait_seconds": (
+        "Time spent waiting to check out a pooled database connection",
+        POOL_WAIT_BUCKETS,
+    ),
+}
+COUNTERS = {
+    "http_requests_total": "Requests by route, view action and status",
+    "jobs_total": "Job attempts by job name and resulting status",
+    "db_pool_busy_seconds_total": (
+        "Time pooled connections spent checked out; its rate over the pool "
+        "size is the pool utilization"
+    ),
+    "db_pool_connections_opened_total": "Pooled connections opened by reason",
+    "db_pool_connections_closed_total": "Pooled connections closed by reason",
+    "db_pool_timeouts_total": "Checkouts that gave up waiting for a connection",
+}
+
+# Series of exited processes, see MetricsStore.retire_exited
+RETIRED = "retired.json"
+
+
+class MetricsStore:
+    """
+    Series for one process, keyed by (metric name, sorted label pairs).
+    Histograms hold per-bucket counts followed by the +Inf bucket, sum and
+    count; counters hold a single value.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        # The pid alone is reused by recycled workers; the token keeps
+        # their files apart so counters never go backwards
+        self.path = (
+            os.path.join(directory, f"{self.pid}-{uuid.uuid4().hex[:8]}.json")
+            if directory
+            else None
+        )
+        self.series = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.flusher = None
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            series[bisect_left(buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+            self.dirty = True
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            series = self.series.setdefault(key, [0])
+            series[0] += amount
+            self.dirty = True
+
+    def start_flusher(self):
+        """Write changes in the background so idle workers are not stale"""
+        if self.path and self.flusher is None:
+            self.flusher = threading.Thread(
+                target=self._flush_loop, name="metrics-flush", daemon=True
+            )
+            self.flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self.dirty:
+                self.flush()
+
+    def flush(self):
+        """Atomically replace this process's file with its current series"""
+        if not self.path or self.pid != os.getpid():
+            return
+        with self.lock:
+            payload = [
+                [name, labels, values] for (name, labels), values in self.series.items()
+            ]
+            self.dirty = False
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as fh:
+                json.dump(payload, fh)
+            os.replace(tmp, self.path)
+        except OSError:
+            # Metrics are best effort; never fail a request over them
+            pass
+
+    def collect(self):
+        """Return series summed over every process sharing the directory"""
+        if not self.path:
+            with self.lock:
+                return {key: list(values) for key, values in self.series.items()}
+
+        self.flush()
+        self.retire_exited()
+        merged = {}
+        with self.locked(fcntl.LOCK_SH):
+            for filename in os.listdir(self.directory):
+                if filename.endswith(".json"):
+                    _merge(merged, _read(os.path.join(self.directory, filename)))
+        return merged
+
+    @contextmanager
+    def locked(self, operation):
+        """Hold the directory lock: shared to read files, exclusive to retire"""
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            fcntl.flock(lock, operation)
+            yield
+
+    def retire_exited(self):
+        """Fold the files of processes that have exited into ``retired.json``"""
+        exited = []
+        for filename in os.listdir(self.directory):
+            pid = filename.split("-", 1)[0]
+            if pid.isdigit() and not _alive(int(pid)):
+                exited.append(os.path.join(self.directory, filename))
+        if not exited:
+            return
+
+        retired = os.path.join(self.directory, RETIRED)
+        # Exclusive, so no scrape sees a file both retired and still there
+        with self.locked(fcntl.LOCK_EX):
+            merged = _read(retired)
+            for path in exited:
+                # Temporary files left by a worker killed mid-flush are dropped
+                if path.endswith(".json"):
+                    _merge(merged, _read(path))
+            _write(retired, merged)
+            for path in exited:
+                _remove(path)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read(path):
+    """Series from one process's file, or none if it cannot be read"""
+    try:
+        with open(path) as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
+        # Another process is mid-write or the file was removed
+        return {}
+    return {
+        (name, tuple(tuple(pair) for pair in labels)): values
+        for name, labels, values in payload
+    }
+
+
+def _merge(merged, series):
+    for key, values in series.items():
+        total = merged.get(key)
+        if total is None:
+            merged[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                total[i] += value
+
+
+def _write(path, series):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(
+            [[name, labels, values] for (name, labels), values in series.items()], fh
+        )
+    os.replace(tmp, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return this process's store, starting a fresh one after a fork"""
+    global _store
+    if _store is None or _store.pid != os.getpid():
+        with _store_lock:
+            if _store is None or _store.pid != os.getpid():
+                directory = getattr(settings, "METRICS_DIR", None)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                _store = MetricsStore(
+                    directory,
+                    getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0),
+                )
+                _store.start_flusher()
+                atexit.register(_store.flush)
+    return _store
+
+
+def record_request(route, action, method, status, duration, queries, size):
+    store = get_store()
+    labels = {"route": route, "action": action, "method": method}
+    store.observe("http_request_duration_seconds", labels, duration)
+    store.observe("http_request_db_queries", labels, queries)
+    if size is not None:
+        store.observe("http_response_size_bytes", labels, size)
+    store.inc("http_requests_total", dict(labels, status=str(status)))
+
+
+def record_job(name, status, waited, duration):
+    store = get_store()
+    store.observe("job_queue_latency_seconds", {"job": name}, waited)
+    store.observe("job_duration_seconds", {"job": name}, duration)
+    store.inc("jobs_total", {"job": name, "status": status})
+
+
+def record_pool_wait(alias, waited):
+    get_store().observe("db_pool_wait_seconds", {"database": alias}, waited)
+
+
+def record_pool_busy(alias, seconds):
+    get_store().inc("db_pool_busy_seconds_total", {"database": alias}, seconds)
+
+
+def record_pool_connection(alias, event, reason):
+    get_store().inc(
+        f"db_pool_connections_{event}_total", {"database": alias, "reason": reason}
+    )
+
+
+def record_pool_timeout(alias):
+    get_store().inc("db_pool_timeouts_total", {"database": alias})
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(series):
+    """Format collected series in the Prometheus text exposition format"""
+    by_name = {}
+    for (name, labels), values in sorted(series.items()):
+        by_name.setdefault(name, []).append((labels, values))
+
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, values in by_name.get(name, []):
+            cumulative = 0
+            for bound, count in zip(buckets + ("+Inf",), values):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(
+                    f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(labels)} {_number(values[-2])}")
+            lines.append(f"{name}_count{_labels(labels)} {values[-1]}")
+
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, values in by_name.get(name, []):
+            lines.append(f"{name}{_labels(labels)} {_number(values[0])}")
+
+    return "\n".join(lines) + "\n"
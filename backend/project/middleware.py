@@ -0,0 +1,245 @@
+"""
+Request instrumentation middleware.
+
+``QueryInspectorMiddleware`` is opt-in SQL inspection for catching N+1
+query patterns. Enable it with ``QUERY_INSPECTOR_ENABLED=True``. Every
+statement executed while handling a request is recorded; statements that
+run at least ``QUERY_INSPECTOR_REPEAT_THRESHOLD`` times with the same SQL
+and only different parameters are reported as a likely N+1 pattern.
+Reports are logged to the ``project.queries`` logger, or raised as
+``NPlusOneError`` when ``QUERY_INSPECTOR_RAISE`` is set (useful in tests
+and development).
+
+``ServerTimingMiddleware`` reports per-phase timings, see ``project.timing``.
+``MetricsMiddleware`` feeds the Prometheus histograms in ``project.metrics``.
+
+All three work in both sync (WSGI) and async (ASGI) stacks. Statements are
+observed through a context variable rather than a per-connection
+``execute_wrapper``, because async views run their queries on other threads
+(and so other connections) than the one the middleware runs on.
+"""
+
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import record_request
+from .timing import Timings
+
+logger = logging.getLogger("project.queries")
+timing_logger = logging.getLogger("project.timing")
+
+
+_observers = ContextVar("query_observers", default=())
+
+
+def _observe(execute, sql, params, many, context):
+    # Installed once on every connection; calls this context's observers
+    observers = _observers.get()
+    for observer in reversed(observers):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_observer(sender, connection, **kwargs):
+    if _observe not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_observe)
+
+
+@contextmanager
+def observe_queries(*observers):
+    """
+    Pass every statement run in this context, including by threads started
+    through ``sync_to_async``, to ``observers`` (``execute_wrapper``
+    callables).
+    """
+    for alias in connections:
+        install_observer(None, connections[alias])
+    token = _observers.set(_observers.get() + observers)
+    try:
+        yield
+    finally:
+        _observers.reset(token)
+
+
+class ObservingMiddleware:
+    """
+    Base for middleware that watches the queries of a request. ``begin``
+    returns an observer, or None to skip the request; ``end`` gets it back
+    along with the response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        observer = self.begin(request)
+        if observer is None:
+            return self.get_response(request)
+        with observe_queries(observer):
+            response = self.get_response(request)
+        return self.end(request, response, observer)
+
+    async def __acall__(self, request):
+        observer = self.begin(request)
+        if observer is None:
+            return await self.get_response(request)
+        with observe_queries(observer):
+            response = await self.get_response(request)
+        return self.end(request, response, observer)
+
+    def begin(self, request):
+        raise NotImplementedError
+
+    def end(self, request, response, observer):
+        raise NotImplementedError
+
+
+class NPlusOneError(Exception):
+    """Raised when a request repeats a query shape too many times"""
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable that counts statements by SQL shape"""
+
+    def __init__(self):
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # Placeholders are still unbound here, so the SQL text is the shape
+        self.shapes[sql] += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self):
+        return sum(self.shapes.values())
+
+    def repeated(self, threshold):
+        return [(sql, n) for sql, n in self.shapes.most_common() if n >= threshold]
+
+
+class QueryInspectorMiddleware(ObservingMiddleware):
+    def begin(self, request):
+        return QueryRecorder()
+
+    def end(self, request, response, recorder):
+        threshold = getattr(settings, "QUERY_INSPECTOR_REPEAT_THRESHOLD", 5)
+        repeated = recorder.repeated(threshold)
+        if repeated:
+            self.report(request, recorder, repeated)
+        return response
+
+    def report(self, request, recorder, repeated):
+        sql, count = repeated[0]
+        message = (
+            f"Possible N+1 on {request.method} {request.path}: "
+            f"{count} of {recorder.total} queries were {sql!r}"
+        )
+        if getattr(settings, "QUERY_INSPECTOR_RAISE", False):
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+class ServerTimingMiddleware(ObservingMiddleware):
+    """
+    Time the db, app and render phases of a sampled share of requests and
+    report them in the ``Server-Timing`` header and the
+    ``project.timing`` log. Unsampled requests pay one random() call.
+    """
+
+    def begin(self, request):
+        rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 1.0)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return None
+        request.server_timing = Timings()
+        return request.server_timing
+
+    def end(self, request, response, timings):
+        phases = timings.finish()
+        response["Server-Timing"] = Timings.header(phases)
+        match = getattr(request, "resolver_match", None)
+        timing_logger.info(
+            "%s %s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            " ".join(f"{name}={ms:.2f}" for name, ms in phases.items()),
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "route": match.view_name if match else None,
+                "status": response.status_code,
+                "queries": timings.queries,
+                "timings": phases,
+            },
+        )
+        return response
+
+
+class QueryCounter:
+    """``execute_wrapper`` callable that only counts statements"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware(ObservingMiddleware):
+    """
+    Record latency, query count and response size per route and view
+    action (``list``, ``featured``, ``search_content``...).
+    """
+
+    def begin(self, request):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            return None
+        return QueryCounter()
+
+    def end(self, request, response, counter):
+        duration = time.perf_counter() - counter.started
+        match = getattr(request, "resolver_match", None)
+        route = match.view_name if match else "unmatched"
+        if route != "metrics":
+            record_request(
+                route,
+                self.action(request.method, match.func) if match else "unknown",
+                request.method,
+                response.status_code,
+                duration,
+                counter.count,
+                None if response.streaming else len(response.content),
+            )
+        return response
+
+    @staticmethod
+    def action(method, view_func):
+        # ViewSet.as_view() exposes its method -> action map; @api_view and
+        # class-based views expose the view class, named after the function.
+        # Not a process_view hook, which an ASGI stack would run on a thread
+        actions = getattr(view_func, "actions", None)
+        if actions:
+            return actions.get(method.lower(), "unknown")
+        return getattr(view_func, "cls", view_func).__name__
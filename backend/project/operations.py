@@ -0,0 +1,37 @@
+"""
+Migration operations shared by the project's apps.
+"""
+
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    AddIndex that builds the index with CREATE INDEX CONCURRENTLY on
+    PostgreSQL so writes to the table are not blocked while it is built.
+    Other databases fall back to a regular CREATE INDEX.
+
+    Migrations using it must set ``atomic = False``.
+    """
+
+    def _concurrently(self, schema_editor):
+        return schema_editor.connection.vendor == "postgresql"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if self._concurrently(schema_editor):
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if self._concurrently(schema_editor):
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
+
+    def describe(self):
+        return "Concurrently " + super().describe()
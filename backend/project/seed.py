@@ -0,0 +1,286 @@
+"""
+Deterministic synthetic data at production scale, for load tests and
+benchmarks (``seed_scale``).
+
+Everything is drawn from one ``random.Random(seed)`` and timestamps count
+back from a fixed date rather than now, so the same arguments produce the
+same rows on every run and benchmark results can be compared. Rows are
+generated and written ``batch_size`` at a time with ``bulk_create``, which
+keeps memory flat apart from the ids of content authors:
+
+- users share one password hash, computed once, and are mostly members,
+  with a few admins and the rest viewers;
+- posts and projects go to admins and members on a Zipf-like curve, so a
+  few prolific authors own much of the content, as on a real site;
+- post lengths are log-normal around ``post_words``, built from a fixed
+  pool of paragraphs; tags and tech stacks are also drawn on Zipf-like
+  curves, so a few are everywhere and most are rare.
+
+Seeded users are named ``<prefix>_<n>`` so ``clear`` can remove them and
+their content.
+"""
+
+import math
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, islice
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, F
+
+from blog import search, stats
+from blog.models import Post, PostTag, Project, ProjectTechnology, Technology
+
+from .db import bulk
+
+# Seeded timestamps fall in the SPAN before this, whatever day it is
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SPAN = timedelta(days=3 * 365)
+
+FIRST_NAMES = (
+    "Amina Brian Grace David Esther Frank Joan Isaac Ruth Moses Sarah Peter "
+    "Mary Paul Ann John Rose Samuel Faith Daniel Irene Joseph Lydia Ivan"
+).split()
+LAST_NAMES = (
+    "Ocen Nakato Okello Achieng Mugisha Namutebi Kato Atim Ssempala Akello "
+    "Byaruhanga Nabirye Odongo Kyomuhendo Opio Nansubuga Wasswa Auma"
+).split()
+TECHNOLOGIES = (
+    "Python Django React TypeScript JavaScript PostgreSQL Docker Redis "
+    "Node.js Tailwind GraphQL Kubernetes AWS Flask FastAPI Vue Go Rust Java "
+    "Spring Kotlin Swift Flutter Dart Firebase MongoDB MySQL SQLite Celery "
+    "Nginx Terraform Angular Svelte Next.js Pandas NumPy PyTorch TensorFlow"
+).split()
+TAGS = (
+    "django python webdev tutorial react career testing performance "
+    "security devops databases frontend backend api design architecture "
+    "cloud docker machine-learning data open-source beginners productivity "
+    "javascript typescript css accessibility mobile linux git postgres "
+    "caching scaling debugging interviews teamwork agile ux research"
+).split()
+WORDS = (
+    "the a of to and in for with on that this is we our it you can when "
+    "application request response query index cache server client database "
+    "model view template user project post deploy build test release "
+    "latency throughput memory thread process worker queue migration "
+    "schema field table row column join filter order page token session "
+    "component state render hook route form input error log metric trace "
+    "team review design pattern interface module package library version "
+    "data value result performance improve measure reduce increase simple "
+    "fast slow large small first next every new old better important"
+).split()
+
+ROLE_WEIGHTS = (("admin", 2), ("member", 70), ("viewer", 28))
+PARAGRAPHS = 1000
+
+
+def zipf_weights(count, exponent=1.1):
+    """Cumulative weights for ``count`` items, the first the most likely"""
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+class Generator:
+    def __init__(self, seed=0, prefix="seed", password="seedpass123", post_words=600):
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        # Hashed once, with a fixed salt so the rows are identical too
+        self.password_hash = make_password(password, salt=f"{prefix}{seed}")
+        self.post_words = post_words
+        self.tag_weights = zipf_weights(len(TAGS))
+        self.tech_weights = zipf_weights(len(TECHNOLOGIES))
+        self.paragraphs = [self.sentence_run(40, 120) for _ in range(PARAGRAPHS)]
+
+    def sentence_run(self, low, high):
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        sentences = [
+            " ".join(words[start : start + 12]).capitalize() + "."
+            for start in range(0, len(words), 12)
+        ]
+        return " ".join(sentences)
+
+    def timestamp(self, after=None):
+        start = after or EPOCH - SPAN
+        return start + (EPOCH - start) * self.rng.random()
+
+    def pick(self, items, weights, low, high):
+        """Up to ``high`` distinct items, drawn with ``weights``"""
+        count = self.rng.randint(low, high)
+        return list(
+            dict.fromkeys(self.rng.choices(items, cum_weights=weights, k=count))
+        )
+
+    def user(self, number):
+        first = self.rng.choice(FIRST_NAMES)
+        last = self.rng.choice(LAST_NAMES)
+        roles, weights = zip(*ROLE_WEIGHTS)
+        return get_user_model()(
+            username=f"{self.prefix}_{number}",
+            email=f"{self.prefix}_{number}@example.com",
+            password=self.password_hash,
+            first_name=first,
+            last_name=last,
+            bio=self.sentence_run(10, 40)[:500],
+            role=self.rng.choices(roles, weights)[0],
+            skills=", ".join(self.pick(TECHNOLOGIES, self.tech_weights, 0, 6)),
+            date_joined=self.timestamp(),
+        )
+
+    def post(self, author_id, joined):
+        words = max(20, int(self.rng.lognormvariate(math.log(self.post_words), 0.6)))
+        paragraphs = max(1, round(words / 80))
+        created = self.timestamp(joined)
+        post = Post(
+            author_id=author_id,
+            title=self.sentence_run(3, 10)[:255].rstrip("."),
+            content="\n\n".join(self.rng.choices(self.paragraphs, k=paragraphs)),
+            tags=", ".join(self.pick(TAGS, self.tag_weights, 0, 5)),
+            is_published=self.rng.random() < 0.9,
+            created_at=created,
+            updated_at=self.timestamp(created),
+        )
+        # bulk_create skips save(), which would fill these
+        post.refresh_summary()
+        return post
+
+    def project(self, owner_id, joined):
+        created = self.timestamp(joined)
+        slug = f"{self.prefix}-{self.rng.getrandbits(32):08x}"
+        return Project(
+            owner_id=owner_id,
+            title=self.sentence_run(2, 6)[:255].rstrip("."),
+            description="\n\n".join(self.rng.choices(self.paragraphs, k=2)),
+            tech_stack=", ".join(self.pick(TECHNOLOGIES, self.tech_weights, 1, 6)),
+            demo_link=(
+                f"https://{slug}.example.com" if self.rng.random() < 0.5 else None
+            ),
+            source_code=(
+                f"https://github.com/example/{slug}"
+                if self.rng.random() < 0.7
+                else None
+            ),
+            created_at=created,
+            updated_at=self.timestamp(created),
+        )
+
+
+def _batches(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield range(start, min(start + batch_size, total))
+
+
+def generate(
+    users,
+    posts,
+    projects,
+    seed=0,
+    prefix="seed",
+    password="seedpass123",
+    post_words=600,
+    batch_size=1000,
+    progress=None,
+):
+    """
+    Create ``users`` users, then ``posts`` posts and ``projects`` projects
+    written by the admins and members among them. ``progress(kind, done)``
+    is called after each batch.
+    """
+    User = get_user_model()
+    generator = Generator(seed, prefix, password, post_words)
+    progress = progress or (lambda kind, done: None)
+
+    # (id, date joined) of every user who can create content
+    authors = []
+    for numbers in _batches(users, batch_size):
+        with transaction.atomic():
+            created = bulk.create_keeping_timestamps(
+                User, [generator.user(number) for number in numbers]
+            )
+        authors.extend(
+            (user.pk, user.date_joined)
+            for user in created
+            if user.role != User.Role.VIEWER
+        )
+        progress("users", numbers.stop)
+    if not authors:
+        posts = projects = 0
+
+    weights = zipf_weights(len(authors), exponent=0.8)
+    # Authors are in join order; shuffle so the prolific are not all early
+    generator.rng.shuffle(authors)
+
+    def make(factory, count):
+        picked = generator.rng.choices(authors, cum_weights=weights, k=count)
+        return [factory(*author) for author in picked]
+
+    for numbers in _batches(posts, batch_size):
+        with transaction.atomic():
+            created = bulk.create_keeping_timestamps(
+                Post, make(generator.post, len(numbers))
+            )
+            Post.sync_tags_for(created)
+            search.index_instances(created)
+        progress("posts", numbers.stop)
+
+    for numbers in _batches(projects, batch_size):
+        with transaction.atomic():
+            created = bulk.create_keeping_timestamps(
+                Project, make(generator.project, len(numbers))
+            )
+            Project.sync_technologies_for(created)
+            search.index_instances(created)
+        progress("projects", numbers.stop)
+    stats.invalidate()
+
+
+def clear(prefix="seed", batch_size=1000):
+    """
+    Delete users created with ``prefix``, and their posts and projects.
+
+    Nothing about seeded rows needs the one-by-one cascade and delete
+    signals of ``QuerySet.delete``, so each table is emptied of them with
+    one ``DELETE`` (``_raw_delete``), links before the rows they point to;
+    the search index and technology counts are corrected in bulk first.
+    """
+    User = get_user_model()
+    users = User.objects.filter(username__startswith=f"{prefix}_")
+    posts = Post.objects.filter(author__in=users)
+    projects = Project.objects.filter(owner__in=users)
+
+    with transaction.atomic():
+        for kind, queryset in (("post", posts), ("project", projects)):
+            pks = queryset.values_list("pk", flat=True).iterator(batch_size)
+            for numbers in iter(lambda: list(islice(pks, batch_size)), []):
+                search.remove_ids(kind, numbers)
+        _uncount_technologies(ProjectTechnology.objects.filter(project__in=projects))
+
+        deleted = sum(
+            queryset._raw_delete(queryset.db)
+            for queryset in (
+                PostTag.objects.filter(post__in=posts),
+                ProjectTechnology.objects.filter(project__in=projects),
+                posts,
+                projects,
+                LogEntry.objects.filter(user__in=users),
+                User.groups.through.objects.filter(user__in=users),
+                User.user_permissions.through.objects.filter(user__in=users),
+                users,
+            )
+        )
+    stats.invalidate()
+    return deleted
+
+
+def _uncount_technologies(links):
+    """Take links about to be deleted off their technologies' project_count"""
+    by_amount = defaultdict(list)
+    counts = links.values_list("technology_id").annotate(amount=Count("pk"))
+    for pk, amount in counts.order_by():
+        by_amount[amount].append(pk)
+    for amount, pks in by_amount.items():
+        Technology.objects.filter(pk__in=pks).update(
+            project_count=F("project_count") - amount
+        )
@@ -15,18 +15,6 @@ from datetime import timedelta
 from pathlib import Path
 from typing import List
 
-import sentry_sdk
-from sentry_sdk.integrations.django import DjangoIntegration
-
-sentry_sdk.init(
-    dsn="https://120c0c0914244b4bc5b5c1bb9d48b757@o4510237949952000.ingest.de.sentry.io/4510237957554256",
-    integrations=[DjangoIntegration()],
-    # Add data like request headers and IP for users,
-    # see https://docs.sentry.io/platforms/python/data-management/data-collected/ for more info
-    traces_sample_rate=1.0,  # 1.0 = capture 100% of performance data (reduce in production)
-    send_default_pii=True,  # enables sending user info (optional)
-)
-
 
 def _cast_bool(v):
     if isinstance(v, bool):
@@ -65,13 +53,29 @@ def config(key, default=None, cast=None):
 
 
 import dj_database_url  # type: ignore
-from dotenv import load_dotenv  # type: ignore
 
 from django.core.management.utils import get_random_secret_key
 
+from .tracing import init_sentry
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-load_dotenv(BASE_DIR / ".env")
+# Only development checkouts have a .env; deployments set the environment
+if (BASE_DIR / ".env").exists():
+    from dotenv import load_dotenv  # type: ignore
+
+    load_dotenv(BASE_DIR / ".env")
+
+SENTRY_DSN = os.getenv(
+    "SENTRY_DSN",
+    "https://120c0c0914244b4bc5b5c1bb9d48b757@o4510237949952000.ingest.de.sentry.io/4510237957554256",
+)
+# Start Sentry once the apps are loaded, and only in processes that serve
+# requests or run jobs, rather than here in every manage.py command (see
+# project.tracing); False starts it here, before anything else is imported
+LAZY_STARTUP = config("LAZY_STARTUP", default=True, cast=_cast_bool)
+if not LAZY_STARTUP:
+    init_sentry(SENTRY_DSN)
 
 
 SECRET_KEY = os.getenv("SECRET_KEY", "django-insecure-fallback-key")
@@ -111,23 +115,55 @@ INSTALLED_APPS = [
     "corsheaders",
     "rest_framework_simplejwt",
     "django_filters",
-    "django_extensions",
     "users",
     "blog",
+    "jobs",
+    # Project-wide management commands (bench, seed_scale, ...)
+    "project",
 ]
+# Development tools, left out with DEBUG off so deployed workers boot faster
+if DEBUG:
+    INSTALLED_APPS += ["django_extensions"]
 AUTH_USER_MODEL = "users.User"
 
 MIDDLEWARE = [
+    "project.middleware.MetricsMiddleware",
+    "project.middleware.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "project.db.replicas.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Opt-in N+1 query detection (see project.middleware)
+QUERY_INSPECTOR_ENABLED = config(
+    "QUERY_INSPECTOR_ENABLED", default=False, cast=_cast_bool
+)
+QUERY_INSPECTOR_REPEAT_THRESHOLD = config(
+    "QUERY_INSPECTOR_REPEAT_THRESHOLD", default=5, cast=int
+)
+QUERY_INSPECTOR_RAISE = config("QUERY_INSPECTOR_RAISE", default=DEBUG, cast=_cast_bool)
+if QUERY_INSPECTOR_ENABLED:
+    MIDDLEWARE.append("project.middleware.QueryInspectorMiddleware")
+
+# Share of requests that get a Server-Timing header and timing log line
+# (see project.timing); 0 disables timing entirely
+SERVER_TIMING_SAMPLE_RATE = config("SERVER_TIMING_SAMPLE_RATE", default=1.0, cast=float)
+
+# Prometheus metrics at /metrics/ (see project.metrics). Point METRICS_DIR
+# at a directory shared by all gunicorn workers to aggregate across them;
+# set METRICS_TOKEN to require "Authorization: Bearer <token>" to scrape.
+# Without a token only admins can read it, unless DEBUG is on.
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=_cast_bool)
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=1.0, cast=float)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 ROOT_URLCONF = "project.urls"
 
 
@@ -153,9 +189,7 @@ else:
     SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",  # Change to AllowAny for public access
     ],
@@ -164,9 +198,62 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "project.timing.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Dashboard/admin statistics cache (see blog.stats)
+STATS_CACHE_TTL = config("STATS_CACHE_TTL", default=30, cast=int)
+STATS_CACHE_STALE_TTL = config("STATS_CACHE_STALE_TTL", default=300, cast=int)
+
+# Authenticated users are read from a per-process cache, then the shared cache,
+# before the database (see users.authentication); a TTL of 0 disables a level.
+# The shared level is skipped while CACHE_BACKEND is per-process (LocMemCache)
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=300, cast=int)
+AUTH_USER_LOCAL_CACHE_TTL = config("AUTH_USER_LOCAL_CACHE_TTL", default=2, cast=int)
+
+# Refresh-token revocation (see users.revocation): Bloom filter sizing, how
+# often workers pick up each other's revocations, and how often expired
+# entries are pruned and the filter rebuilt
+TOKEN_REVOCATION_CAPACITY = config(
+    "TOKEN_REVOCATION_CAPACITY", default=100000, cast=int
+)
+TOKEN_REVOCATION_ERROR_RATE = config(
+    "TOKEN_REVOCATION_ERROR_RATE", default=0.001, cast=float
+)
+TOKEN_REVOCATION_SYNC_INTERVAL = config(
+    "TOKEN_REVOCATION_SYNC_INTERVAL", default=1.0, cast=float
+)
+TOKEN_REVOCATION_REBUILD_INTERVAL = config(
+    "TOKEN_REVOCATION_REBUILD_INTERVAL", default=3600, cast=int
+)
+
+# Route public read-only endpoints to their async views (see
+# project.async_views); only worth it when serving through project.asgi
+ASYNC_READ_VIEWS = config("ASYNC_READ_VIEWS", default=False, cast=_cast_bool)
+
+# Serve list endpoints from values() rows (see project.values_serializers)
+FAST_LIST_SERIALIZERS = config("FAST_LIST_SERIALIZERS", default=True, cast=_cast_bool)
+
+# Cursor pagination for blog listings (see blog.pagination)
+API_PAGE_SIZE = config("API_PAGE_SIZE", default=20, cast=int)
+API_MAX_PAGE_SIZE = config("API_MAX_PAGE_SIZE", default=100, cast=int)
+
+# Most operations accepted by one bulk request (see blog.bulk)
+BULK_MAX_ITEMS = config("BULK_MAX_ITEMS", default=100, cast=int)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -215,6 +302,14 @@ CORS_ALLOW_CREDENTIALS = True
 MEDIA_URL = "/media/"
 MEDIA_ROOT = str(BASE_DIR / "media")
 
+# Resized WebP/JPEG copies of uploaded images (see project.images)
+IMAGE_VARIANT_WIDTHS = [
+    int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")
+]
+IMAGE_VARIANT_QUALITY = config("IMAGE_VARIANT_QUALITY", default=80, cast=int)
+IMAGE_VARIANTS_ASYNC = config("IMAGE_VARIANTS_ASYNC", default=True, cast=_cast_bool)
+IMAGE_VARIANT_WORKERS = config("IMAGE_VARIANT_WORKERS", default=2, cast=int)
+
 STATIC_URL = "/static/"
 STATIC_ROOT = str(BASE_DIR / "staticfiles")
 
@@ -247,6 +342,42 @@ else:
         }
     }
 
+# Read replicas for safe requests (see project.db.replicas): comma-separated
+# database URLs, each added as "replica_<n>"
+for number, url in enumerate(
+    filter(None, map(str.strip, os.getenv("DATABASE_REPLICA_URLS", "").split(","))),
+    start=1,
+):
+    # Tests read and write the primary's test database through the replicas
+    DATABASES[f"replica_{number}"] = dict(
+        dj_database_url.parse(url), TEST={"MIRROR": "default"}
+    )
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+DATABASE_ROUTERS = ["project.db.replicas.ReplicaRouter"]
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+REPLICA_RETRY_AFTER = config("REPLICA_RETRY_AFTER", default=30.0, cast=float)
+
+# Per-worker connection pool (see project.db.pool); the pooled backends
+# return connections to it when Django closes them at the end of a request.
+# Set DB_POOL_ENABLED=False to connect per request as Django does by default.
+DB_POOL_ENABLED = config("DB_POOL_ENABLED", default=True, cast=_cast_bool)
+DB_POOL_MIN_SIZE = config("DB_POOL_MIN_SIZE", default=1, cast=int)
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", default=10, cast=int)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=10.0, cast=float)
+DB_POOL_CHECK_AFTER = config("DB_POOL_CHECK_AFTER", default=1.0, cast=float)
+DB_POOL_MAX_IDLE = config("DB_POOL_MAX_IDLE", default=300.0, cast=float)
+DB_POOL_MAX_LIFETIME = config("DB_POOL_MAX_LIFETIME", default=3600.0, cast=float)
+DB_POOL_MAINTAIN_INTERVAL = config("DB_POOL_MAINTAIN_INTERVAL", default=5.0, cast=float)
+POOLED_DATABASE_ENGINES = {
+    "django.db.backends.postgresql": "project.db.postgresql",
+    "django.db.backends.sqlite3": "project.db.sqlite3",
+}
+if DB_POOL_ENABLED:
+    for database in DATABASES.values():
+        database["ENGINE"] = POOLED_DATABASE_ENGINES.get(
+            database["ENGINE"], database["ENGINE"]
+        )
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -278,6 +409,36 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# Background jobs (see jobs.queue). With JOBS_EXTERNAL_WORKER on, `manage.py
+# run_worker` must run alongside the web service; off, each web process runs
+# jobs on a background thread, polling for retries every
+# JOBS_EMBEDDED_POLL_INTERVAL seconds
+JOBS_EXTERNAL_WORKER = config("JOBS_EXTERNAL_WORKER", default=False, cast=_cast_bool)
+JOBS_EMBEDDED_POLL_INTERVAL = config(
+    "JOBS_EMBEDDED_POLL_INTERVAL", default=5.0, cast=float
+)
+JOBS_MAX_ATTEMPTS = config("JOBS_MAX_ATTEMPTS", default=5, cast=int)
+JOBS_RETRY_BACKOFF = config("JOBS_RETRY_BACKOFF", default=5, cast=float)
+JOBS_RETRY_BACKOFF_MAX = config("JOBS_RETRY_BACKOFF_MAX", default=3600, cast=float)
+JOBS_LEASE_SECONDS = config("JOBS_LEASE_SECONDS", default=300, cast=int)
+JOBS_RETENTION_DAYS = config("JOBS_RETENTION_DAYS", default=7, cast=int)
+
+# Micro-benchmarks (see project.bench); `manage.py bench` fails when a
+# benchmark is this many percent slower than the saved baseline
+BENCH_REGRESSION_THRESHOLD = config(
+    "BENCH_REGRESSION_THRESHOLD", default=20.0, cast=float
+)
+BENCH_BASELINE = config(
+    "BENCH_BASELINE", default=str(BASE_DIR / "benchmarks" / "baseline.json")
+)
+
+# Milliseconds a server process may take to import its application (see
+# project.startup); `manage.py profile_startup` fails when boot is slower.
+# Off (0) by default: a wsgi boot measured 0.37 s on one machine and 1.04 s
+# on another, so set it from profile_startup's own numbers on the machine
+# that enforces it, with headroom (about twice the median)
+BOOT_TIME_BUDGET_MS = config("BOOT_TIME_BUDGET_MS", default=0, cast=float)
+
 # Frontend URL for password reset emails
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
@@ -0,0 +1,112 @@
+"""
+How long a fresh process takes to boot the application, for
+``manage.py profile_startup``.
+
+Every measurement runs in a new interpreter, since imports are only slow
+the first time. ``boot_times`` times the import of a target in ``runs``
+children:
+
+- ``wsgi`` and ``asgi`` import ``project.wsgi`` or ``project.asgi``, as a
+  server worker does, including the Sentry start-up that follows app
+  loading;
+- ``setup`` only runs ``django.setup()``, as a management command does.
+
+Times exclude the interpreter's own start-up, which no change here can
+affect. ``import_times`` runs the target once more under
+``python -X importtime`` and returns what each module took to import;
+``by_package`` adds those up per top-level package.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+
+TARGETS = {
+    "wsgi": "import project.wsgi",
+    "asgi": "import project.asgi",
+    "setup": "import django; django.setup()",
+}
+
+TIMED = """
+import time
+start = time.perf_counter()
+{statement}
+print((time.perf_counter() - start) * 1000)
+"""
+
+# "import time:  self [us] | cumulative | imported package", indented by depth
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class StartupError(Exception):
+    pass
+
+
+@dataclass
+class Import:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+    @property
+    def package(self):
+        return self.module.split(".")[0]
+
+
+def _run(target, *flags):
+    if target not in TARGETS:
+        raise StartupError(f"Unknown target {target!r}.")
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE=os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "project.settings"
+        ),
+    )
+    statement = TIMED.format(statement=TARGETS[target])
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", statement],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise StartupError(f"Booting {target} failed:\n{result.stderr.strip()[-2000:]}")
+    return result
+
+
+def boot_times(target="wsgi", runs=5):
+    """Milliseconds each of ``runs`` fresh processes took to boot ``target``"""
+    return [float(_run(target).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def import_times(target="wsgi"):
+    """Every module imported while booting ``target``, in import order"""
+    imports = []
+    for line in _run(target, "-X", "importtime").stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append(
+                Import(
+                    module,
+                    int(self_us) / 1000,
+                    int(cumulative_us) / 1000,
+                    len(indent) // 2,
+                )
+            )
+    return imports
+
+
+def by_package(imports):
+    """Total milliseconds spent importing each top-level package"""
+    totals = defaultdict(float)
+    for entry in imports:
+        totals[entry.package] += entry.self_ms
+    return dict(totals)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from . import bench
+
+
+class BenchTest(TestCase):
+    """Test the micro-benchmark runner and baseline comparison"""
+
+    def test_run_times_every_benchmark_at_every_size(self):
+        """Test each benchmark gets a result per dataset size"""
+        results = bench.run([5, 10], repeat=1, min_time=0)
+
+        self.assertEqual(
+            set(results),
+            {bench.key(name, size) for name in bench.BENCHMARKS for size in (5, 10)},
+        )
+        for result in results.values():
+            self.assertGreater(result["seconds"], 0)
+            self.assertLessEqual(result["seconds"], result["median"])
+
+    def test_private_cache_leaves_the_configured_cache_alone(self):
+        """Test benchmarks clear a cache of their own, not the real one"""
+        cache.set("bench-test", "kept")
+
+        with bench.private_cache():
+            self.assertIsNone(cache.get("bench-test"))
+            bench.reset()
+
+        self.assertEqual(cache.get("bench-test"), "kept")
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        """Test only slowdowns above the threshold count as regressions"""
+        baseline = {"a@1": {"seconds": 1.0}, "b@1": {"seconds": 1.0}}
+        results = {
+            "a@1": {"seconds": 1.1},
+            "b@1": {"seconds": 1.3},
+            "c@1": {"seconds": 5.0},
+        }
+
+        rows = {row[0]: row for row in bench.compare(results, baseline, 20)}
+
+        self.assertFalse(rows["a@1"][4])
+        self.assertTrue(rows["b@1"][4])
+        self.assertAlmostEqual(rows["b@1"][3], 30)
+        self.assertEqual(rows["c@1"], ("c@1", None, 5.0, None, False))
+
+    def test_baseline_round_trip(self):
+        """Test saved baselines load back with their results"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "baseline.json")
+        results = {"a@1": {"seconds": 0.5, "median": 0.6}}
+
+        bench.save_baseline(path, results)
+
+        self.assertEqual(bench.load_baseline(path), results)
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, override_settings
+
+from . import metrics
+from .db import pool as db_pool
+from .db.pool import ConnectionPool, PoolTimeout, get_pool
+from .db.sqlite3.base import DatabaseWrapper
+
+
+def check(conn):
+    conn.execute("SELECT 1")
+
+
+def reset(conn):
+    if conn.in_transaction:
+        conn.rollback()
+    return True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "pool.sqlite3")
+        self.opened = 0
+        store_patch = mock.patch.object(metrics, "_store", None)
+        store_patch.start()
+        self.addCleanup(store_patch.stop)
+
+    def connect(self):
+        self.opened += 1
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def make_pool(self, **kwargs):
+        pool = ConnectionPool("default", check, reset, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_reuses_returned_connections(self):
+        """Test a checked in connection is handed out again without connecting"""
+        pool = self.make_pool()
+        first = pool.checkout(self.connect)
+        pool.checkin(first)
+
+        self.assertIs(pool.checkout(self.connect), first)
+        self.assertEqual(self.opened, 1)
+        self.assertEqual(
+            pool.stats(), {"size": 1, "idle": 0, "in_use": 1, "max_size": 10}
+        )
+
+    def test_waits_for_a_connection_then_times_out(self):
+        """Test checkouts beyond max_size wait for a checkin, then give up"""
+        pool = self.make_pool(max_size=1, timeout=1.0)
+        held = pool.checkout(self.connect)
+        threading.Timer(0.05, pool.checkin, [held]).start()
+
+        self.assertIs(pool.checkout(self.connect), held)
+
+        pool.timeout = 0.01
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(self.connect)
+        self.assertEqual(self.opened, 1)
+
+    def test_replaces_connections_that_fail_the_health_check(self):
+        """Test an idle connection that fails its ping is closed and replaced"""
+        pool = self.make_pool(check_after=0)
+        broken = pool.checkout(self.connect)
+        pool.checkin(broken)
+        broken.close()
+
+        replacement = pool.checkout(self.connect)
+
+        self.assertIsNot(replacement, broken)
+        self.assertEqual(self.opened, 2)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_skips_health_check_for_recently_used_connections(self):
+        """Test connections returned within check_after are not pinged"""
+        checks = []
+        pool = ConnectionPool("default", checks.append, reset, check_after=60)
+        self.addCleanup(pool.close)
+        pool.checkin(pool.checkout(self.connect))
+        pool.checkout(self.connect)
+
+        self.assertEqual(checks, [])
+
+    def test_rolls_back_open_transactions_on_checkin(self):
+        """Test a connection returned mid-transaction is rolled back"""
+        pool = self.make_pool()
+        conn = pool.checkout(self.connect)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        self.assertTrue(conn.in_transaction)
+
+        pool.checkin(conn)
+
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone(), (0,))
+
+    def test_discards_connections_reset_rejects(self):
+        """Test connections the backend cannot reset are closed"""
+        pool = ConnectionPool("default", check, lambda conn: False)
+        conn = pool.checkout(self.connect)
+        pool.checkin(conn)
+
+        self.assertEqual(pool.stats()["size"], 0)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_maintain_recycles_idle_and_tops_up_to_min_size(self):
+        """Test idle connections above min_size are closed, and min_size kept"""
+        pool = self.make_pool(min_size=1, max_idle=0)
+        conns = [pool.checkout(self.connect) for _ in range(3)]
+        for conn in conns:
+            pool.checkin(conn)
+
+        pool.maintain(self.connect)
+        self.assertEqual(pool.stats()["size"], 1)
+
+        pool.max_lifetime = 0
+        pool.maintain(self.connect)
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["idle"]), (1, 1))
+        self.assertEqual(self.opened, 4)
+
+    def test_records_metrics(self):
+        """Test pool wait, busy time and connection churn are exported"""
+        pool = self.make_pool(check_after=0)
+        conn = pool.checkout(self.connect)
+        pool.checkin(conn)
+        conn.close()
+        pool.checkout(self.connect)
+
+        series = metrics.get_store().collect()
+        labels = (("database", "default"),)
+        self.assertEqual(series[("db_pool_wait_seconds", labels)][-1], 2)
+        self.assertIn(("db_pool_busy_seconds_total", labels), series)
+        self.assertEqual(
+            series[
+                (
+                    "db_pool_connections_opened_total",
+                    (("database", "default"), ("reason", "checkout")),
+                )
+            ],
+            [2],
+        )
+        self.assertEqual(
+            series[
+                (
+                    "db_pool_connections_closed_total",
+                    (("database", "default"), ("reason", "unhealthy")),
+                )
+            ],
+            [1],
+        )
+
+    def test_get_pool_starts_fresh_after_fork(self):
+        """Test a forked worker builds its own pools"""
+        pool = get_pool("fork-test", {"database": self.path}, check, reset)
+        self.addCleanup(db_pool.close_pools, "fork-test")
+        self.assertIs(
+            get_pool("fork-test", {"database": self.path}, check, reset), pool
+        )
+
+        with mock.patch.object(db_pool.os, "getpid", return_value=-1):
+            child = get_pool("fork-test", {"database": self.path}, check, reset)
+            self.addCleanup(db_pool.close_pools, "fork-test")
+
+        self.assertIsNot(child, pool)
+        self.assertIn(pool, db_pool._inherited)
+
+
+class PooledBackendTest(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.settings_dict = dict(
+            connection.settings_dict,
+            ENGINE="project.db.sqlite3",
+            NAME=os.path.join(self.tmp.name, "backend.sqlite3"),
+        )
+        self.addCleanup(db_pool.close_pools, "pooled")
+
+    def wrapper(self):
+        wrapper = DatabaseWrapper(self.settings_dict, alias="pooled")
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_close_returns_connection_to_the_pool(self):
+        """Test closing a wrapper lets the next wrapper reuse its connection"""
+        first = self.wrapper()
+        first.ensure_connection()
+        raw = first.connection
+        first.close()
+        self.assertIsNone(first.connection)
+
+        second = self.wrapper()
+        with second.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertIs(second.connection, raw)
+
+    @override_settings(DB_POOL_MAX_SIZE=1, DB_POOL_TIMEOUT=0.01)
+    def test_pool_timeout_is_a_database_error(self):
+        """Test an exhausted pool raises django.db.OperationalError"""
+        self.wrapper().ensure_connection()
+
+        with self.assertRaises(OperationalError):
+            self.wrapper().ensure_connection()
+
+    def test_in_memory_databases_are_not_pooled(self):
+        """Test the in-memory test database keeps Django's own handling"""
+        wrapper = DatabaseWrapper(
+            dict(self.settings_dict, NAME=":memory:"), alias="pooled"
+        )
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+
+        self.assertIsNone(wrapper._pool)
@@ -0,0 +1,217 @@
+import os
+import re
+import subprocess
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from rest_framework.test import APITestCase, override_settings
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+
+from blog.models import Post
+
+from . import metrics
+from .middleware import MetricsMiddleware
+
+User = get_user_model()
+
+
+def sample(text, name, **labels):
+    """Return the value of one exposition line, or None"""
+    for line in text.splitlines():
+        match = re.match(rf"{name}\{{(.*)\}} (\S+)$", line)
+        if match and all(f'{k}="{v}"' in match.group(1) for k, v in labels.items()):
+            return float(match.group(2))
+    return None
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, METRICS_TOKEN="secret")
+class MetricsTest(APITestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_patch = override_settings(METRICS_DIR=self.tmp.name)
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+        store_patch = mock.patch.object(metrics, "_store", None)
+        store_patch.start()
+        self.addCleanup(store_patch.stop)
+
+        author = User.objects.create_user(
+            username="author", email="author@example.com", password="testpass123"
+        )
+        Post.objects.create(
+            author=author, title="Post", content="Content", is_published=True
+        )
+
+    def scrape(self):
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_records_viewset_and_function_actions(self):
+        """Test requests are labelled by viewset action or view function"""
+        self.client.get(reverse("blog:post-list"))
+        self.client.get(reverse("blog:post-list"))
+        self.client.get(reverse("blog:post-featured"))
+        self.client.get(reverse("blog:search-content") + "?q=post")
+
+        text = self.scrape()
+
+        self.assertEqual(
+            sample(text, "http_request_duration_seconds_count", action="list"), 2
+        )
+        self.assertEqual(
+            sample(text, "http_request_duration_seconds_count", action="featured"), 1
+        )
+        self.assertEqual(
+            sample(
+                text, "http_request_duration_seconds_count", action="search_content"
+            ),
+            1,
+        )
+        self.assertEqual(
+            sample(
+                text,
+                "http_requests_total",
+                route="blog:post-list",
+                action="list",
+                status="200",
+            ),
+            2,
+        )
+        # The metrics endpoint does not record itself
+        self.assertNotIn('route="metrics"', text)
+
+    def test_histograms_are_cumulative(self):
+        """Test bucket counts, query counts and response sizes"""
+        response = self.client.get(reverse("blog:post-list"))
+
+        text = self.scrape()
+
+        self.assertEqual(
+            sample(text, "http_request_db_queries_bucket", action="list", le="0.0"),
+            0,
+        )
+        self.assertEqual(
+            sample(text, "http_request_db_queries_bucket", action="list", le="1.0"),
+            1,
+        )
+        self.assertEqual(
+            sample(text, "http_request_db_queries_bucket", action="list", le="+Inf"),
+            1,
+        )
+        self.assertEqual(
+            sample(text, "http_response_size_bytes_sum", action="list"),
+            len(response.content),
+        )
+
+    def test_aggregates_across_processes(self):
+        """Test series written by other workers are summed into the scrape"""
+        other = metrics.MetricsStore(self.tmp.name)
+        for _ in range(3):
+            other.observe(
+                "http_request_duration_seconds",
+                {"route": "blog:post-list", "action": "list", "method": "GET"},
+                0.2,
+            )
+        other.flush()
+        self.client.get(reverse("blog:post-list"))
+
+        text = self.scrape()
+
+        self.assertEqual(
+            sample(
+                text,
+                "http_request_duration_seconds_count",
+                route="blog:post-list",
+                action="list",
+            ),
+            4,
+        )
+        self.assertEqual(
+            sample(
+                text, "http_request_duration_seconds_bucket", action="list", le="0.1"
+            ),
+            1,
+        )
+
+    def test_exited_workers_are_retired(self):
+        """Test files of exited workers are folded into one, keeping counts"""
+        exited = subprocess.Popen(["true"])
+        exited.wait()
+        other = metrics.MetricsStore(self.tmp.name)
+        other.inc("jobs_total", {"job": "send_email", "status": "succeeded"}, 2)
+        other.flush()
+        os.rename(other.path, os.path.join(self.tmp.name, f"{exited.pid}-0.json"))
+        with open(os.path.join(self.tmp.name, f"{exited.pid}-1.json.tmp"), "w"):
+            pass
+
+        for _ in range(2):
+            text = self.scrape()
+            self.assertEqual(sample(text, "jobs_total", job="send_email"), 2)
+        self.assertEqual(
+            sorted(
+                name
+                for name in os.listdir(self.tmp.name)
+                if not name.startswith(str(os.getpid()))
+            ),
+            [".lock", "retired.json"],
+        )
+
+    def test_token_required(self):
+        """Test METRICS_TOKEN protects the endpoint"""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_admin_required_without_token(self):
+        """Test only admins can read metrics when no token is configured"""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+        admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            role=User.Role.ADMIN,
+        )
+        self.client.force_login(admin)
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+        with override_settings(DEBUG=True):
+            self.client.logout()
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+    def test_async_view_queries_are_counted(self):
+        """Test queries an async view runs on other threads are counted"""
+
+        def select_one():
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            finally:
+                connection.close()
+
+        async def view(request):
+            await User.objects.acount()
+            await sync_to_async(select_one, thread_sensitive=False)()
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(view)
+        with mock.patch("project.middleware.record_request") as record_request:
+            response = async_to_sync(middleware)(AsyncRequestFactory().get("/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(record_request.call_args.args[5], 2)
@@ -0,0 +1,277 @@
+from unittest import mock
+
+from rest_framework.test import APIClient, APITestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import modify_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Post, Project
+from users.authentication import cache_user
+
+from .middleware import NPlusOneError
+
+User = get_user_model()
+
+# Dataset sizes every endpoint is measured at; counts must not grow between them
+SIZES = (3, 30)
+
+
+@override_settings(
+    APPEND_SLASH=False,
+    SECURE_SSL_REDIRECT=False,
+    QUERY_INSPECTOR_RAISE=True,
+    QUERY_INSPECTOR_REPEAT_THRESHOLD=3,
+)
+@modify_settings(MIDDLEWARE={"append": "project.middleware.QueryInspectorMiddleware"})
+class QueryBudgetTest(APITestCase):
+    """Pin the number of SQL queries each API endpoint may run"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            role=User.Role.ADMIN,
+        )
+        self.member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="memberpass123",
+            role=User.Role.MEMBER,
+        )
+        self.size = 0
+
+    def grow_to(self, size):
+        """Add members, posts and projects until there are ``size`` of each"""
+        for i in range(self.size, size):
+            user = User.objects.create(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                first_name="User",
+                last_name=str(i),
+            )
+            for author in (self.member, user):
+                Post.objects.create(
+                    author=author,
+                    title=f"Post {i}",
+                    content="Some searchable post content",
+                    tags=f"tag{i}, common",
+                )
+                Project.objects.create(
+                    owner=author,
+                    title=f"Project {i}",
+                    description="Some searchable project",
+                    tech_stack=f"Tech{i}, Python",
+                )
+        self.size = size
+
+    def authenticate_user(self, user):
+        """Helper method to authenticate a user"""
+        if user is None:
+            self.client.credentials()
+            return
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def assertQueryBudget(self, budget, method, url, user=None, data=None):
+        """Run one request at every dataset size against ``budget``"""
+        counts = []
+        for size in SIZES:
+            self.grow_to(size)
+            self.authenticate_user(user)
+            cache.clear()
+            if user is not None:
+                # Budgets assume the steady state: request.user is cached
+                cache_user(User.objects.get(pk=user.pk))
+            target = url() if callable(url) else url
+
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method)(target, data, format="json")
+
+            self.assertLess(response.status_code, 400, response.data)
+            counts.append(len(queries))
+
+        self.assertEqual(len(set(counts)), 1, f"{url}: queries grew {counts}")
+        self.assertLessEqual(counts[0], budget, f"{url}: {counts[0]} > {budget}")
+
+    def latest_post(self):
+        return Post.objects.filter(author=self.member).latest("id")
+
+    def latest_project(self):
+        return Project.objects.filter(owner=self.member).latest("id")
+
+    # Blog: projects
+
+    def test_project_list(self):
+        self.assertQueryBudget(1, "get", reverse("blog:project-list"))
+
+    def test_project_detail(self):
+        self.assertQueryBudget(
+            1,
+            "get",
+            lambda: reverse("blog:project-detail", args=[self.latest_project().pk]),
+        )
+
+    def test_project_featured(self):
+        self.assertQueryBudget(1, "get", reverse("blog:project-featured"))
+
+    def test_project_technologies(self):
+        self.assertQueryBudget(1, "get", reverse("blog:project-technologies"))
+
+    def test_my_projects(self):
+        self.assertQueryBudget(
+            1, "get", reverse("blog:project-my-projects"), user=self.member
+        )
+
+    def test_project_create(self):
+        self.assertQueryBudget(
+            8,
+            "post",
+            reverse("blog:project-list"),
+            user=self.member,
+            data={"title": "New", "description": "New", "tech_stack": "A, B"},
+        )
+
+    def test_project_update(self):
+        self.assertQueryBudget(
+            14,
+            "patch",
+            lambda: reverse("blog:project-detail", args=[self.latest_project().pk]),
+            user=self.member,
+            data={"tech_stack": "Go, Rust"},
+        )
+
+    def test_project_delete(self):
+        self.assertQueryBudget(
+            7,
+            "delete",
+            lambda: reverse("blog:project-detail", args=[self.latest_project().pk]),
+            user=self.member,
+        )
+
+    # Blog: posts
+
+    def test_post_list(self):
+        self.assertQueryBudget(1, "get", reverse("blog:post-list"))
+
+    def test_post_detail(self):
+        self.assertQueryBudget(
+            1,
+            "get",
+            lambda: reverse("blog:post-detail", args=[self.latest_post().pk]),
+        )
+
+    def test_post_featured(self):
+        self.assertQueryBudget(1, "get", reverse("blog:post-featured"))
+
+    def test_post_tags(self):
+        self.assertQueryBudget(1, "get", reverse("blog:post-tags"))
+
+    def test_my_posts(self):
+        self.assertQueryBudget(
+            1, "get", reverse("blog:post-my-posts"), user=self.member
+        )
+
+    def test_post_create(self):
+        self.assertQueryBudget(
+            7,
+            "post",
+            reverse("blog:post-list"),
+            user=self.member,
+            data={"title": "New", "content": "New", "tags": "a, b"},
+        )
+
+    def test_post_update(self):
+        self.assertQueryBudget(
+            10,
+            "patch",
+            lambda: reverse("blog:post-detail", args=[self.latest_post().pk]),
+            user=self.member,
+            data={"tags": "c, d"},
+        )
+
+    def test_post_delete(self):
+        self.assertQueryBudget(
+            4,
+            "delete",
+            lambda: reverse("blog:post-detail", args=[self.latest_post().pk]),
+            user=self.member,
+        )
+
+    def test_post_toggle_publish(self):
+        self.assertQueryBudget(
+            5,
+            "post",
+            lambda: reverse("blog:post-toggle-publish", args=[self.latest_post().pk]),
+            user=self.member,
+        )
+
+    # Blog: function views
+
+    def test_search_content(self):
+        self.assertQueryBudget(4, "get", reverse("blog:search-content") + "?q=search")
+
+    def test_dashboard_stats(self):
+        self.assertQueryBudget(3, "get", reverse("blog:dashboard-stats"))
+
+    def test_admin_stats(self):
+        self.assertQueryBudget(3, "get", reverse("blog:admin-stats"), user=self.admin)
+
+    # Users
+
+    def test_user_list(self):
+        self.assertQueryBudget(1, "get", reverse("users:user-list"), user=self.admin)
+
+    def test_user_members(self):
+        self.assertQueryBudget(1, "get", reverse("users:user-members"))
+
+    def test_user_detail(self):
+        self.assertQueryBudget(
+            1, "get", reverse("users:user-detail", args=[self.member.pk])
+        )
+
+    def test_user_profile(self):
+        self.assertQueryBudget(
+            0, "get", reverse("users:user-profile"), user=self.member
+        )
+
+    def test_user_change_role(self):
+        self.assertQueryBudget(
+            2,
+            "post",
+            reverse("users:user-change-role", args=[self.member.pk]),
+            user=self.admin,
+            data={"role": User.Role.MEMBER},
+        )
+
+    def test_user_toggle_active(self):
+        self.assertQueryBudget(
+            2,
+            "post",
+            reverse("users:user-toggle-active", args=[self.member.pk]),
+            user=self.admin,
+        )
+
+    def test_admin_statistics(self):
+        self.assertQueryBudget(
+            5, "get", reverse("users:admin-statistics"), user=self.admin
+        )
+
+    def test_detector_raises_on_n_plus_one(self):
+        """Test the middleware flags a view that queries once per row"""
+        self.grow_to(SIZES[0])
+
+        def get_full_name(user):
+            # Simulate a lazy relation that refetches on every access
+            return User.objects.get(pk=user.pk).first_name
+
+        with mock.patch.object(User, "get_full_name", get_full_name):
+            with override_settings(FAST_LIST_SERIALIZERS=False):
+                with self.assertRaises(NPlusOneError):
+                    self.client.get(reverse("blog:post-list"))
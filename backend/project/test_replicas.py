@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import tempfile
+
+from asgiref.sync import async_to_sync
+from rest_framework import status
+from rest_framework.test import APIClient, APITransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.utils import load_backend
+from django.test import AsyncClient
+from django.urls import reverse
+
+from blog.models import Post
+
+from .db import replicas
+from .db.pool import close_pools
+
+User = get_user_model()
+
+
+@override_settings(
+    APPEND_SLASH=False, SECURE_SSL_REDIRECT=False, DATABASE_REPLICAS=["replica_1"]
+)
+class ReplicaRoutingTest(APITransactionTestCase):
+    """Test reads are routed to a replica standing in as a stale SQLite copy"""
+
+    def setUp(self):
+        cache.clear()
+        self.member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="memberpass123",
+            role=User.Role.MEMBER,
+        )
+        Post.objects.create(
+            author=self.member, title="Replicated", content="x", is_published=True
+        )
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.replica_path = os.path.join(tmp.name, "replica.sqlite3")
+        primary = connections["default"]
+        primary.ensure_connection()
+        snapshot = sqlite3.connect(self.replica_path)
+        primary.connection.backup(snapshot)
+        snapshot.close()
+        self.use_replica(self.replica_path)
+        self.addCleanup(self.remove_replica)
+
+        # Only the primary has this one, as if replication lagged behind
+        Post.objects.create(
+            author=self.member, title="Fresh", content="x", is_published=True
+        )
+
+    def use_replica(self, name):
+        primary = connections["default"]
+        backend = load_backend(primary.settings_dict["ENGINE"])
+        replica = backend.DatabaseWrapper(
+            dict(primary.settings_dict, NAME=name), "replica_1"
+        )
+        # Set on the handler only, as DATABASES cannot change during tests
+        connections["replica_1"] = replica
+
+    def remove_replica(self):
+        connections["replica_1"].close()
+        del connections["replica_1"]
+        close_pools("replica_1")
+        replicas._down_until.clear()
+
+    def titles(self, client=None):
+        response = (client or self.client).get(reverse("blog:post-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {post["title"] for post in response.data["results"]}
+
+    def authenticate(self, client, user):
+        refresh = RefreshToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_safe_requests_read_from_replica(self):
+        """Test anonymous list requests see the replica's data"""
+        self.assertEqual(self.titles(), {"Replicated"})
+
+    def test_writer_reads_own_writes_from_primary(self):
+        """Test a user who wrote is pinned to the primary, others are not"""
+        self.authenticate(self.client, self.member)
+        response = self.client.post(
+            reverse("blog:post-list"),
+            {"title": "Mine", "content": "x", "is_published": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.titles(), {"Replicated", "Fresh", "Mine"})
+        self.assertEqual(self.titles(APIClient()), {"Replicated"})
+
+    def test_pin_expires(self):
+        """Test a pinned user goes back to the replica once the pin expires"""
+        self.authenticate(self.client, self.member)
+        replicas.pin(self.member.pk)
+        self.assertIn("Fresh", self.titles())
+
+        cache.clear()
+        self.assertEqual(self.titles(), {"Replicated"})
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        """Test reads go to the primary while a replica cannot be reached"""
+        self.use_replica(os.path.join(self.replica_path, "missing", "replica.sqlite3"))
+
+        with self.assertLogs("project.replicas", "WARNING"):
+            self.assertEqual(self.titles(), {"Replicated", "Fresh"})
+        self.assertIn("replica_1", replicas._down_until)
+
+    def test_async_stack_reads_from_replica(self):
+        """Test the middleware routes requests served through ASGI as well"""
+        response = async_to_sync(AsyncClient().get)(reverse("blog:post-list"))
+
+        self.assertEqual(
+            {post["title"] for post in response.json()["results"]}, {"Replicated"}
+        )
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        """Test every read goes to the primary without replicas"""
+        self.assertEqual(self.titles(), {"Replicated", "Fresh"})
+
+    def test_outside_requests_use_primary(self):
+        """Test reads outside a request and migrations stay on the primary"""
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertFalse(router.allow_migrate("replica_1", "blog"))
+        self.assertTrue(router.allow_migrate("default", "blog"))
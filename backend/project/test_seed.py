@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog import search
+from blog.models import Post, PostTag, Project, Technology
+
+from . import seed
+
+User = get_user_model()
+
+
+class SeedScaleTest(TestCase):
+    """Test the seed_scale synthetic data generator"""
+
+    def seed(self, *args):
+        call_command(
+            "seed_scale",
+            "--users",
+            "20",
+            "--posts",
+            "30",
+            "--projects",
+            "10",
+            "--batch-size",
+            "7",
+            *args,
+            stdout=StringIO(),
+        )
+        return list(Post.objects.order_by("pk").values_list("title", "tags"))
+
+    def test_generates_requested_rows(self):
+        """Test users, posts and projects are created with their indexes"""
+        self.seed()
+
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Project.objects.count(), 10)
+        self.assertFalse(Post.objects.filter(author__role=User.Role.VIEWER).exists())
+        post = Post.objects.exclude(tags="").first()
+        self.assertEqual(post.tag_set.count(), len(post.tags.split(", ")))
+        self.assertEqual(post.word_count, len(post.content.split()))
+        self.assertTrue(Technology.objects.filter(project_count__gt=0).exists())
+        self.assertTrue(User.objects.first().check_password("seedpass123"))
+        self.assertLess(Post.objects.latest("created_at").created_at.year, 2025)
+
+    def test_deterministic_under_seed(self):
+        """Test the same seed regenerates the same rows and others differ"""
+        first = self.seed()
+        self.assertEqual(self.seed("--clear"), first)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertNotEqual(self.seed("--clear", "--seed", "1"), first)
+
+    def test_clear_only_removes_seeded_rows(self):
+        """Test clear deletes seeded rows, their links, index and counts"""
+        self.seed()
+        kept = User.objects.create_user(username="kept", password="x")
+        post = Post.objects.create(author=kept, title="Kept", content="x", tags="go")
+        Project.objects.create(
+            owner=kept, title="Kept", description="x", tech_stack="Python"
+        )
+
+        self.assertGreater(seed.clear(), 30)
+
+        self.assertEqual(list(User.objects.all()), [kept])
+        self.assertEqual(list(Post.objects.all()), [post])
+        self.assertEqual(PostTag.objects.count(), 1)
+        self.assertEqual(
+            dict(
+                Technology.objects.filter(project_count__gt=0).values_list(
+                    "slug", "project_count"
+                )
+            ),
+            {"python": 1},
+        )
+        self.assertEqual(search.search(Post.objects.all(), "post", "kept"), [post])
+        self.assertEqual(
+            len(search.search(Post.objects.all(), "post", "the", limit=100)), 0
+        )
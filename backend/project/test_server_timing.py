@@ -0,0 +1,76 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase, override_settings
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from blog.models import Post
+
+User = get_user_model()
+
+
+def parse_server_timing(header):
+    phases = {}
+    for entry in header.split(","):
+        name, dur = entry.strip().split(";dur=")
+        phases[name] = float(dur)
+    return phases
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, SERVER_TIMING_SAMPLE_RATE=1.0)
+class ServerTimingTest(APITestCase):
+    def setUp(self):
+        author = User.objects.create_user(
+            username="author", email="author@example.com", password="testpass123"
+        )
+        Post.objects.create(
+            author=author, title="Post", content="Content", is_published=True
+        )
+
+    def test_header_reports_phases(self):
+        """Test DRF views report db, render, app and total timings"""
+        response = self.client.get(reverse("blog:post-list"))
+
+        phases = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(set(phases), {"db", "render", "app", "total"})
+        self.assertGreater(phases["db"], 0)
+        self.assertGreater(phases["render"], 0)
+        self.assertAlmostEqual(
+            phases["db"] + phases["render"] + phases["app"], phases["total"], 1
+        )
+
+    def test_function_views_are_timed(self):
+        """Test @api_view endpoints are timed too"""
+        response = self.client.get(reverse("blog:dashboard-stats"))
+
+        self.assertIn("render;dur=", response["Server-Timing"])
+
+    def test_logs_structured_line(self):
+        """Test sampled requests emit one log record with the phases"""
+        with self.assertLogs("project.timing", level="INFO") as logs:
+            self.client.get(reverse("blog:post-list"))
+
+        record = logs.records[0]
+        self.assertEqual(record.route, "blog:post-list")
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.queries, 1)
+        self.assertIn("total", record.timings)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_disabled(self):
+        """Test a zero sample rate skips timing entirely"""
+        response = self.client.get(reverse("blog:post-list"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.25)
+    def test_sampling(self):
+        """Test only requests under the sample rate are timed"""
+        with mock.patch("project.middleware.random.random", return_value=0.5):
+            response = self.client.get(reverse("blog:post-list"))
+        self.assertNotIn("Server-Timing", response)
+
+        with mock.patch("project.middleware.random.random", return_value=0.1):
+            response = self.client.get(reverse("blog:post-list"))
+        self.assertIn("Server-Timing", response)
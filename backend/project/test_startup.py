@@ -0,0 +1,77 @@
+import io
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from . import startup
+
+
+class StartupTest(SimpleTestCase):
+    """Test boot-time profiling and what a fresh process starts"""
+
+    def boot(self, statement, **env):
+        result = subprocess.run(
+            [sys.executable, "-c", f"import django; django.setup(); {statement}"],
+            cwd=settings.BASE_DIR,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE="project.settings", **env),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+
+    def test_budget(self):
+        """Test the command reports the slowest imports and enforces the budget"""
+        out = io.StringIO()
+        args = ["profile_startup", "--target", "setup", "--runs", "1", "--top", "3"]
+
+        call_command(*args, "--budget", "60000", stdout=out)
+        self.assertIn("Booted setup in", out.getvalue())
+        self.assertIn("django", out.getvalue())
+
+        with self.assertRaisesMessage(CommandError, "over budget"):
+            call_command(*args, "--budget", "1", stdout=io.StringIO())
+
+        out = io.StringIO()
+        call_command(*args, "--budget", "0", stdout=out)
+        self.assertIn("no budget", out.getvalue())
+
+    def test_import_times_parsing(self):
+        """Test -X importtime lines are read into modules and packages"""
+        imports = startup.import_times("setup")
+        modules = {entry.module: entry for entry in imports}
+        totals = startup.by_package(imports)
+
+        self.assertIn("django.apps.registry", modules)
+        self.assertGreaterEqual(
+            modules["django"].cumulative_ms, modules["django"].self_ms
+        )
+        self.assertAlmostEqual(
+            totals["django"],
+            sum(e.self_ms for e in imports if e.package == "django"),
+        )
+
+    def test_production_boot_skips_dev_apps_and_sentry(self):
+        """Test DEBUG off drops dev apps and setup leaves Sentry to servers"""
+        check = (
+            "import sys, sentry_sdk; from django.conf import settings; "
+            "print('django_extensions' in settings.INSTALLED_APPS, "
+            "'PIL' in sys.modules, sentry_sdk.is_initialized())"
+        )
+        self.assertEqual(
+            self.boot(check, DEBUG="False"),
+            "False False False",
+        )
+        self.assertTrue(self.boot(check, DEBUG="True").startswith("True"))
+        self.assertEqual(
+            self.boot(
+                "import sentry_sdk; from project.tracing import init_sentry; "
+                "init_sentry('https://public@sentry.invalid/1'); "
+                "print(sentry_sdk.is_initialized())"
+            ),
+            "True",
+        )
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .tracing import TraceSampler, parse_rates
+
+
+def context(path):
+    return {"parent_sampled": None, "wsgi_environ": {"PATH_INFO": path}}
+
+
+def transaction(path, duration_ms=10, status_code=200):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return {
+        "type": "transaction",
+        "request": {"url": f"https://api.example.com{path}"},
+        "contexts": {"response": {"status_code": status_code}},
+        "start_timestamp": start,
+        "timestamp": start + timedelta(milliseconds=duration_ms),
+    }
+
+
+class TraceSamplerTest(SimpleTestCase):
+    def setUp(self):
+        self.sampler = TraceSampler(
+            default_rate=0.1,
+            route_rates=parse_rates("/api/blog/=0.5,/api/blog/posts/=0.2"),
+            tail_rate=1.0,
+            slow_ms=500,
+        )
+
+    def test_health_checks_are_dropped(self):
+        """Test health and metrics endpoints are never traced"""
+        self.assertEqual(self.sampler(context("/health/")), 0)
+        self.assertEqual(self.sampler(context("/metrics/")), 0)
+
+    def test_longest_route_prefix_wins(self):
+        """Test per-route rates pick the most specific prefix"""
+        self.assertEqual(self.sampler.rate_for("/api/blog/posts/1/"), 0.2)
+        self.assertEqual(self.sampler.rate_for("/api/blog/projects/"), 0.5)
+        self.assertEqual(self.sampler.rate_for("/api/users/"), 0.1)
+
+    def test_records_at_tail_rate(self):
+        """Test traced routes start at the tail rate so slow ones can be kept"""
+        self.assertEqual(self.sampler(context("/api/blog/posts/")), 1.0)
+
+    def test_parent_decision_is_honoured(self):
+        """Test an upstream sampling decision is kept"""
+        self.assertEqual(self.sampler({"parent_sampled": False}), 0.0)
+        self.assertEqual(self.sampler({"parent_sampled": True}), 1.0)
+
+    def test_slow_and_failed_transactions_are_kept(self):
+        """Test tail transactions always survive before_send_transaction"""
+        with mock.patch("project.tracing.random.random", return_value=0.99):
+            slow = transaction("/api/blog/posts/", duration_ms=800)
+            failed = transaction("/api/blog/posts/", status_code=503)
+            self.assertIs(self.sampler.before_send_transaction(slow, {}), slow)
+            self.assertIs(self.sampler.before_send_transaction(failed, {}), failed)
+
+    def test_fast_transactions_are_thinned_to_route_rate(self):
+        """Test fast successful transactions are kept at the route rate"""
+        event = transaction("/api/blog/posts/")
+        with mock.patch("project.tracing.random.random", return_value=0.19):
+            self.assertIs(self.sampler.before_send_transaction(event, {}), event)
+        with mock.patch("project.tracing.random.random", return_value=0.21):
+            self.assertIsNone(self.sampler.before_send_transaction(event, {}))
+
+    def test_from_env(self):
+        """Test rates are read from SENTRY_TRACES_* variables"""
+        sampler = TraceSampler.from_env(
+            {
+                "SENTRY_TRACES_SAMPLE_RATE": "0.05",
+                "SENTRY_TRACES_ROUTE_RATES": "/api/auth/=0",
+                "SENTRY_TRACES_DROP": "/health/",
+                "SENTRY_TRACES_TAIL_RATE": "0.5",
+                "SENTRY_TRACES_SLOW_MS": "250",
+            }
+        )
+
+        self.assertEqual(sampler(context("/api/auth/login/")), 0)
+        self.assertEqual(sampler(context("/metrics/")), 0.5)
+        self.assertEqual(sampler.rate_for("/api/users/"), 0.05)
+        self.assertEqual(sampler.slow_ms, 250)
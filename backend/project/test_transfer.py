@@ -0,0 +1,186 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from rest_framework import status
+from rest_framework.test import APITestCase, override_settings
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post, Project, Tag
+
+from . import transfer
+
+User = get_user_model()
+
+
+@override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
+class TransferTest(APITestCase):
+    """Test exporting and importing users, projects and posts"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            role=User.Role.ADMIN,
+        )
+        self.member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="memberpass123",
+            role=User.Role.MEMBER,
+        )
+        self.last_year = timezone.now() - timedelta(days=365)
+        for i in range(5):
+            post = Post.objects.create(
+                author=self.member,
+                title=f"Post {i}",
+                content="word " * 100,
+                tags="Django, Python",
+            )
+            Post.objects.filter(pk=post.pk).update(created_at=self.last_year)
+        Project.objects.create(
+            owner=self.member,
+            title="Portfolio",
+            description="A site",
+            tech_stack="React, Django",
+        )
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def export(self, dataset, fmt="ndjson", *args):
+        path = os.path.join(self.tmp, f"{dataset}.{fmt}")
+        call_command(
+            "export_data",
+            dataset,
+            "--format",
+            fmt,
+            "--output",
+            path,
+            *args,
+            stdout=io.StringIO(),
+        )
+        return path
+
+    def load(self, dataset, path, *args):
+        out = io.StringIO()
+        call_command("import_data", dataset, path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_export_formats(self):
+        """Test NDJSON has one object per line and CSV a header row"""
+        with open(self.export("posts")) as ndjson:
+            rows = [json.loads(line) for line in ndjson]
+        with open(self.export("posts", "csv"), newline="") as csv_file:
+            csv_rows = list(csv.DictReader(csv_file))
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["author"], "member@example.com")
+        self.assertEqual(rows[0]["tags"], "Django, Python")
+        self.assertEqual(
+            [row["title"] for row in csv_rows], [f"Post {i}" for i in range(5)]
+        )
+        self.assertNotIn("excerpt", rows[0])
+
+    def test_export_streams_in_chunks(self):
+        """Test rows are read and encoded a chunk at a time"""
+        chunks = list(transfer.export("posts", "ndjson", chunk_size=2))
+
+        self.assertEqual([chunk.count("\n") for chunk in chunks], [2, 2, 1])
+
+    def test_passwords_only_exported_on_request(self):
+        """Test password hashes are left out unless asked for"""
+        with open(self.export("users")) as users:
+            self.assertNotIn("password", json.loads(users.readline()))
+        with open(self.export("users", "ndjson", "--include-passwords")) as users:
+            self.assertTrue(
+                json.loads(users.readline())["password"].startswith("pbkdf2")
+            )
+
+    def test_round_trip(self):
+        """Test an export imported into an empty database restores the rows"""
+        paths = {
+            dataset: self.export(dataset, "csv", "--include-passwords")
+            for dataset in ("users", "projects", "posts")
+        }
+        ids = list(Post.objects.values_list("pk", flat=True))
+        User.objects.all().delete()
+        Tag.objects.all().delete()
+
+        for dataset in ("users", "projects", "posts"):
+            self.load(dataset, paths[dataset], "--batch-size", "2")
+
+        posts = Post.objects.order_by("pk")
+        self.assertEqual(list(posts.values_list("pk", flat=True)), ids)
+        post = posts.first()
+        self.assertEqual(post.author.email, "member@example.com")
+        self.assertEqual(post.created_at, self.last_year)
+        self.assertEqual(post.word_count, 100)
+        self.assertEqual(post.excerpt, post.content[:200] + "...")
+        self.assertEqual(
+            set(post.tag_set.values_list("name", flat=True)), {"Django", "Python"}
+        )
+        project = Project.objects.get()
+        self.assertEqual(project.technologies.count(), 2)
+        self.assertTrue(
+            User.objects.get(email="member@example.com").check_password("memberpass123")
+        )
+        # Ids after the imported ones are still free for new rows
+        Post.objects.create(author=post.author, title="New", content="x")
+
+    def test_conflicts(self):
+        """Test existing rows stop the import, are skipped or are updated"""
+        path = self.export("posts")
+        Post.objects.filter(title="Post 0").update(title="Renamed")
+
+        with self.assertRaisesMessage(CommandError, "exists"):
+            self.load("posts", path)
+
+        output = self.load("posts", path, "--on-conflict", "skip")
+        self.assertIn("Created 0, updated 0 and skipped 5", output)
+        self.assertTrue(Post.objects.filter(title="Renamed").exists())
+
+        output = self.load("posts", path, "--on-conflict", "update")
+        self.assertIn("Created 0, updated 5 and skipped 0", output)
+        self.assertFalse(Post.objects.filter(title="Renamed").exists())
+        self.assertEqual(Post.objects.count(), 5)
+
+    def test_import_rejects_unknown_author(self):
+        """Test rows referring to a missing user stop the import"""
+        path = os.path.join(self.tmp, "posts.ndjson")
+        with open(path, "w") as rows:
+            rows.write(json.dumps({"id": 99, "author": "nobody@example.com"}) + "\n")
+
+        with self.assertRaisesMessage(CommandError, "no user with email"):
+            self.load("posts", path)
+        self.assertFalse(Post.objects.filter(pk=99).exists())
+
+    def test_admin_export_endpoint(self):
+        """Test admins can stream an export and other users cannot"""
+        url = reverse("blog:admin-export", args=["posts", "csv"])
+
+        self.client.force_authenticate(self.member)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(body)))), 5)
+        self.assertNotIn("password", body.splitlines()[0])
+
+        missing = reverse("blog:admin-export", args=["posts", "xml"])
+        self.assertEqual(
+            self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND
+        )
@@ -0,0 +1,63 @@
+"""
+Per-request phase timings reported in the ``Server-Timing`` header.
+
+``ServerTimingMiddleware`` attaches a ``Timings`` object to sampled requests
+as ``request.server_timing``. SQL time is collected through a database
+``execute_wrapper`` and JSON rendering time by ``TimedJSONRenderer``; the
+remaining time spent in the view (serializers, validation, permission
+checks) is reported as ``app``. Sampling is controlled by
+``SERVER_TIMING_SAMPLE_RATE``.
+"""
+
+import time
+
+from rest_framework.renderers import JSONRenderer  # type: ignore
+
+
+class Timings:
+    """Accumulated milliseconds per phase for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {"db": 0.0, "render": 0.0}
+        self.queries = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: time every statement on the connection
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add("db", time.perf_counter() - start)
+
+    def finish(self):
+        """Close the request and return {phase: ms} including app and total"""
+        total = (time.perf_counter() - self.started) * 1000
+        phases = dict(self.phases)
+        phases["app"] = max(total - sum(phases.values()), 0.0)
+        phases["total"] = total
+        return phases
+
+    @staticmethod
+    def header(phases):
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in phases.items())
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that records its own duration on sampled requests"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        request = (renderer_context or {}).get("request")
+        timings = getattr(request, "server_timing", None)
+        if timings is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        start = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            timings.add("render", time.perf_counter() - start)
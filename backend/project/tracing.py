@@ -0,0 +1,175 @@
+"""
+Sentry trace sampling: per-route rates with a bias towards slow and failed
+requests.
+
+``traces_sampler`` decides when a transaction starts, before its duration or
+status is known. To keep more of the interesting tail, routes are sampled at
+``max(route rate, tail rate)`` and ``before_send_transaction`` then drops
+fast, successful transactions until only the route rate of them remains.
+Slow (``SENTRY_TRACES_SLOW_MS``) or failed (5xx) ones are always sent.
+Health checks and the metrics endpoint are never traced.
+
+Configured from the environment:
+
+    SENTRY_TRACES_SAMPLE_RATE   default rate for every route (0.1)
+    SENTRY_TRACES_ROUTE_RATES   "/api/blog/posts/=0.2,/api/auth/=0.05";
+                                the longest matching path prefix wins
+    SENTRY_TRACES_DROP          path prefixes never traced
+                                ("/health/,/metrics/")
+    SENTRY_TRACES_TAIL_RATE     rate for slow or failed requests (0.25)
+    SENTRY_TRACES_SLOW_MS       what counts as slow (1000)
+
+``init_sentry`` starts Sentry with this sampler. Settings call it at import
+only with ``LAZY_STARTUP=False``; otherwise ``project.wsgi``,
+``project.asgi`` and ``run_worker`` call it once the apps are loaded, so
+management commands such as ``check`` and ``migrate`` boot without
+importing or starting it.
+"""
+
+import os
+import random
+from datetime import datetime
+from urllib.parse import urlsplit
+
+DEFAULT_DROP = ("/health/", "/metrics/")
+
+_started = False
+
+
+def parse_rates(value):
+    """Parse ``"prefix=rate,..."`` into (prefix, rate) pairs, longest first"""
+    rates = []
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        prefix, _, rate = item.rpartition("=")
+        rates.append((prefix.strip(), min(max(float(rate), 0.0), 1.0)))
+    return sorted(rates, key=lambda pair: len(pair[0]), reverse=True)
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return value
+
+
+class TraceSampler:
+    """``traces_sampler`` callable plus its ``before_send_transaction``"""
+
+    def __init__(
+        self,
+        default_rate=0.1,
+        route_rates=(),
+        drop=DEFAULT_DROP,
+        tail_rate=0.25,
+        slow_ms=1000,
+    ):
+        self.default_rate = default_rate
+        self.route_rates = sorted(
+            route_rates, key=lambda pair: len(pair[0]), reverse=True
+        )
+        self.drop = tuple(drop)
+        self.tail_rate = tail_rate
+        self.slow_ms = slow_ms
+
+    @classmethod
+    def from_env(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        drop = environ.get("SENTRY_TRACES_DROP")
+        return cls(
+            default_rate=float(environ.get("SENTRY_TRACES_SAMPLE_RATE", 0.1)),
+            route_rates=parse_rates(environ.get("SENTRY_TRACES_ROUTE_RATES")),
+            drop=(
+                [p.strip() for p in drop.split(",") if p.strip()]
+                if drop is not None
+                else DEFAULT_DROP
+            ),
+            tail_rate=float(environ.get("SENTRY_TRACES_TAIL_RATE", 0.25)),
+            slow_ms=float(environ.get("SENTRY_TRACES_SLOW_MS", 1000)),
+        )
+
+    def rate_for(self, path):
+        """Base sample rate for a request path; 0 for dropped paths"""
+        if path is None:
+            return self.default_rate
+        if path.startswith(self.drop):
+            return 0.0
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+    def __call__(self, sampling_context):
+        """``traces_sampler`` callback"""
+        parent = sampling_context.get("parent_sampled")
+        if parent is not None:
+            # Keep distributed traces whole
+            return float(parent)
+
+        rate = self.rate_for(self._context_path(sampling_context))
+        return max(rate, self.tail_rate) if rate > 0 else 0.0
+
+    def before_send_transaction(self, event, hint):
+        """Thin fast, successful transactions back down to the route rate"""
+        rate = self.rate_for(self._event_path(event))
+        recorded = max(rate, self.tail_rate)
+        if rate >= recorded or self.is_tail(event):
+            return event
+        return event if random.random() < rate / recorded else None
+
+    def is_tail(self, event):
+        status = event.get("contexts", {}).get("response", {}).get("status_code")
+        if status is not None and int(status) >= 500:
+            return True
+        if event.get("contexts", {}).get("trace", {}).get("status") == "internal_error":
+            return True
+        start, end = event.get("start_timestamp"), event.get("timestamp")
+        if start is None or end is None:
+            return False
+        return (_timestamp(end) - _timestamp(start)) * 1000 >= self.slow_ms
+
+    @staticmethod
+    def _context_path(sampling_context):
+        environ = sampling_context.get("wsgi_environ")
+        if environ is not None:
+            return environ.get("PATH_INFO")
+        scope = sampling_context.get("asgi_scope")
+        if scope is not None:
+            return scope.get("path")
+        return None
+
+    @staticmethod
+    def _event_path(event):
+        url = event.get("request", {}).get("url")
+        return urlsplit(url).path if url else None
+
+
+def init_sentry(dsn=None):
+    """Start Sentry for this process, once; ``SENTRY_DSN`` by default"""
+    global _started
+    if _started:
+        return
+    if dsn is None:
+        from django.conf import settings
+
+        dsn = settings.SENTRY_DSN
+    _started = True
+    if not dsn:
+        return
+
+    import sentry_sdk
+    from sentry_sdk.integrations.django import DjangoIntegration
+
+    # Per-route trace sampling configured from SENTRY_TRACES_*
+    trace_sampler = TraceSampler.from_env()
+    sentry_sdk.init(
+        dsn=dsn,
+        integrations=[DjangoIntegration()],
+        traces_sampler=trace_sampler,
+        before_send_transaction=trace_sampler.before_send_transaction,
+        # Add data like request headers and IP for users, see
+        # https://docs.sentry.io/platforms/python/data-management/data-collected/
+        send_default_pii=True,
+    )
@@ -0,0 +1,354 @@
+"""
+Streaming export and batched import of users, projects and posts.
+
+``export`` yields a dataset as NDJSON (one JSON object per line) or CSV
+(with a header row), reading it with ``QuerySet.iterator`` so only one
+chunk of rows is in memory however large the table. It backs the
+``export_data`` command and the admin-only ``/api/blog/admin/export/``
+endpoint, which streams it with a ``StreamingHttpResponse``.
+
+``import_rows`` reads the same format back in batches of ``bulk_create``,
+one transaction per batch. Rows are matched to existing ones by their
+key (``email`` for users, ``id`` for projects and posts), and a match is
+handled by ``on_conflict``:
+
+- ``error`` stops the import at that row; earlier batches stay written;
+- ``skip`` leaves the existing row as it is;
+- ``update`` overwrites it with the imported values.
+
+Projects and posts refer to their owner and author by email, so users are
+imported first. Bulk writes skip ``save()`` and ``post_save``, so excerpts,
+tags, technologies, the search index and cached statistics are brought up
+to date here; image variants are not, and can be filled in with
+``backfill_image_variants``. Password hashes are only exported on request
+(``--include-passwords``); users imported without one cannot log in until
+they reset their password.
+"""
+
+import csv
+import json
+from collections import Counter
+from datetime import date, datetime
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from blog import search, stats
+from blog.models import Post, Project
+from users.authentication import invalidate_user
+
+from .db import bulk
+
+FORMATS = ("ndjson", "csv")
+CONFLICT_ACTIONS = ("error", "skip", "update")
+
+
+class TransferError(ValueError):
+    """A row that cannot be imported"""
+
+
+class Dataset:
+    """
+    How one model is written out as rows and read back.
+
+    ``relations`` maps a column to the foreign key it fills, written as the
+    related user's email. ``private`` columns are only exported on request,
+    and ``derived`` fields are not exported but computed by ``prepare``.
+    """
+
+    def __init__(self, model, key, fields, relations=None, private=(), derived=()):
+        self.model = model
+        self.key = key
+        self.fields = list(fields)
+        self.relations = relations or {}
+        self.private = list(private)
+        self.derived = list(derived)
+
+    def columns(self, private=False):
+        return self.fields + (self.private if private else [])
+
+    def lookups(self, columns):
+        return [
+            f"{self.relations[column]}__email" if column in self.relations else column
+            for column in columns
+        ]
+
+    def build(self, number, row, users):
+        """Return an unsaved instance from the imported ``row``"""
+        if not row.get(self.key):
+            raise TransferError(f"Row {number}: missing {self.key!r}.")
+        instance = self.model()
+        for column, value in row.items():
+            if column in self.relations:
+                if value not in users:
+                    raise TransferError(f"Row {number}: no user with email {value!r}.")
+                setattr(instance, f"{self.relations[column]}_id", users[value])
+            elif column in self.fields or column in self.private:
+                field = self.model._meta.get_field(column)
+                if value in ("", None) and field.null:
+                    value = None
+                try:
+                    value = field.to_python(value)
+                except ValidationError as exc:
+                    raise TransferError(
+                        f"Row {number}: {column}: {' '.join(exc.messages)}"
+                    ) from exc
+                setattr(instance, field.attname, value)
+        return instance
+
+    def prepare(self, instances):
+        """Fill fields ``save()`` would have, before the rows are written"""
+
+    def written(self, instances, updated):
+        """Bring indexes and caches up to date after the rows are written"""
+
+
+class UserDataset(Dataset):
+    def prepare(self, instances):
+        for user in instances:
+            if not user.password:
+                user.password = make_password(None)
+
+    def written(self, instances, updated):
+        for user in updated:
+            invalidate_user(user.pk)
+
+
+class ProjectDataset(Dataset):
+    def written(self, instances, updated):
+        Project.sync_technologies_for(instances)
+        search.index_instances(instances)
+
+
+class PostDataset(Dataset):
+    def prepare(self, instances):
+        for post in instances:
+            post.refresh_summary()
+
+    def written(self, instances, updated):
+        Post.sync_tags_for(instances)
+        search.index_instances(instances)
+
+
+DATASETS = {
+    "users": UserDataset(
+        get_user_model(),
+        key="email",
+        fields=[
+            "email",
+            "username",
+            "first_name",
+            "last_name",
+            "bio",
+            "role",
+            "skills",
+            "profile_photo",
+            "linkedin_url",
+            "github_url",
+            "personal_website",
+            "is_active",
+            "is_staff",
+            "is_superuser",
+            "date_joined",
+            "last_login",
+        ],
+        private=["password"],
+    ),
+    "projects": ProjectDataset(
+        Project,
+        key="id",
+        fields=[
+            "id",
+            "owner",
+            "title",
+            "description",
+            "tech_stack",
+            "demo_link",
+            "source_code",
+            "image",
+            "created_at",
+            "updated_at",
+        ],
+        relations={"owner": "owner"},
+    ),
+    "posts": PostDataset(
+        Post,
+        key="id",
+        fields=[
+            "id",
+            "author",
+            "title",
+            "content",
+            "tags",
+            "cover_image",
+            "is_published",
+            "created_at",
+            "updated_at",
+        ],
+        relations={"author": "author"},
+        derived=["excerpt", "word_count"],
+    ),
+}
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """File-like object for ``csv.writer`` that hands each line back"""
+
+    def write(self, value):
+        return value
+
+
+def export(name, fmt, chunk_size=2000, private=False):
+    """
+    Yield the ``name`` dataset encoded as ``fmt``, one string per
+    ``chunk_size`` rows, in primary key order.
+    """
+    dataset = DATASETS[name]
+    columns = dataset.columns(private)
+    rows = (
+        dataset.model.objects.order_by("pk")
+        .values_list(*dataset.lookups(columns))
+        .iterator(chunk_size=chunk_size)
+    )
+
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+
+        def encode(row):
+            return writer.writerow(
+                ["" if value is None else _plain(value) for value in row]
+            )
+
+    else:
+
+        def encode(row):
+            return json.dumps(dict(zip(columns, map(_plain, row)))) + "\n"
+
+    while batch := list(islice(rows, chunk_size)):
+        yield "".join(encode(row) for row in batch)
+
+
+def read_rows(stream, fmt):
+    """Yield the rows of an export read from the text ``stream``"""
+    if fmt == "csv":
+        # Post content easily exceeds the default limit of 128 KiB per field
+        csv.field_size_limit(2**31 - 1)
+        yield from csv.DictReader(stream)
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise TransferError(f"Line {number}: {exc.msg}.") from exc
+        if not isinstance(row, dict):
+            raise TransferError(f"Line {number}: expected a JSON object.")
+        yield row
+
+
+def import_rows(name, rows, on_conflict="error", batch_size=500):
+    """
+    Write ``rows`` into the ``name`` dataset ``batch_size`` at a time.
+    Returns how many rows were created, updated and skipped.
+    """
+    dataset = DATASETS[name]
+    counts = Counter(created=0, updated=0, skipped=0)
+    rows = iter(rows)
+    start = 1
+    while batch := list(islice(rows, batch_size)):
+        with transaction.atomic():
+            counts.update(_import_batch(dataset, batch, start, on_conflict))
+        start += len(batch)
+
+    if counts["created"] or counts["updated"]:
+        # Explicit ids leave PostgreSQL's sequences behind the imported rows
+        sequences = connection.ops.sequence_reset_sql(no_style(), [dataset.model])
+        with connection.cursor() as cursor:
+            for sql in sequences:
+                cursor.execute(sql)
+        stats.invalidate()
+    return counts
+
+
+def _import_batch(dataset, batch, start, on_conflict):
+    model = dataset.model
+    emails = {row.get(column) for row in batch for column in dataset.relations}
+    users = (
+        dict(
+            get_user_model().objects.filter(email__in=emails).values_list("email", "pk")
+        )
+        if emails
+        else {}
+    )
+
+    instances = {}
+    skipped = 0
+    for number, row in enumerate(batch, start):
+        instance = dataset.build(number, row, users)
+        key = getattr(instance, dataset.key)
+        if key in instances and on_conflict != "update":
+            if on_conflict == "error":
+                raise TransferError(f"Row {number}: {dataset.key} {key!r} repeats.")
+            skipped += 1
+            continue
+        instances[key] = instance
+
+    existing = set(
+        model.objects.filter(**{f"{dataset.key}__in": list(instances)}).values_list(
+            dataset.key, flat=True
+        )
+    )
+    if existing and on_conflict == "error":
+        key = next(key for key in instances if key in existing)
+        raise TransferError(f"{model.__name__} with {dataset.key} {key!r} exists.")
+    if on_conflict == "skip":
+        skipped += len(existing)
+        instances = {k: v for k, v in instances.items() if k not in existing}
+
+    instances = list(instances.values())
+    dataset.prepare(instances)
+    _write(dataset, instances, batch, on_conflict)
+    updated = [i for i in instances if getattr(i, dataset.key) in existing]
+    dataset.written(instances, updated)
+    return {
+        "created": len(instances) - len(updated),
+        "updated": len(updated),
+        "skipped": skipped,
+    }
+
+
+def _write(dataset, instances, batch, on_conflict):
+    model = dataset.model
+    columns = set().union(*batch)
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if field.name in columns or field.name in dataset.derived
+    ]
+    options = {}
+    if on_conflict == "update":
+        options = {
+            "update_conflicts": True,
+            "unique_fields": [dataset.key],
+            "update_fields": [
+                field.name
+                for field in fields
+                if not field.primary_key and field.name != dataset.key
+            ],
+        }
+    # Imported timestamps are kept; missing ones get the time of the import
+    bulk.create_keeping_timestamps(
+        model, instances, fields=fields, key=dataset.key, **options
+    )
@@ -3,15 +3,36 @@ from typing import List, Union
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.urls import include, path
 from django.urls.resolvers import URLPattern, URLResolver
 
+from . import metrics
+
 
 def root_health_check(request):
     return JsonResponse({"status": "ok"})
 
 
+def metrics_view(request):
+    """
+    Scrapers send ``Authorization: Bearer <METRICS_TOKEN>``; without a token
+    configured, only DEBUG or an admin signed in to the site can read it
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if request.headers.get("Authorization") != f"Bearer {token}":
+            return HttpResponse(status=401)
+    elif not settings.DEBUG and not getattr(request.user, "is_admin", False):
+        return HttpResponse(status=403)
+    if not settings.METRICS_ENABLED:
+        return HttpResponse(status=404)
+    return HttpResponse(
+        metrics.render(metrics.get_store().collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 def home(request):
     return JsonResponse({"message": "API is running."})
 
@@ -22,6 +43,7 @@ urlpatterns: List[Union[URLResolver, URLPattern]] = [
     path("api/", include("users.urls")),
     path("api/blog/", include(("blog.urls", "blog"), namespace="blog")),
     path("health/", root_health_check, name="root-health-check"),
+    path("metrics/", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:
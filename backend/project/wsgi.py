@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+import django
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
 
+# Sentry starts once the apps are loaded (see project.tracing), but before
+# the handler loads the middleware it instruments
+django.setup(set_prefix=False)
+
+from jobs.worker import start_embedded  # noqa: E402
+from project.tracing import init_sentry  # noqa: E402
+
+init_sentry()
+start_embedded()
+
 application = get_wsgi_application()
@@ -4,6 +4,7 @@ from django.contrib.auth.admin import UserAdmin
 from django.db.models import QuerySet
 from django.http import HttpRequest
 
+from .authentication import invalidate_user
 from .models import User
 
 
@@ -43,26 +44,34 @@ class CustomUserAdmin(UserAdmin):
         """Display user's full name"""
         return obj.get_full_name() or "-"
 
+    def _update(self, queryset: QuerySet[User], **changes) -> int:
+        """Bulk update users, dropping them from the authentication cache"""
+        pks = list(queryset.values_list("pk", flat=True))
+        updated = queryset.update(**changes)
+        for pk in pks:
+            invalidate_user(pk)
+        return updated
+
     @admin.action(description="Activate selected users")
     def activate_users(self, request: HttpRequest, queryset: QuerySet[User]) -> None:
         """Activate selected users"""
-        updated = queryset.update(is_active=True)
+        updated = self._update(queryset, is_active=True)
         self.message_user(request, f"{updated} users were activated.")
 
     @admin.action(description="Deactivate selected users")
     def deactivate_users(self, request: HttpRequest, queryset: QuerySet[User]) -> None:
         """Deactivate selected users"""
-        updated = queryset.update(is_active=False)
+        updated = self._update(queryset, is_active=False)
         self.message_user(request, f"{updated} users were deactivated.")
 
     @admin.action(description="Change to Member role")
     def make_members(self, request: HttpRequest, queryset: QuerySet[User]) -> None:
         """Change selected users to members"""
-        updated = queryset.update(role=User.Role.MEMBER)
+        updated = self._update(queryset, role=User.Role.MEMBER)
         self.message_user(request, f"{updated} users were changed to members.")
 
     @admin.action(description="Change to Viewer role")
     def make_viewers(self, request: HttpRequest, queryset: QuerySet[User]) -> None:
         """Change selected users to viewers"""
-        updated = queryset.update(role=User.Role.VIEWER)
+        updated = self._update(queryset, role=User.Role.VIEWER)
         self.message_user(request, f"{updated} users were changed to viewers.")
@@ -0,0 +1,21 @@
+"""
+Async variant of the public member listing, served instead of the DRF view
+when ``ASYNC_READ_VIEWS`` is set (see ``project.async_views``).
+"""
+
+from django.views.decorators.http import require_GET
+
+from project.async_views import alist, json_response
+
+from .serializers import UserProfileValuesSerializer
+from .views import members_queryset
+
+
+@require_GET
+async def members(request):
+    """Public endpoint to browse all active members with search/filter"""
+    queryset = UserProfileValuesSerializer.values(members_queryset(request.GET))
+    rows = await alist(queryset)
+    return json_response(
+        UserProfileValuesSerializer(rows, many=True, context={"request": request}).data
+    )
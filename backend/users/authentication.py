@@ -0,0 +1,174 @@
+"""
+JWT authentication that resolves users from a cache instead of the database.
+
+Users are cached as their concrete field values, first in a small
+per-process dict (``AUTH_USER_LOCAL_CACHE_TTL`` seconds) and then in the
+shared Django cache (``AUTH_USER_CACHE_TTL`` seconds). The password hash is
+left out: only its digest is kept, which is all simplejwt's revoked-token
+check compares, and a cached user loads ``password`` from the database if
+anything reads it. Saving or deleting a
+user, which ``change_role``, ``toggle_active``, profile edits and password
+changes all do, drops both entries (see ``users.signals``). Other processes
+pick up the change once their local entry expires.
+
+The second level is only used when the default cache is shared between
+processes (Redis, Memcached, a database or file cache). A per-process
+``LocMemCache`` could only be cleared in the process that made the change,
+leaving the others to serve the old user for ``AUTH_USER_CACHE_TTL``; with
+one, users are cached in the local dict alone.
+"""
+
+import threading
+import time
+from functools import partial
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.utils.translation import gettext_lazy as _
+
+from project.db.replicas import use_primary
+
+# Entries beyond this are dropped wholesale rather than evicted one by one
+LOCAL_CACHE_SIZE = 1024
+
+# Backends other processes cannot see, so invalidation could not reach them
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _key(user_id):
+    return f"auth:user:v2:{user_id}"
+
+
+def _local_key(user_id):
+    # Token claims and primary keys may differ in type
+    return str(user_id)
+
+
+def _shared_cache():
+    """The default cache if every process sees the same one, else None"""
+    cache = caches[DEFAULT_CACHE_ALIAS]
+    return None if isinstance(cache, PROCESS_LOCAL_CACHES) else cache
+
+
+def _fields():
+    return [
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname != "password"
+    ]
+
+
+def _entry(user):
+    """What is cached for ``user``: its field values and password digest"""
+    values = tuple(getattr(user, name) for name in _fields())
+    return values, get_md5_hash_password(user.password)
+
+
+def _build(entry):
+    values, password_digest = entry
+    user = get_user_model().from_db(DEFAULT_DB_ALIAS, _fields(), values)
+    user._password_digest = password_digest
+    return user
+
+
+def get_cached_user(user_id):
+    """Return a fresh ``User`` for ``user_id`` from cache, or None on a miss"""
+    local_ttl = getattr(settings, "AUTH_USER_LOCAL_CACHE_TTL", 2)
+    now = time.monotonic()
+
+    local = _local.get(_local_key(user_id))
+    if local is not None and local[0] > now:
+        return _build(local[1])
+
+    cache = _shared_cache()
+    entry = cache.get(_key(user_id)) if cache is not None else None
+    if entry is None:
+        return None
+    _remember(user_id, entry, local_ttl)
+    return _build(entry)
+
+
+def cache_user(user):
+    ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 300)
+    if ttl <= 0:
+        return
+    entry = _entry(user)
+    cache = _shared_cache()
+    if cache is not None:
+        cache.set(_key(user.pk), entry, timeout=ttl)
+    _remember(user.pk, entry, getattr(settings, "AUTH_USER_LOCAL_CACHE_TTL", 2))
+
+
+def _remember(user_id, entry, ttl):
+    if ttl <= 0:
+        return
+    with _local_lock:
+        if len(_local) >= LOCAL_CACHE_SIZE:
+            _local.clear()
+        _local[_local_key(user_id)] = (time.monotonic() + ttl, entry)
+
+
+def _forget(user_id):
+    with _local_lock:
+        _local.pop(_local_key(user_id), None)
+    cache = _shared_cache()
+    if cache is not None:
+        cache.delete(_key(user_id))
+
+
+def invalidate_user(user_id):
+    """Drop ``user_id`` from both cache levels, again once the write commits"""
+    _forget(user_id)
+    if connection.in_atomic_block:
+        # A request reading the old row before commit could re-cache it
+        transaction.on_commit(partial(_forget, user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that skips the user query on a cache hit"""
+
+    def get_user(self, validated_token):
+        if getattr(settings, "AUTH_USER_CACHE_TTL", 300) <= 0:
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_FIELD != get_user_model()._meta.pk.attname:
+            # The cache is keyed by primary key
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = get_cached_user(user_id)
+        if user is None:
+            # A lagging replica could cache a user just deactivated
+            with use_primary():
+                user = super().get_user(validated_token)
+            cache_user(user)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+            != user._password_digest
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
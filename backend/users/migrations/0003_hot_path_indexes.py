@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:39
+
+from django.db import migrations, models
+
+from project.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0002_alter_user_options_remove_user_created_at_and_more"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(fields=["role"], name="users_user_role"),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["date_joined"],
+                name="users_user_active_joined",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0003_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="profile_photo_variants",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -34,6 +34,8 @@ class User(AbstractUser):
     profile_photo = models.ImageField(
         upload_to="profile_photos/", blank=True, null=True
     )
+    # Resized copies of ``profile_photo``, written by project.images
+    profile_photo_variants = models.JSONField(blank=True, null=True, editable=False)
 
     # Social links
     linkedin_url = models.URLField(blank=True)
@@ -53,6 +55,15 @@ class User(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-date_joined"]
+        indexes = [
+            models.Index(fields=["role"], name="users_user_role"),
+            # Partial index for the same reason as blog_post_published_created
+            models.Index(
+                fields=["date_joined"],
+                condition=models.Q(is_active=True),
+                name="users_user_active_joined",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
@@ -90,3 +101,13 @@ class User(AbstractUser):
         if self.skills:
             return [skill.strip() for skill in self.skills.split(",") if skill.strip()]
         return []
+
+
+class RevokedToken(models.Model):
+    """A refresh token that may no longer be used (see users.revocation)"""
+
+    jti = models.UUIDField(unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti.hex
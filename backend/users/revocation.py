@@ -0,0 +1,168 @@
+"""
+Refresh-token revocation keyed by ``jti``.
+
+Revoked token ids live in the ``RevokedToken`` table (one UUID and an expiry
+per row) and, per process, in a Bloom filter. A token absent from the filter
+was certainly not revoked, so the common case needs no query; a hit is
+confirmed against the table because the filter has false positives.
+
+Each process picks up revocations made elsewhere by reading rows past the
+highest id it has seen, at most every ``TOKEN_REVOCATION_SYNC_INTERVAL``
+seconds. Every ``TOKEN_REVOCATION_REBUILD_INTERVAL`` seconds expired rows are
+deleted and the filter is rebuilt from what is left.
+
+Revoking is an ``INSERT`` on a unique column, so when two requests rotate the
+same refresh token at once only one of them succeeds.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+import uuid
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+# Rows re-read on every sync in case a lower id committed after a higher one
+SYNC_OVERLAP = 100
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys"""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationStore:
+    """This process's view of the revoked-token table"""
+
+    def __init__(self, capacity, error_rate, sync_interval, rebuild_interval):
+        self.pid = os.getpid()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.last_id = 0
+        self.synced_at = 0.0
+        self.rebuilt_at = 0.0
+
+    def sync(self, force=False):
+        """Catch up with revocations made by other processes"""
+        now = time.monotonic()
+        if not force and now - self.synced_at < self.sync_interval:
+            return
+        with self.lock:
+            if self.bloom is None or now - self.rebuilt_at >= self.rebuild_interval:
+                self._rebuild(now)
+            else:
+                # Ids can commit out of order; re-read a few already seen
+                since = self.last_id - SYNC_OVERLAP
+                self._load(self.bloom, RevokedToken.objects.filter(id__gt=since))
+            self.synced_at = now
+
+    def _rebuild(self, now):
+        RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        rows = RevokedToken.objects.all()
+        bloom = BloomFilter(max(self.capacity, 2 * rows.count()), self.error_rate)
+        self.last_id = 0
+        self._load(bloom, rows)
+        self.bloom = bloom
+        self.rebuilt_at = now
+
+    def _load(self, bloom, rows):
+        for pk, jti in rows.order_by("id").values_list("id", "jti").iterator():
+            bloom.add(jti.hex)
+            self.last_id = max(self.last_id, pk)
+
+    def is_revoked(self, jti):
+        self.sync()
+        key = _normalise(jti)
+        if key is None or key not in self.bloom:
+            return False
+        return RevokedToken.objects.filter(jti=key).exists()
+
+    def revoke(self, jti, expires_at):
+        """Record ``jti``; returns False if it was already revoked"""
+        key = _normalise(jti)
+        if key is None:
+            return False
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=key, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        self.sync()
+        with self.lock:
+            self.bloom.add(key)
+        return True
+
+
+def _normalise(jti):
+    try:
+        return uuid.UUID(str(jti)).hex
+    except ValueError:
+        return None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return this process's store, starting a fresh one after a fork"""
+    global _store
+    if _store is None or _store.pid != os.getpid():
+        with _store_lock:
+            if _store is None or _store.pid != os.getpid():
+                _store = RevocationStore(
+                    getattr(settings, "TOKEN_REVOCATION_CAPACITY", 100_000),
+                    getattr(settings, "TOKEN_REVOCATION_ERROR_RATE", 0.001),
+                    getattr(settings, "TOKEN_REVOCATION_SYNC_INTERVAL", 1.0),
+                    getattr(settings, "TOKEN_REVOCATION_REBUILD_INTERVAL", 3600),
+                )
+    return _store
+
+
+def is_revoked(token):
+    return get_store().is_revoked(token.get(api_settings.JTI_CLAIM))
+
+
+def revoke(token):
+    """Revoke a refresh token until it expires; False if already revoked"""
+    return get_store().revoke(
+        token.get(api_settings.JTI_CLAIM), datetime_from_epoch(token["exp"])
+    )
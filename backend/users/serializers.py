@@ -1,12 +1,28 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.utils.encoding import force_bytes
-from django.utils.http import urlsafe_base64_encode
+
+from project.images import ImageVariantsField
+from project.values_serializers import (
+    CommaListColumn,
+    DateTimeColumn,
+    FileColumn,
+    FullNameColumn,
+    ImageVariantsColumn,
+    ValuesSerializer,
+)
+
+from . import revocation
+from .authentication import get_cached_user
+from .tasks import send_password_reset_email
 
 User = get_user_model()
 
@@ -18,6 +34,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     skills_list = serializers.SerializerMethodField()
     full_name = serializers.SerializerMethodField()
+    profile_photo_variants = ImageVariantsField()
 
     class Meta:
         model = User
@@ -33,6 +50,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "skills_list",
             "role",
             "profile_photo",
+            "profile_photo_variants",
             "linkedin_url",
             "github_url",
             "personal_website",
@@ -60,6 +78,34 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return obj.get_full_name()
 
 
+class UserProfileValuesSerializer(ValuesSerializer):
+    """
+    Read-only fast path for user listings, same output as
+    UserProfileSerializer
+    """
+
+    columns = {
+        "id": "id",
+        "username": "username",
+        "email": "email",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "full_name": FullNameColumn("first_name", "last_name"),
+        "bio": "bio",
+        "skills": "skills",
+        "skills_list": CommaListColumn("skills"),
+        "role": "role",
+        "profile_photo": FileColumn("profile_photo"),
+        "profile_photo_variants": ImageVariantsColumn("profile_photo_variants"),
+        "linkedin_url": "linkedin_url",
+        "github_url": "github_url",
+        "personal_website": "personal_website",
+        "is_active": "is_active",
+        "date_joined": DateTimeColumn("date_joined"),
+        "last_login": DateTimeColumn("last_login"),
+    }
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration with password confirmation
@@ -123,6 +169,66 @@ class UserLoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Serializer exchanging a refresh token for a new access token, and for a
+    new refresh token when rotation is on
+    """
+
+    refresh = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        try:
+            refresh = RefreshToken(attrs["refresh"])
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
+
+        if revocation.is_revoked(refresh):
+            raise InvalidToken("Token has been revoked")
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = get_cached_user(user_id) or User.objects.filter(pk=user_id).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed(
+                "No active account found for the given token.",
+                code="no_active_account",
+            )
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # Revoking is atomic, so a token can only be rotated once
+            if api_settings.BLACKLIST_AFTER_ROTATION and not revocation.revoke(refresh):
+                raise InvalidToken("Token has been revoked")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class LogoutSerializer(serializers.Serializer):
+    """
+    Serializer for logout; revokes the refresh token if one is given
+    """
+
+    refresh = serializers.CharField(required=False, write_only=True)
+
+    def validate_refresh(self, value):
+        try:
+            refresh = RefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(e.args[0]) from e
+
+        user = self.context["request"].user
+        if str(refresh.payload.get(api_settings.USER_ID_CLAIM)) != str(user.pk):
+            raise serializers.ValidationError("Token belongs to another user.")
+        return refresh
+
+    def save(self):
+        if "refresh" in self.validated_data:
+            revocation.revoke(self.validated_data["refresh"])
+
+
 class PasswordResetRequestSerializer(serializers.Serializer):
     """
     Serializer for password reset request
@@ -131,31 +237,10 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def save(self):
-        """Send password reset email if user exists"""
-        email = self.validated_data["email"]
-
-        try:
-            user = User.objects.get(email=email, is_active=True)
-            token = default_token_generator.make_token(user)
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-
-            # Get frontend URL with fallback
-            frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:3000")
-            reset_link = f"{frontend_url}/reset-password/{uid}/{token}/"
-
-            # Get from email with fallback
-            from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com")
-
-            send_mail(
-                subject="Password Reset Request",
-                message=f"Click the link to reset your password: {reset_link}",
-                from_email=from_email,
-                recipient_list=[email],
-                fail_silently=True,
-            )
-        except User.DoesNotExist:
-            # Don't reveal if email exists or not
-            pass
+        """Queue the password reset email; sent by ``manage.py run_worker``"""
+        # The job looks the user up, so the response never reveals whether
+        # the email exists
+        send_password_reset_email.enqueue(email=self.validated_data["email"])
 
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
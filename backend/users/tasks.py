@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from jobs.queue import task
+
+
+@task("users.send_password_reset_email")
+def send_password_reset_email(email):
+    """Send a password reset link if an active user has this email"""
+    User = get_user_model()
+    user = User.objects.filter(email=email, is_active=True).first()
+    if user is None:
+        return
+
+    token = default_token_generator.make_token(user)
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+
+    # Get frontend URL with fallback
+    frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:3000")
+    reset_link = f"{frontend_url}/reset-password/{uid}/{token}/"
+
+    # Get from email with fallback
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com")
+
+    # Raise on failure so the queue retries with backoff
+    send_mail(
+        subject="Password Reset Request",
+        message=f"Click the link to reset your password: {reset_link}",
+        from_email=from_email,
+        recipient_list=[email],
+        fail_silently=False,
+    )
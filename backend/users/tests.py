@@ -1,3 +1,13 @@
+import json
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase, override_settings
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -5,11 +15,20 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core import mail
-from django.test import TestCase, TransactionTestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from jobs.worker import stop_embedded
+
+from . import async_views, authentication, revocation
+from .models import RevokedToken
+
 User = get_user_model()
 
 
@@ -26,6 +45,7 @@ class URLDebugTest(APITestCase):
             ("/api/auth/register/", "POST"),
             ("/api/auth/login/", "POST"),
             ("/api/auth/logout/", "POST"),
+            ("/api/auth/token/refresh/", "POST"),
             ("/api/auth/password-reset/", "POST"),
             ("/api/auth/password-reset-confirm/", "POST"),
             ("/api/users/", "GET"),
@@ -53,6 +73,7 @@ class URLDebugTest(APITestCase):
             "users:register",
             "users:login",
             "users:logout",
+            "users:token-refresh",
             "users:password-reset-request",
             "users:password-reset-confirm",
             "users:user-list",
@@ -469,6 +490,327 @@ class UserManagementAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["first_name"], "AdminUpdated")
 
+    def test_admin_statistics(self):
+        """Test admin statistics aggregate users in a single query"""
+        self.authenticate_user(self.admin)
+        cache.clear()
+
+        # auth user + users/projects/posts aggregates + two top-5 group-bys
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse("users:admin-statistics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["users"]["total"], 3)
+        self.assertEqual(response.data["users"]["admins"], 1)
+        self.assertEqual(response.data["posts"]["draft"], 0)
+
+
+@override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
+class AsyncMembersViewTest(APITestCase):
+    """Test the async member listing answers like the DRF action"""
+
+    def setUp(self):
+        for name, skills, active in [
+            ("ada", "Python, Django", True),
+            ("bob", "React", True),
+            ("cyd", "Python", False),
+        ]:
+            User.objects.create_user(
+                username=name,
+                email=f"{name}@example.com",
+                password="pass12345",
+                skills=skills,
+                is_active=active,
+            )
+
+    def test_members(self):
+        for query in ["", "?skill=python", "?search=bo"]:
+            url = reverse("users:user-members") + query
+            expected = self.client.get(url).json()
+
+            response = async_to_sync(async_views.members)(
+                AsyncRequestFactory().get(url)
+            )
+
+            self.assertEqual(json.loads(response.content), expected)
+        self.assertEqual([user["username"] for user in expected], ["bob"])
+
+
+@override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
+class CachedAuthenticationTest(APITestCase):
+    """Test request.user is served from the cache and invalidated on change"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="adminpass123",
+            role=User.Role.ADMIN,
+        )
+        self.member = User.objects.create_user(
+            username="member",
+            email="member@example.com",
+            password="memberpass123",
+            role=User.Role.MEMBER,
+        )
+        self.admin_client = APIClient()
+        token = RefreshToken.for_user(self.admin).access_token
+        self.admin_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        token = RefreshToken.for_user(self.member).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def profile(self):
+        return self.client.get(reverse("users:user-profile"))
+
+    def test_cached_user_skips_query(self):
+        """Test only the first request loads the user from the database"""
+        with self.assertNumQueries(1):
+            self.profile()
+        with self.assertNumQueries(0):
+            response = self.profile()
+
+        self.assertEqual(response.data["username"], "member")
+
+    def test_change_role_invalidates(self):
+        """Test a role change is visible on the user's next request"""
+        self.profile()
+        response = self.admin_client.post(
+            reverse("users:user-change-role", kwargs={"pk": self.member.pk}),
+            {"role": User.Role.VIEWER},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.profile().data["role"], User.Role.VIEWER)
+
+    def test_toggle_active_invalidates(self):
+        """Test a deactivated user is rejected on their next request"""
+        self.profile()
+        self.admin_client.post(
+            reverse("users:user-toggle-active", kwargs={"pk": self.member.pk})
+        )
+
+        self.assertEqual(self.profile().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def deactivate_elsewhere(self):
+        """
+        Deactivate the member as another worker would: without signals
+        reaching this process's caches, and once its local entry expired
+        """
+        User.objects.filter(pk=self.member.pk).update(is_active=False)
+        authentication._local.clear()
+
+    def test_process_local_cache_never_serves_stale_users(self):
+        """Test a per-process default cache is not used as the shared level"""
+        self.profile()
+
+        self.deactivate_elsewhere()
+
+        self.assertEqual(self.profile().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_shared_cache_is_used_across_processes(self):
+        """Test a cross-process cache serves users other workers cached"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location,
+        }
+        with override_settings(CACHES={"default": shared}):
+            self.profile()
+            authentication._local.clear()
+
+            with self.assertNumQueries(0):
+                self.assertEqual(self.profile().status_code, status.HTTP_200_OK)
+
+    def test_password_hash_is_not_cached(self):
+        """Test only a digest of the password is cached, not the hash"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location,
+        }
+        with override_settings(CACHES={"default": shared}):
+            self.profile()
+            entry = cache.get(f"auth:user:v2:{self.member.pk}")
+
+        self.member.refresh_from_db()
+        self.assertNotIn(self.member.password, repr(entry))
+        user = authentication._build(entry)
+        self.assertEqual(user.get_deferred_fields(), {"password"})
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password("memberpass123"))
+
+    def test_password_change_revokes_cached_tokens(self):
+        """Test a token from before a password change fails on a cache hit"""
+        # Patched on the instance simplejwt's modules imported, which
+        # override_settings(SIMPLE_JWT=...) would replace without reaching
+        api_settings = authentication.api_settings
+        with mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True):
+            old = RefreshToken.for_user(self.member).access_token
+            self.member.set_password("newpass123")
+            self.member.save()
+            new = RefreshToken.for_user(self.member).access_token
+
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {new}")
+            self.assertEqual(self.profile().status_code, status.HTTP_200_OK)
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {old}")
+            with self.assertNumQueries(0):
+                response = self.profile()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_uses_current_row(self):
+        """Test saving the profile never writes back cached fields"""
+        self.profile()
+        User.objects.filter(pk=self.member.pk).update(role=User.Role.VIEWER)
+
+        self.client.patch(
+            reverse("users:user-profile"), {"first_name": "New"}, format="json"
+        )
+
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.first_name, "New")
+        self.assertEqual(self.member.role, User.Role.VIEWER)
+
+
+@override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
+class TokenRevocationTest(APITestCase):
+    """Test refresh tokens are revoked on rotation and logout"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+
+    def refresh_with(self, token):
+        return self.client.post(
+            reverse("users:token-refresh"), {"refresh": str(token)}, format="json"
+        )
+
+    def logout(self, **data):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+        return self.client.post(reverse("users:logout"), data, format="json")
+
+    def test_refresh_rotates_once(self):
+        """Test a refresh token is rotated and cannot be used again"""
+        response = self.refresh_with(self.refresh)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        self.assertNotEqual(response.data["refresh"], str(self.refresh))
+        self.assertEqual(
+            self.refresh_with(self.refresh).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.refresh_with(response.data["refresh"]).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_logout_revokes_refresh_token(self):
+        """Test a refresh token stops working after logout"""
+        response = self.logout(refresh=str(self.refresh))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.refresh_with(self.refresh).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.logout(refresh=str(self.refresh)).status_code, status.HTTP_200_OK
+        )
+
+    def test_logout_rejects_other_users_token(self):
+        """Test users cannot revoke someone else's refresh token"""
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="testpass123"
+        )
+        other_refresh = RefreshToken.for_user(other)
+
+        response = self.logout(refresh=str(other_refresh))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.refresh_with(other_refresh).status_code, status.HTTP_200_OK
+        )
+
+    def test_refresh_rejects_inactive_user(self):
+        """Test deactivated users cannot refresh"""
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(
+            self.refresh_with(self.refresh).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+
+class RevocationStoreTest(TestCase):
+    """Test the Bloom filter backed revocation store"""
+
+    def make_store(self):
+        return revocation.RevocationStore(
+            capacity=1000, error_rate=0.01, sync_interval=60, rebuild_interval=3600
+        )
+
+    def expiry(self, **delta):
+        return timezone.now() + timedelta(**(delta or {"days": 1}))
+
+    def test_bloom_filter(self):
+        """Test added keys are always found and false positives are rare"""
+        bloom = revocation.BloomFilter(1000, 0.01)
+        added = [uuid.uuid4().hex for _ in range(1000)]
+        for key in added:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in added))
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_unrevoked_lookup_needs_no_query(self):
+        """Test checking a token that was never revoked skips the database"""
+        store = self.make_store()
+        store.revoke(uuid.uuid4().hex, self.expiry())
+
+        with self.assertNumQueries(0):
+            self.assertFalse(store.is_revoked(uuid.uuid4().hex))
+
+    def test_workers_stay_in_sync(self):
+        """Test a revocation in one process is seen by another after sync"""
+        first, second = self.make_store(), self.make_store()
+        second.sync(force=True)
+        jti = uuid.uuid4().hex
+
+        self.assertTrue(first.revoke(jti, self.expiry()))
+        self.assertFalse(first.revoke(jti, self.expiry()))
+        self.assertFalse(second.is_revoked(jti))
+
+        second.sync(force=True)
+        self.assertTrue(second.is_revoked(jti))
+
+    def test_rebuild_prunes_expired(self):
+        """Test expired revocations are deleted when the filter is rebuilt"""
+        store = self.make_store()
+        expired, live = uuid.uuid4().hex, uuid.uuid4().hex
+        store.revoke(expired, self.expiry(seconds=-1))
+        store.revoke(live, self.expiry())
+
+        store.rebuilt_at = -store.rebuild_interval
+        store.sync(force=True)
+
+        self.assertEqual(
+            [token.jti.hex for token in RevokedToken.objects.all()], [live]
+        )
+        self.assertFalse(store.is_revoked(expired))
+        self.assertTrue(store.is_revoked(live))
+
 
 @override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
 class PasswordResetTest(APITestCase):
@@ -489,6 +831,35 @@ class PasswordResetTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("password reset link has been sent", response.data["message"])
 
+    @override_settings(JOBS_EXTERNAL_WORKER=True)
+    def test_password_reset_email_sent_by_worker(self):
+        """Test the reset email is queued and sent outside the request"""
+        response = self.client.post(
+            reverse("users:password-reset-request"),
+            {"email": "test@example.com"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command("run_worker", "--burst", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["test@example.com"])
+        self.assertIn("/reset-password/", mail.outbox[0].body)
+
+    def test_password_reset_unknown_email_sends_nothing(self):
+        """Test the queued job skips emails without an active user"""
+        self.client.post(
+            reverse("users:password-reset-request"),
+            {"email": "nonexistent@example.com"},
+            format="json",
+        )
+        call_command("run_worker", "--burst", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 0)
+
     def test_password_reset_request_invalid_email(self):
         """Test password reset request with invalid email"""
         data = {"email": "nonexistent@example.com"}
@@ -559,6 +930,36 @@ class PasswordResetTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+@override_settings(
+    APPEND_SLASH=False,
+    SECURE_SSL_REDIRECT=False,
+    JOBS_EXTERNAL_WORKER=False,
+    JOBS_EMBEDDED_POLL_INTERVAL=0.01,
+)
+class PasswordResetWithoutWorkerTest(TransactionTestCase):
+    """Test reset emails go out without a run_worker service"""
+
+    def test_password_reset_email_sent_in_background(self):
+        """Test the web process sends the email after the response"""
+        self.addCleanup(stop_embedded)
+        User.objects.create_user(
+            username="testuser", email="test@example.com", password="oldpassword"
+        )
+
+        response = self.client.post(
+            reverse("users:password-reset-request"),
+            {"email": "test@example.com"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        deadline = time.monotonic() + 10
+        while not mail.outbox and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["test@example.com"])
+
+
 @override_settings(APPEND_SLASH=False, SECURE_SSL_REDIRECT=False)
 class RoleBasedPermissionsTest(APITestCase):
     """Test role-based permissions across the system"""
@@ -633,6 +1034,27 @@ class RoleBasedPermissionsTest(APITestCase):
         )  # admin, member, viewer (no inactive)
 
 
+class UserQueryPlanTest(TestCase):
+    """Test user list and stats queries are planned on their indexes"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        """Assert the database plans ``queryset`` using ``index_name``"""
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Tiny test tables would otherwise always be seq-scanned
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_users_by_role(self):
+        queryset = User.objects.filter(role=User.Role.ADMIN)
+        self.assertUsesIndex(queryset, "users_user_role")
+
+    def test_active_users_by_join_date(self):
+        queryset = User.objects.filter(is_active=True).order_by("-date_joined")
+        self.assertUsesIndex(queryset, "users_user_active_joined")
+
+
 class UserSerializerTest(TestCase):
     """Test user serializers with role-based data"""
 
@@ -661,6 +1083,23 @@ class UserSerializerTest(TestCase):
         self.assertEqual(data["bio"], "Test bio")
         self.assertIn("skills_list", data)
 
+    def test_user_profile_values_serializer_matches(self):
+        """Test the values() fast path returns the same data as DRF"""
+        from rest_framework.test import APIRequestFactory
+
+        from .serializers import UserProfileSerializer, UserProfileValuesSerializer
+
+        User.objects.update(profile_photo="profile_photos/me.jpg")
+        queryset = User.objects.all()
+        context = {"request": APIRequestFactory().get("/")}
+
+        expected = UserProfileSerializer(queryset, many=True, context=context).data
+        actual = UserProfileValuesSerializer(
+            UserProfileValuesSerializer.values(queryset), many=True, context=context
+        ).data
+
+        self.assertEqual(actual, [dict(row) for row in expected])
+
     def test_user_registration_serializer_validation(self):
         """Test UserRegistrationSerializer validation"""
         from .serializers import UserRegistrationSerializer
@@ -1,8 +1,9 @@
 from rest_framework.routers import DefaultRouter
 
+from django.conf import settings
 from django.urls import include, path
 
-from . import views
+from . import async_views, views
 
 # Create a router for ViewSet-based views
 router = DefaultRouter()
@@ -20,6 +21,7 @@ urlpatterns = [
     path("auth/register/", views.UserRegistrationView.as_view(), name="register"),
     path("auth/login/", views.UserLoginView.as_view(), name="login"),
     path("auth/logout/", views.logout, name="logout"),
+    path("auth/token/refresh/", views.TokenRefreshView.as_view(), name="token-refresh"),
     # path("sentry-debug/", trigger_error),
     # Password reset endpoints
     path(
@@ -43,5 +45,10 @@ urlpatterns = [
         name="user-profile",
     ),
     # Include router URLs
+    *(
+        [path("users/members/", async_views.members, name="user-members")]
+        if settings.ASYNC_READ_VIEWS
+        else []
+    ),
     path("", include(router.urls)),
 ]
@@ -5,20 +5,25 @@ from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.tokens import default_token_generator
 from django.db import models
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
 
+from project.values_serializers import ValuesListMixin
 from users.permissions import IsAdminUser, IsOwnerOrAdmin
 
 from .models import User
 from .serializers import (
+    LogoutSerializer,
     PasswordResetConfirmSerializer,
     PasswordResetRequestSerializer,
+    TokenRefreshSerializer,
     UserLoginSerializer,
     UserProfileSerializer,
+    UserProfileValuesSerializer,
     UserRegistrationSerializer,
 )
 from .utils import get_tokens_for_user
@@ -90,7 +95,46 @@ class UserLoginView(generics.GenericAPIView):
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class TokenRefreshView(generics.GenericAPIView):
+    """Refresh endpoint; rotated and logged-out tokens are rejected"""
+
+    serializer_class = TokenRefreshSerializer
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get_authenticate_header(self, request):
+        # Keep invalid tokens a 401 although the view authenticates no one
+        return 'Bearer realm="api"'
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+def members_queryset(params):
+    """Active users, filtered by the ``search`` and ``skill`` parameters"""
+    queryset = User.objects.filter(is_active=True)
+
+    # Search by name or skills
+    search = params.get("search", None)
+    if search:
+        queryset = queryset.filter(
+            models.Q(first_name__icontains=search)
+            | models.Q(last_name__icontains=search)
+            | models.Q(username__icontains=search)
+            | models.Q(skills__icontains=search)
+        )
+
+    # Filter by skill
+    skill = params.get("skill", None)
+    if skill:
+        queryset = queryset.filter(skills__icontains=skill)
+
+    return queryset
+
+
+class UserViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing users with role-based access control
     """
@@ -117,30 +161,19 @@ class UserViewSet(viewsets.ModelViewSet):
 
         return [permission() for permission in permission_classes]
 
+    def get_serializer_class(self):
+        """Use the read-only values serializer for user listings"""
+        if self.action in ["list", "members"] and settings.FAST_LIST_SERIALIZERS:
+            return UserProfileValuesSerializer
+        return UserProfileSerializer
+
     def get_queryset(self):
         """Filter users based on permissions and actions"""
         queryset = User.objects.all()
 
         # For public member listing, only show active members
         if self.action == "members":
-            queryset = queryset.filter(is_active=True)
-
-            # Search by name or skills
-            search = self.request.query_params.get("search", None)
-            if search:
-                queryset = queryset.filter(
-                    models.Q(first_name__icontains=search)
-                    | models.Q(last_name__icontains=search)
-                    | models.Q(username__icontains=search)
-                    | models.Q(skills__icontains=search)
-                )
-
-            # Filter by skill
-            skill = self.request.query_params.get("skill", None)
-            if skill:
-                queryset = queryset.filter(skills__icontains=skill)
-
-            return queryset
+            return members_queryset(self.request.query_params)
 
         # Admin sees all users
         if self.request.user.is_authenticated and self.request.user.is_admin:
@@ -153,20 +186,7 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], permission_classes=[])
     def members(self, request):
         """Public endpoint to browse all active members with search/filter"""
-        queryset = self.get_queryset()
-
-        # Pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = UserProfileSerializer(
-                page, many=True, context={"request": request}
-            )
-            return self.get_paginated_response(serializer.data)
-
-        serializer = UserProfileSerializer(
-            queryset, many=True, context={"request": request}
-        )
-        return Response(serializer.data)
+        return self.list(request)
 
     @action(
         detail=False,
@@ -182,8 +202,9 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
 
         else:  # PUT or PATCH
+            # request.user may come from the auth cache; never save it back
             serializer = UserProfileSerializer(
-                request.user,
+                User.objects.get(pk=request.user.pk),
                 data=request.data,
                 partial=(request.method == "PATCH"),
                 context={"request": request},
@@ -298,7 +319,10 @@ class PasswordResetConfirmView(generics.GenericAPIView):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def logout(request):
-    """Logout endpoint (client-side token removal)"""
+    """Logout endpoint; revokes the refresh token sent as ``refresh``"""
+    serializer = LogoutSerializer(data=request.data, context={"request": request})
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
     return Response({"message": "Logged out successfully"}, status=status.HTTP_200_OK)
 
 
@@ -306,33 +330,36 @@ def logout(request):
 @permission_classes([IsAdminUser])
 def admin_statistics(request):
     """Get platform statistics (admin only)"""
+    from blog import stats
     from blog.models import Post, Project
 
-    stats = {
-        "users": {
-            "total": User.objects.count(),
-            "active": User.objects.filter(is_active=True).count(),
-            "admins": User.objects.filter(role=User.Role.ADMIN).count(),
-            "members": User.objects.filter(role=User.Role.MEMBER).count(),
-        },
-        "projects": {
-            "total": Project.objects.count(),
-            "by_owner": list(
-                Project.objects.values("owner__username")
-                .annotate(count=models.Count("id"))
-                .order_by("-count")[:5]
-            ),
-        },
-        "posts": {
-            "total": Post.objects.count(),
-            "published": Post.objects.filter(is_published=True).count(),
-            "draft": Post.objects.filter(is_published=False).count(),
-            "by_author": list(
-                Post.objects.values("author__username")
-                .annotate(count=models.Count("id"))
-                .order_by("-count")[:5]
-            ),
-        },
-    }
-
-    return Response(stats, status=status.HTTP_200_OK)
+    def build():
+        users = stats.user_counts()
+        posts = stats.post_counts()
+        return {
+            "users": {
+                key: users[key] for key in ("total", "active", "admins", "members")
+            },
+            "projects": {
+                "total": stats.project_counts()["total"],
+                "by_owner": list(
+                    Project.objects.values("owner__username")
+                    .annotate(count=models.Count("id"))
+                    .order_by("-count")[:5]
+                ),
+            },
+            "posts": {
+                "total": posts["total"],
+                "published": posts["published"],
+                "draft": posts["unpublished"],
+                "by_author": list(
+                    Post.objects.values("author__username")
+                    .annotate(count=models.Count("id"))
+                    .order_by("-count")[:5]
+                ),
+            },
+        }
+
+    return Response(
+        stats.get_cached("admin_statistics", build), status=status.HTTP_200_OK
+    )
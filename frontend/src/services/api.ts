@@ -28,6 +28,12 @@ else {
 console.log('🔌 API Base URL:', API_BASE_URL);
 
 // Types
+export interface ImageVariants {
+  width: number;
+  height: number;
+  srcset: { webp: string; jpeg: string };
+}
+
 export interface User {
   id: number;
   username?: string;
@@ -39,6 +45,7 @@ export interface User {
   role: "admin" | "member" | "viewer";
   skills: string;
   profile_photo: string | null;
+  profile_photo_variants?: ImageVariants | null;
   linkedin_url: string;
   github_url: string;
   personal_website: string;
@@ -56,6 +63,7 @@ export interface Project {
   demo_link: string | null;
   source_code: string | null;
   image: string | null;
+  image_variants?: ImageVariants | null;
   created_at: string;
   updated_at: string;
 }
@@ -67,6 +75,7 @@ export interface Post {
   title: string;
   content: string;
   cover_image: string | null;
+  cover_image_variants?: ImageVariants | null;
   tags: string;
   is_published: boolean;
   created_at: string;
@@ -114,6 +123,36 @@ export interface CreatePostRequest {
   is_published?: boolean;
 }
 
+// One page of a cursor-paginated list endpoint
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+// Batch writes; image fields cannot be set in bulk
+export interface BulkRequest<T> {
+  create?: Array<Omit<T, 'image' | 'cover_image'>>;
+  update?: Array<Partial<Omit<T, 'image' | 'cover_image'>> & { id: number }>;
+  delete?: number[];
+}
+
+export interface BulkPostRequest extends BulkRequest<CreatePostRequest> {
+  publish?: number[];
+  unpublish?: number[];
+}
+
+export interface BulkItemResult<T> {
+  id?: number;
+  status: number;
+  data?: T;
+  errors?: Record<string, unknown>;
+}
+
+type BulkOperation = 'create' | 'update' | 'delete';
+
+export type BulkResponse<T, K extends string = BulkOperation> = Record<K, BulkItemResult<T>[]>;
+
 export interface AdminStats {
   users: {
     total: number;
@@ -174,6 +213,19 @@ class ApiService {
     );
   }
 
+  // List endpoints are cursor-paginated; fetch the first page, or the page
+  // behind a `next`/`previous` link (absolute, with the filters included)
+  private async getPage<T>(
+    url: string,
+    params: Record<string, string | undefined>,
+    cursor?: string | null
+  ): Promise<CursorPage<T>> {
+    const response = cursor
+      ? await this.api.get(cursor)
+      : await this.api.get(url, { params });
+    return response.data;
+  }
+
   // Normalize URL fields to ensure they include a scheme
   private normalizeUrl(value: string): string | null {
     const v = String(value).trim();
@@ -237,7 +289,9 @@ class ApiService {
 
   async logout(): Promise<void> {
     try {
-      await this.api.post('/auth/logout/');
+      await this.api.post('/auth/logout/', {
+        refresh: localStorage.getItem('refresh_token') || undefined,
+      });
     } finally {
       localStorage.removeItem('access_token');
       localStorage.removeItem('refresh_token');
@@ -293,11 +347,12 @@ class ApiService {
   }
 
   // Projects
-  async getProjects(search?: string, tech?: string): Promise<Project[]> {
-    const response = await this.api.get('/blog/projects/', {
-      params: { search, tech },
-    });
-    return response.data;
+  async getProjects(
+    search?: string,
+    tech?: string,
+    cursor?: string | null
+  ): Promise<CursorPage<Project>> {
+    return this.getPage<Project>('/blog/projects/', { search, tech }, cursor);
   }
 
   async getProject(id: number): Promise<Project> {
@@ -366,14 +421,22 @@ class ApiService {
     await this.api.delete(`/blog/projects/${id}/`);
   }
 
-  // Posts
-  async getPosts(search?: string, tag?: string): Promise<Post[]> {
-    const response = await this.api.get('/blog/posts/', {
-      params: { search, tag },
-    });
+  async bulkProjects(
+    data: BulkRequest<CreateProjectRequest>
+  ): Promise<BulkResponse<Project>> {
+    const response = await this.api.post('/blog/projects/bulk/', data);
     return response.data;
   }
 
+  // Posts
+  async getPosts(
+    search?: string,
+    tag?: string,
+    cursor?: string | null
+  ): Promise<CursorPage<Post>> {
+    return this.getPage<Post>('/blog/posts/', { search, tag }, cursor);
+  }
+
   async getPost(id: number): Promise<Post> {
     const response = await this.api.get(`/blog/posts/${id}/`);
     return response.data;
@@ -416,6 +479,13 @@ class ApiService {
     await this.api.delete(`/blog/posts/${id}/`);
   }
 
+  async bulkPosts(
+    data: BulkPostRequest
+  ): Promise<BulkResponse<Post, BulkOperation | 'publish' | 'unpublish'>> {
+    const response = await this.api.post('/blog/posts/bulk/', data);
+    return response.data;
+  }
+
   // Admin
   async getAdminStats(): Promise<AdminStats> {
     const response = await this.api.get('/admin/statistics/');